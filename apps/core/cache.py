@@ -0,0 +1,43 @@
+"""
+Cache do menu de navegação.
+
+O HTML do menu é armazenado por usuário e versionado por uma chave global
+que é incrementada sempre que módulos, tipos de notas ou permissões mudam.
+Ao incrementar a versão, todas as entradas antigas deixam de ser lidas e
+expiram naturalmente pelo timeout.
+"""
+from django.conf import settings
+
+from apps.utils.cache import get_counter, incr_counter
+
+NAV_MENU_VERSION_KEY = 'nav_menu:version'
+NAV_MENU_CACHE_TIMEOUT = getattr(settings, 'NAV_MENU_CACHE_TIMEOUT', 60 * 60)
+
+
+def get_nav_menu_version():
+    """
+    Retorna a versão atual do menu, inicializando-a se necessário.
+    """
+    version = get_counter(NAV_MENU_VERSION_KEY, None)
+    if version is None:
+        version = incr_counter(NAV_MENU_VERSION_KEY)
+    return version
+
+
+def bump_nav_menu_version():
+    """
+    Invalida todos os menus em cache incrementando a versão global.
+    """
+    return incr_counter(NAV_MENU_VERSION_KEY)
+
+
+def get_nav_menu_cache_key(user):
+    """
+    Monta a chave de cache do menu para o usuário.
+
+    Superusuários enxergam todos os itens, por isso o flag entra na chave
+    para que uma promoção/rebaixamento não sirva um menu incorreto.
+    """
+    user_key = user.pk if user.is_authenticated else 'anon'
+    superuser = int(bool(getattr(user, 'is_superuser', False)))
+    return f'nav_menu:{get_nav_menu_version()}:{user_key}:{superuser}'
@@ -57,7 +57,7 @@ class Module(UUIDBaseModel):
             
         url = f'/'
         if hasattr(self, 'note_module'):
-            url = f'{url}/{self.note_module.note_status.id}'
+            url = f'{url}/{self.note_module.note_status_id}'
         return f'{url}/{self.slug}/'
 
     def user_has_permission(self, user):
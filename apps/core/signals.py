@@ -0,0 +1,36 @@
+"""
+Sinais do app core.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.core.cache import bump_nav_menu_version
+from apps.core.models import Module
+from apps.notes.models import NoteModule, NoteType, NoteTypeGroup
+from apps.users.models.auth.permissions import EventPermission, UserPermission
+
+# Modelos que alteram o conteúdo ou as permissões do menu de navegação
+NAV_MENU_MODELS = (
+    Module,
+    NoteModule,
+    NoteTypeGroup,
+    NoteType,
+    EventPermission,
+    UserPermission,
+)
+
+
+def invalidate_nav_menu(sender, **kwargs):
+    """Invalida o cache do menu quando um modelo relacionado muda (após o commit)"""
+    transaction.on_commit(bump_nav_menu_version)
+
+
+for model in NAV_MENU_MODELS:
+    post_save.connect(
+        invalidate_nav_menu, sender=model,
+        dispatch_uid=f'nav_menu_save_{model._meta.label_lower}'
+    )
+    post_delete.connect(
+        invalidate_nav_menu, sender=model,
+        dispatch_uid=f'nav_menu_delete_{model._meta.label_lower}'
+    )
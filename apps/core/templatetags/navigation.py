@@ -1,7 +1,10 @@
 from django import template
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 
+from apps.core.cache import NAV_MENU_CACHE_TIMEOUT, get_nav_menu_cache_key
 from apps.core.models import Module
 from apps.notes.models import NoteTypeGroup, NoteType
 
@@ -12,9 +15,25 @@ register = template.Library()
 def render_nav_menu(context):
     """
     Renderiza o menu de navegação baseado nos módulos cadastrados.
-    Verifica permissões e organiza por categorias.
+    O HTML é armazenado em cache por usuário e invalidado pelos sinais
+    registrados em apps.core.signals.
     """
     user = context['request'].user
+    cache_key = get_nav_menu_cache_key(user)
+
+    menu_html = cache.get(cache_key)
+    if menu_html is None:
+        menu_html = build_nav_menu(user)
+        cache.set(cache_key, menu_html, NAV_MENU_CACHE_TIMEOUT)
+
+    return mark_safe(menu_html)
+
+
+def build_nav_menu(user):
+    """
+    Monta o HTML do menu de navegação para o usuário.
+    Verifica permissões e organiza por categorias.
+    """
 
     def build_menu_item(module, title=None, note_type=None, indent=False):
         """Constrói um item do menu"""
@@ -51,16 +70,22 @@ def render_nav_menu(context):
         is_visible=True,
         note_module__isnull=False
     ).select_related(
-        'note_module'
+        'note_module',
+        'permission_required'
     ).order_by('order', 'name')
 
     # Prefetch dos grupos de tipos de notas e seus tipos
     note_type_groups = NoteTypeGroup.objects.filter(
         is_active=True,
         module__module__in=notes_modules
+    ).select_related(
+        'module__module__permission_required'
     ).prefetch_related(
-        'note_types',
-        'module__module'
+        Prefetch(
+            'note_types',
+            queryset=NoteType.objects.filter(is_active=True),
+            to_attr='active_note_types'
+        )
     ).order_by('name')
 
     # Módulos administrativos
@@ -70,6 +95,9 @@ def render_nav_menu(context):
         code__startswith='ADM_'
     ).exclude(
         note_module__isnull=False
+    ).select_related(
+        'note_module',
+        'permission_required'
     ).order_by('order', 'name')
 
     # Módulos do sistema
@@ -79,6 +107,9 @@ def render_nav_menu(context):
         code__startswith='SYS_'
     ).exclude(
         note_module__isnull=False
+    ).select_related(
+        'note_module',
+        'permission_required'
     ).order_by('order', 'name')
 
     menu_sections = []
@@ -121,7 +152,7 @@ def render_nav_menu(context):
             notes_section.extend(collapse_html)
 
             # Adicionar os tipos de notas do grupo
-            for note_type in group.note_types.filter(is_active=True):
+            for note_type in group.active_note_types:
                 notes_section.append(build_menu_item(
                     module, 
                     title=note_type.name, 
@@ -184,4 +215,4 @@ def render_nav_menu(context):
             
             final_html.extend(section_html)
 
-    return mark_safe('\n'.join(final_html))
+    return '\n'.join(final_html)
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
+from apps.utils.pagination import EstimatedCountPaginator
+
 from .models import (
     NoteModule, NoteTypeGroup, NoteType, NoteStatus,
     Note, NoteEvent, NoteApproval, NoteRevision
@@ -46,6 +48,8 @@ class NoteAdmin(admin.ModelAdmin):
     list_filter = ('note_type', 'status', 'is_draft', 'is_active')
     date_hierarchy = 'created_at'
     readonly_fields = ('created_by', 'updated_by', 'created_at', 'updated_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def save_model(self, request, obj, form, change):
         if not change:  # Se é uma nova nota
@@ -57,6 +61,7 @@ class NoteAdmin(admin.ModelAdmin):
 @admin.register(NoteEvent)
 class NoteEventAdmin(admin.ModelAdmin):
     list_display = ('note', 'event_type', 'user', 'created_at')
+    list_select_related = ('note', 'user')
     search_fields = ('note__title', 'description', 'user__username')
     list_filter = ('event_type', 'created_at')
     date_hierarchy = 'created_at'
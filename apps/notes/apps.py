@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class NotesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notes'
+
+    def ready(self):
+        # Registra as fontes do feed de alterações
+        from apps.notes import sync  # noqa
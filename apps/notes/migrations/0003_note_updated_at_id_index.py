@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_note_active_noteapproval_active_noteevent_active_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['updated_at', 'id'], name='notes_note_updated_bfe2d6_idx'),
+        ),
+    ]
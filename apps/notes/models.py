@@ -166,6 +166,9 @@ class Note(UUIDBaseModel):
         verbose_name = _('Nota')
         verbose_name_plural = _('Notas')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def __str__(self):
         return self.title
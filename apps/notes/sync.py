@@ -0,0 +1,31 @@
+"""
+Fontes do feed de alterações do app notes (ver apps.utils.sync).
+"""
+from apps.notes.models import Note, NoteModule
+from apps.utils.sync import ChangeFeed, register
+
+
+class NoteChangeFeed(ChangeFeed):
+    """Notas dos módulos cujo permission_required o usuário possui"""
+    model = Note
+
+    def get_allowed_modules(self, request):
+        """Ids dos módulos de notas acessíveis (memorizados na requisição)"""
+        if not hasattr(request, '_note_feed_modules'):
+            note_modules = NoteModule.objects.select_related('module__permission_required')
+            request._note_feed_modules = [
+                note_module.pk for note_module in note_modules
+                if note_module.module.user_has_permission(request.user)
+            ]
+        return request._note_feed_modules
+
+    def has_permission(self, request):
+        return bool(self.get_allowed_modules(request))
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(
+            note_type__group__module__in=self.get_allowed_modules(request)
+        )
+
+
+register('notas', NoteChangeFeed)
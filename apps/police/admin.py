@@ -1,8 +1,12 @@
 from django.contrib import admin
 
+from apps.police.search import search_policiais
+from apps.utils.pagination import EstimatedCountPaginator
+
 from .models import (CNH, RG, CertidaoNascimento, DadosFamiliares,
                      DadosFisicos, Escolaridade, Fardamento, Funcao,
-                     GrupoFuncao, Policial, Reservista, TituloEleitor, HistoricoFuncao)
+                     GrupoFuncao, Policial, Reservista, TituloEleitor, HistoricoFuncao,
+                     ExportacaoPolicial, ImportacaoPolicial)
 
 
 class DadosFisicosInline(admin.StackedInline):
@@ -80,6 +84,11 @@ class FuncaoAdmin(admin.ModelAdmin):
     search_fields = ('nome', 'grupo__nome')
     list_filter = ('grupo', 'active')
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('grupo',)
+
+    def get_queryset(self, request):
+        # Funcao.__str__ usa o grupo (ex.: resultados do autocomplete)
+        return super().get_queryset(request).select_related('grupo')
 
 # Policial e Relacionamentos
 
@@ -90,6 +99,8 @@ class PolicialAdmin(admin.ModelAdmin):
     search_fields = ('nome', 'matricula', 'cpf')
     list_filter = ('active', 'sexo', 'estado_civil')
     readonly_fields = ('created_at', 'updated_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [
         DadosFisicosInline,
         FardamentoInline,
@@ -132,6 +143,12 @@ class PolicialAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Usa o índice de busca textual em vez de ILIKE nos search_fields"""
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search_policiais(search_term, queryset, ranked=False), False
+
 
 @admin.register(HistoricoFuncao)
 class HistoricoFuncaoAdmin(admin.ModelAdmin):
@@ -140,6 +157,7 @@ class HistoricoFuncaoAdmin(admin.ModelAdmin):
     search_fields = ('policial__nome', 'funcao__nome', 'matricula_sad', 'documento_numero')
     autocomplete_fields = ['policial', 'funcao']
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('policial', 'funcao__grupo')
     
     fieldsets = (
         ('Informações Básicas', {
@@ -156,3 +174,25 @@ class HistoricoFuncaoAdmin(admin.ModelAdmin):
             'fields': (('created_at', 'updated_at'), 'active')
         })
     )
+
+
+@admin.register(ImportacaoPolicial)
+class ImportacaoPolicialAdmin(admin.ModelAdmin):
+    list_display = ('id', 'criado_por', 'status', 'total_linhas', 'linhas_importadas', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('criado_por',)
+    readonly_fields = (
+        'criado_por', 'status', 'total_linhas', 'linhas_processadas', 'linhas_importadas',
+        'erros', 'mensagem', 'iniciada_em', 'concluida_em', 'created_at', 'updated_at'
+    )
+
+
+@admin.register(ExportacaoPolicial)
+class ExportacaoPolicialAdmin(admin.ModelAdmin):
+    list_display = ('id', 'criado_por', 'formato', 'status', 'total_linhas', 'created_at')
+    list_filter = ('status', 'formato')
+    list_select_related = ('criado_por',)
+    readonly_fields = (
+        'criado_por', 'arquivo', 'status', 'total_linhas', 'mensagem',
+        'iniciada_em', 'concluida_em', 'created_at', 'updated_at'
+    )
@@ -0,0 +1,31 @@
+"""
+API somente leitura do efetivo (/api/policiais/).
+
+Parâmetros:
+- fields: colunas a retornar (ex.: ?fields=id,matricula,nome)
+- expand: documentos e dados complementares (ex.: ?expand=cnh,rgs)
+- cursor / page_size: paginação por (nome, id)
+
+Exige o evento view_police_roster.
+"""
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.routers import SimpleRouter
+
+from apps.police.models import Policial
+from apps.police.serializers import PolicialSerializer
+from apps.utils.api import (HasEventPermission, KeysetCursorPagination,
+                            SparseFieldsetMixin)
+
+
+class PolicialViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Policial.objects.all()
+    serializer_class = PolicialSerializer
+    pagination_class = KeysetCursorPagination
+    ordering = ['nome', 'id']
+    permission_classes = [IsAuthenticated, HasEventPermission]
+    permission_required = 'view_police_roster'
+
+
+router = SimpleRouter()
+router.register('policiais', PolicialViewSet, basename='api-policial')
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class PoliceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.police'
+
+    def ready(self):
+        # Registra as fontes de autocomplete do efetivo e das funções
+        from apps.police import autocomplete  # noqa
+
+        # Registra as fontes do feed de alterações
+        from apps.police import sync  # noqa
+
+        # Registra as versões redimensionadas da foto do policial
+        from apps.police import renditions  # noqa
+
+        # Registra os arquivos servidos por download autorizado
+        from apps.police import downloads  # noqa
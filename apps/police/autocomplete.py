@@ -0,0 +1,49 @@
+"""
+Fontes de autocomplete do app police (ver apps.utils.autocomplete).
+"""
+from apps.police.models import Funcao, GrupoFuncao, Policial
+from apps.police.search import search_policiais
+from apps.utils.autocomplete import Autocomplete, register
+
+
+class PolicialAutocomplete(Autocomplete):
+    """Busca pelo índice textual (nome, nome de guerra e documentos)"""
+    model = Policial
+    fields = ('matricula', 'nome', 'nome_guerra')
+    label = '{matricula} - {nome}'
+    ordering = ('nome', 'pk')
+    min_length = 2
+
+    def filter_queryset(self, queryset, term):
+        return search_policiais(term, queryset)
+
+
+class GrupoFuncaoAutocomplete(Autocomplete):
+    """Prefixo do nome (índice UPPER(nome), migração 0013)"""
+    model = GrupoFuncao
+    fields = ('nome',)
+    label = '{nome}'
+    ordering = ('nome',)
+    min_length = 0
+
+    def filter_queryset(self, queryset, term):
+        return self.filter_prefix(queryset, term, 'nome')
+
+
+class FuncaoAutocomplete(Autocomplete):
+    """Prefixo do nome (índice UPPER(nome), migração 0013)"""
+    model = Funcao
+    fields = ('nome', 'tipo', 'grupo_id', 'grupo__nome')
+    label = '{nome} - {grupo__nome}'
+    ordering = ('nome', 'pk')
+    min_length = 0
+    # O nome do grupo aparece nos resultados
+    depends_on = (GrupoFuncao,)
+
+    def filter_queryset(self, queryset, term):
+        return self.filter_prefix(queryset, term, 'nome')
+
+
+register('policiais', PolicialAutocomplete)
+register('grupos-funcao', GrupoFuncaoAutocomplete)
+register('funcoes', FuncaoAutocomplete)
@@ -84,4 +84,27 @@ class TipoCabeloChoices(models.TextChoices):
     ONDULADO = 'ON', 'Ondulado'
     CACHEADO = 'CA', 'Cacheado'
     CRESPO = 'CR', 'Crespo'
-    OUTRO = 'OU', 'Outro'
\ No newline at end of file
+    OUTRO = 'OU', 'Outro'
+
+
+class StatusImportacaoChoices(models.TextChoices):
+    """Situação de uma importação de policiais em lote"""
+    PENDENTE = 'PE', 'Pendente'
+    PROCESSANDO = 'PR', 'Processando'
+    CONCLUIDA = 'CO', 'Concluída'
+    FALHOU = 'FA', 'Falhou'
+
+
+class FormatoExportacaoChoices(models.TextChoices):
+    """Formatos da exportação do efetivo"""
+    CSV = 'csv', 'CSV'
+    XLSX = 'xlsx', 'Excel (XLSX)'
+    NDJSON = 'ndjson', 'NDJSON'
+
+
+class StatusExportacaoChoices(models.TextChoices):
+    """Situação de uma exportação do efetivo"""
+    PENDENTE = 'PE', 'Pendente'
+    PROCESSANDO = 'PR', 'Processando'
+    CONCLUIDA = 'CO', 'Concluída'
+    FALHOU = 'FA', 'Falhou'
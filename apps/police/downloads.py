@@ -0,0 +1,67 @@
+"""
+Arquivos do app police servidos por download autorizado (ver
+apps.utils.downloads).
+"""
+from apps.police.models import (CNH, RG, CertidaoNascimento, Escolaridade,
+                                HistoricoFuncao, Reservista, TituloEleitor)
+from apps.utils.downloads import ProtectedFile, register
+
+# Evento exigido para ver documentos de outros policiais (migração 0012)
+PERMISSAO_DOCUMENTOS = 'view_police_documents'
+
+
+class DocumentoPolicialFile(ProtectedFile):
+    """Documentos do policial: quem tem a permissão ou o próprio policial"""
+    permission = PERMISSAO_DOCUMENTOS
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('policial')
+
+    def has_permission(self, request, obj):
+        if obj.policial.user_id == request.user.pk:
+            return True
+        return super().has_permission(request, obj)
+
+
+class CNHFile(DocumentoPolicialFile):
+    model = CNH
+    field = 'arquivo'
+
+
+class RGFile(DocumentoPolicialFile):
+    model = RG
+    field = 'arquivo'
+
+
+class TituloEleitorFile(DocumentoPolicialFile):
+    model = TituloEleitor
+    field = 'arquivo'
+
+
+class ReservistaFile(DocumentoPolicialFile):
+    model = Reservista
+    field = 'arquivo'
+
+
+class CertidaoNascimentoFile(DocumentoPolicialFile):
+    model = CertidaoNascimento
+    field = 'arquivo'
+
+
+class DiplomaFile(DocumentoPolicialFile):
+    model = Escolaridade
+    field = 'arquivo_diploma'
+
+
+class DocumentoFuncaoFile(DocumentoPolicialFile):
+    model = HistoricoFuncao
+    field = 'documento_arquivo'
+
+
+register('cnh', CNHFile)
+register('rg', RGFile)
+register('titulo-eleitor', TituloEleitorFile)
+register('reservista', ReservistaFile)
+register('certidao-nascimento', CertidaoNascimentoFile)
+register('diploma', DiplomaFile)
+register('documento-funcao', DocumentoFuncaoFile)
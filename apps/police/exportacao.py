@@ -0,0 +1,251 @@
+"""
+Exportação do efetivo (CSV, XLSX ou NDJSON) com memória constante.
+
+As linhas vêm de uma única consulta com values_list (Policial, dados
+físicos, fardamento e função atual por subconsulta), percorrida com
+.iterator(chunk_size=POLICIAL_EXPORT_CHUNK_SIZE); no PostgreSQL isso usa um
+cursor no servidor, então nunca há mais que um lote em memória.
+
+- CSV e NDJSON podem ser enviados direto na resposta (StreamingHttpResponse)
+  ou gravados em arquivo.
+- XLSX é gravado em arquivo com o modo write_only do openpyxl,
+  pela tarefa exportar_policiais.
+
+As colunas seguem o cabeçalho da importação (apps.police.importacao), de
+modo que o CSV exportado pode ser importado em outra base.
+"""
+import csv
+import datetime
+import json
+import logging
+import tempfile
+
+import openpyxl
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from apps.police.choices import FormatoExportacaoChoices, StatusExportacaoChoices
+from apps.police.importacao import get_colunas
+from apps.police.models import (DadosFisicos, ExportacaoPolicial, Fardamento,
+                                HistoricoFuncao, Policial)
+
+POLICIAL_EXPORT_CHUNK_SIZE = getattr(settings, 'POLICIAL_EXPORT_CHUNK_SIZE', 2000)
+
+# (prefixo da coluna, caminho a partir de Policial, modelo)
+SECOES = (
+    ('', '', Policial),
+    ('fisico_', 'dados_fisicos__', DadosFisicos),
+    ('fardamento_', 'fardamento__', Fardamento),
+)
+
+# Formatos que podem ser enviados direto na resposta
+FORMATOS_STREAMING = (FormatoExportacaoChoices.CSV, FormatoExportacaoChoices.NDJSON)
+
+CONTENT_TYPES = {
+    FormatoExportacaoChoices.CSV: 'text/csv; charset=utf-8',
+    FormatoExportacaoChoices.NDJSON: 'application/x-ndjson',
+    FormatoExportacaoChoices.XLSX: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+logger = logging.getLogger(__name__)
+
+
+class Coluna:
+    """Coluna exportada: cabeçalho, caminho no values_list e rótulos das choices"""
+
+    def __init__(self, nome, caminho, field=None):
+        self.nome = nome
+        self.caminho = caminho
+        self.rotulos = dict(field.flatchoices) if field is not None and field.choices else None
+
+
+def get_colunas_exportacao():
+    colunas = [
+        Coluna(prefixo + field.name, caminho + field.name, field)
+        for prefixo, caminho, model in SECOES
+        for field in get_colunas(model)
+    ]
+    colunas.append(Coluna('funcao_atual', 'funcao_atual'))
+    return colunas
+
+
+def get_queryset():
+    """Efetivo com a função atual anotada (sem consultas por linha)"""
+    funcao_atual = HistoricoFuncao.objects.filter(
+        Q(data_fim__isnull=True) | Q(data_fim__gte=timezone.localdate()),
+        policial=OuterRef('pk'),
+        active=True,
+    ).order_by('-data_inicio').values('funcao__nome')[:1]
+    return Policial.objects.annotate(
+        funcao_atual=Subquery(funcao_atual)
+    ).order_by('nome', 'id')
+
+
+def iter_linhas(colunas, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE):
+    """Tuplas na ordem de colunas, lidas em lotes"""
+    return get_queryset().values_list(
+        *[coluna.caminho for coluna in colunas]
+    ).iterator(chunk_size=chunk_size)
+
+
+def formatar(colunas, row):
+    """Rótulos no lugar dos códigos e datas em dd/mm/aaaa (planilhas)"""
+    valores = []
+    for coluna, value in zip(colunas, row):
+        if value is None:
+            value = ''
+        elif coluna.rotulos is not None:
+            value = coluna.rotulos.get(value, value)
+        elif isinstance(value, datetime.date):
+            value = value.strftime('%d/%m/%Y')
+        valores.append(value)
+    return valores
+
+
+class _Echo:
+    """Pseudo-arquivo para o csv.writer devolver a linha em vez de gravá-la"""
+
+    def write(self, value):
+        return value
+
+
+def _agrupar(linhas, tamanho):
+    """Junta as linhas em blocos, para não enviar uma linha por escrita"""
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= tamanho:
+            yield ''.join(bloco)
+            bloco = []
+    if bloco:
+        yield ''.join(bloco)
+
+
+def gerar_csv(colunas, rows, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE):
+    """Conteúdo CSV (separado por ;) em blocos de texto"""
+    writer = csv.writer(_Echo(), delimiter=';')
+
+    def linhas():
+        yield '\ufeff'  # BOM para o Excel
+        yield writer.writerow([coluna.nome for coluna in colunas])
+        for row in rows:
+            yield writer.writerow(formatar(colunas, row))
+
+    return _agrupar(linhas(), chunk_size)
+
+
+def gerar_ndjson(colunas, rows, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE):
+    """Um objeto JSON por linha, com os códigos originais"""
+    nomes = [coluna.nome for coluna in colunas]
+
+    def linhas():
+        for row in rows:
+            yield json.dumps(dict(zip(nomes, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    return _agrupar(linhas(), chunk_size)
+
+
+class _Contador:
+    """Conta as linhas enquanto são lidas"""
+
+    def __init__(self, iteravel):
+        self.iteravel = iteravel
+        self.total = 0
+
+    def __iter__(self):
+        for item in self.iteravel:
+            self.total += 1
+            yield item
+
+
+def gerar(formato, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE, rows=None):
+    """Blocos de texto de um formato de FORMATOS_STREAMING"""
+    colunas = get_colunas_exportacao()
+    if rows is None:
+        rows = iter_linhas(colunas, chunk_size)
+    if formato == FormatoExportacaoChoices.NDJSON:
+        return gerar_ndjson(colunas, rows, chunk_size)
+    return gerar_csv(colunas, rows, chunk_size)
+
+
+def gravar_xlsx(arquivo, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE):
+    """
+    Grava o XLSX em arquivo (modo write_only: as linhas vão para o disco
+    conforme são adicionadas).
+
+    Returns:
+        int: Linhas exportadas
+    """
+    colunas = get_colunas_exportacao()
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Efetivo')
+    sheet.append([coluna.nome for coluna in colunas])
+    total = 0
+    for row in iter_linhas(colunas, chunk_size):
+        sheet.append([
+            coluna.rotulos.get(value, value) if coluna.rotulos is not None and value is not None else value
+            for coluna, value in zip(colunas, row)
+        ])
+        total += 1
+    workbook.save(arquivo)
+    return total
+
+
+def gravar_arquivo(formato, arquivo, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE):
+    """
+    Grava a exportação em um arquivo binário aberto.
+
+    Returns:
+        int: Linhas exportadas
+    """
+    if formato == FormatoExportacaoChoices.XLSX:
+        return gravar_xlsx(arquivo, chunk_size)
+    rows = _Contador(iter_linhas(get_colunas_exportacao(), chunk_size))
+    for bloco in gerar(formato, chunk_size, rows=rows):
+        arquivo.write(bloco.encode('utf-8'))
+    return rows.total
+
+
+def get_nome_arquivo(formato):
+    return f"efetivo_{timezone.localtime():%Y%m%d_%H%M}.{formato}"
+
+
+def processar_exportacao(exportacao_id, chunk_size=POLICIAL_EXPORT_CHUNK_SIZE):
+    """
+    Gera o arquivo de uma exportação pendente em MEDIA_ROOT (storage padrão).
+
+    Returns:
+        ExportacaoPolicial: A exportação atualizada
+    """
+    updated = ExportacaoPolicial.objects.filter(
+        pk=exportacao_id, status=StatusExportacaoChoices.PENDENTE
+    ).update(status=StatusExportacaoChoices.PROCESSANDO, iniciada_em=timezone.now())
+    exportacao = ExportacaoPolicial.objects.get(pk=exportacao_id)
+    if not updated:
+        return exportacao
+
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            total = gravar_arquivo(exportacao.formato, tmp, chunk_size)
+            tmp.seek(0)
+            exportacao.arquivo.save(get_nome_arquivo(exportacao.formato), File(tmp), save=False)
+    except Exception as e:
+        logger.exception("Falha na exportação %s", exportacao.pk)
+        ExportacaoPolicial.objects.filter(pk=exportacao.pk).update(
+            status=StatusExportacaoChoices.FALHOU,
+            mensagem=str(e),
+            concluida_em=timezone.now(),
+        )
+    else:
+        ExportacaoPolicial.objects.filter(pk=exportacao.pk).update(
+            arquivo=exportacao.arquivo.name,
+            status=StatusExportacaoChoices.CONCLUIDA,
+            total_linhas=total,
+            concluida_em=timezone.now(),
+        )
+
+    exportacao.refresh_from_db()
+    return exportacao
@@ -1,7 +1,10 @@
 from django import forms
 
 from apps.police.models import (DadosFamiliares, DadosFisicos, Escolaridade,
-                                Fardamento, Funcao, GrupoFuncao, Policial)
+                                Fardamento, ExportacaoPolicial, Funcao,
+                                GrupoFuncao, ImportacaoPolicial, Policial)
+from apps.utils.forms import (RemoteModelChoiceField, ResumableFileInput,
+                              ResumableUploadFormMixin)
 
 
 class GrupoFuncaoForm(forms.ModelForm):
@@ -17,6 +20,12 @@ class GrupoFuncaoForm(forms.ModelForm):
 
 
 class FuncaoForm(forms.ModelForm):
+    grupo = RemoteModelChoiceField(
+        queryset=GrupoFuncao.objects.all(),
+        autocomplete='grupos-funcao',
+        label='Grupo de Função'
+    )
+
     class Meta:
         model = Funcao
         fields = ['nome', 'grupo', 'tipo']
@@ -25,9 +34,6 @@ class FuncaoForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': 'Nome da função'
             }),
-            'grupo': forms.Select(attrs={
-                'class': 'form-control select2'
-            }),
             'tipo': forms.Select(attrs={
                 'class': 'form-control'
             })
@@ -344,7 +350,7 @@ class PolicialFamiliaresForm(forms.ModelForm):
         }
 
 
-class PolicialEscolaridadeForm(forms.ModelForm):
+class PolicialEscolaridadeForm(ResumableUploadFormMixin, forms.ModelForm):
     class Meta:
         model = Escolaridade
         exclude = ['policial', 'created_at', 'updated_at', 'active']
@@ -374,7 +380,7 @@ class PolicialEscolaridadeForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': 'Número do registro/diploma'
             }),
-            'arquivo_diploma': forms.FileInput(attrs={
+            'arquivo_diploma': ResumableFileInput(attrs={
                 'class': 'form-control'
             }),
             'observacao': forms.Textarea(attrs={
@@ -383,3 +389,34 @@ class PolicialEscolaridadeForm(forms.ModelForm):
                 'placeholder': 'Observações adicionais'
             })
         }
+
+
+class ImportacaoPolicialForm(forms.ModelForm):
+    EXTENSOES = ('.csv', '.xlsx')
+
+    class Meta:
+        model = ImportacaoPolicial
+        fields = ['arquivo']
+        widgets = {
+            'arquivo': forms.ClearableFileInput(attrs={
+                'class': 'form-control',
+                'accept': '.csv,.xlsx'
+            })
+        }
+
+    def clean_arquivo(self):
+        arquivo = self.cleaned_data['arquivo']
+        if not arquivo.name.lower().endswith(self.EXTENSOES):
+            raise forms.ValidationError('Envie uma planilha .csv ou .xlsx.')
+        return arquivo
+
+
+class ExportacaoPolicialForm(forms.ModelForm):
+    class Meta:
+        model = ExportacaoPolicial
+        fields = ['formato']
+        widgets = {
+            'formato': forms.Select(attrs={
+                'class': 'form-control'
+            })
+        }
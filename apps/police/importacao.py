@@ -0,0 +1,408 @@
+"""
+Importação de policiais em lote a partir de planilha (CSV ou XLSX).
+
+Cada linha da planilha corresponde a um policial (mesmos dados do
+cadastro pelo wizard). As colunas têm o nome do campo do modelo, com
+prefixo para os dados complementares:
+
+- sem prefixo: Policial (matricula, nome, cpf, ...)
+- fisico_: DadosFisicos
+- fardamento_: Fardamento
+- familiar_: DadosFamiliares (um familiar por linha)
+- escolaridade_: Escolaridade (uma formação por linha)
+
+Seções complementares com todas as colunas vazias não são criadas.
+
+A planilha é lida em lotes de POLICIAL_IMPORT_CHUNK_SIZE linhas. Em cada
+lote as linhas são validadas em memória (full_clean, incluindo
+validate_cpf), a unicidade de matrícula, CPF, RG e e-mail é verificada com
+uma única consulta e os registros válidos são criados com bulk_create,
+modelo a modelo. O progresso e os erros por linha são gravados na
+ImportacaoPolicial ao fim de cada lote.
+"""
+import csv
+import datetime
+import io
+import logging
+from decimal import Decimal, InvalidOperation
+
+import openpyxl
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.police.choices import StatusImportacaoChoices
+from apps.police.models import (DadosFamiliares, DadosFisicos, Escolaridade,
+                                Fardamento, ImportacaoPolicial, Policial)
+from apps.users.models import User
+from apps.users.models.auth.choices import UserStatusChoices, UserTypeChoices
+from apps.utils.autocomplete import invalidate_autocomplete
+
+POLICIAL_IMPORT_CHUNK_SIZE = getattr(settings, 'POLICIAL_IMPORT_CHUNK_SIZE', 500)
+
+# (prefixo da coluna, modelo)
+SECOES = (
+    ('', Policial),
+    ('fisico_', DadosFisicos),
+    ('fardamento_', Fardamento),
+    ('familiar_', DadosFamiliares),
+    ('escolaridade_', Escolaridade),
+)
+
+CAMPOS_UNICOS = ('matricula', 'cpf', 'rg', 'email')
+CAMPOS_IGNORADOS = {
+    'id', 'user', 'policial', 'active', 'created_at', 'updated_at', 'search_vector', 'foto_renditions'
+}
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y')
+VALORES_VERDADEIROS = {'1', 's', 'sim', 'x', 'true', 'verdadeiro'}
+
+logger = logging.getLogger(__name__)
+
+
+def get_colunas(model):
+    """Campos do modelo que podem vir da planilha"""
+    return [
+        field for field in model._meta.concrete_fields
+        if field.name not in CAMPOS_IGNORADOS and not isinstance(field, models.FileField)
+    ]
+
+
+def get_cabecalho():
+    """Cabeçalho completo aceito pela importação (para o modelo de planilha)"""
+    return [
+        prefixo + field.name
+        for prefixo, model in SECOES
+        for field in get_colunas(model)
+    ]
+
+
+def _vazio(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def converter_valor(field, value):
+    """
+    Converte o valor da célula para o tipo do campo.
+
+    Aceita datas em dd/mm/aaaa, decimais com vírgula, booleanos como
+    sim/não e, em campos com choices, o rótulo no lugar do código.
+
+    Raises:
+        ValueError: Valor em formato não reconhecido
+    """
+    if _vazio(value):
+        return None if field.null else field.get_default()
+    if isinstance(value, str):
+        value = value.strip()
+
+    if field.choices:
+        rotulos = {str(label).lower(): key for key, label in field.flatchoices}
+        return rotulos.get(str(value).lower(), value)
+    if isinstance(field, models.DateField):
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        if isinstance(value, datetime.date):
+            return value
+        for formato in FORMATOS_DATA:
+            try:
+                return datetime.datetime.strptime(value, formato).date()
+            except ValueError:
+                continue
+        raise ValueError('Data inválida; use dd/mm/aaaa.')
+    if isinstance(field, models.BooleanField):
+        return str(value).lower() in VALORES_VERDADEIROS
+    if isinstance(field, models.DecimalField):
+        try:
+            return Decimal(str(value).replace(',', '.'))
+        except InvalidOperation:
+            raise ValueError('Número inválido.')
+    if isinstance(field, (models.CharField, models.TextField)):
+        # Planilhas gravam matrícula, CEP etc. como número
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+    return value
+
+
+class LinhaImportacao:
+    """Linha da planilha convertida em instâncias (ainda não gravadas)"""
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.objetos = {}
+        self.erros = []
+
+    @property
+    def policial(self):
+        return self.objetos.get('')
+
+    def add_erro(self, campo, mensagem):
+        self.erros.append({'linha': self.numero, 'campo': campo, 'mensagem': mensagem})
+
+
+def montar_linha(numero, dados):
+    """
+    Converte e valida uma linha (sem consultar o banco).
+
+    Returns:
+        LinhaImportacao: Com os objetos e os erros encontrados
+    """
+    linha = LinhaImportacao(numero)
+    for prefixo, model in SECOES:
+        colunas = get_colunas(model)
+        valores = {field.name: dados.get(prefixo + field.name) for field in colunas}
+        if prefixo and all(_vazio(value) for value in valores.values()):
+            continue
+
+        kwargs = {}
+        invalidos = []
+        for field in colunas:
+            try:
+                kwargs[field.name] = converter_valor(field, valores[field.name])
+            except ValueError as e:
+                linha.add_erro(prefixo + field.name, str(e))
+                invalidos.append(field.name)
+        obj = model(**kwargs)
+        try:
+            obj.full_clean(
+                exclude=['user', 'policial', 'search_vector', *invalidos],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        except ValidationError as e:
+            for campo, mensagens in e.message_dict.items():
+                campo = prefixo + campo if campo != '__all__' else prefixo.rstrip('_') or campo
+                for mensagem in mensagens:
+                    linha.add_erro(campo, mensagem)
+        linha.objetos[prefixo] = obj
+    return linha
+
+
+def verificar_unicidade(linhas, vistos):
+    """
+    Marca erros de matrícula, CPF, RG e e-mail já cadastrados ou repetidos
+    na planilha. Uma consulta em Policial e outra em User (username) por lote.
+
+    Args:
+        linhas: Linhas válidas do lote
+        vistos: {campo: {valor: linha}} dos lotes anteriores (atualizado)
+    """
+    if not linhas:
+        return
+    valores = {
+        campo: {getattr(linha.policial, campo) for linha in linhas}
+        for campo in CAMPOS_UNICOS
+    }
+    filtro = Q()
+    for campo, conjunto in valores.items():
+        filtro |= Q(**{f'{campo}__in': conjunto})
+
+    existentes = {campo: set() for campo in CAMPOS_UNICOS}
+    for row in Policial.objects.filter(filtro).values_list(*CAMPOS_UNICOS):
+        for campo, value in zip(CAMPOS_UNICOS, row):
+            existentes[campo].add(value)
+    usuarios = set(
+        User.objects.filter(username__in=valores['matricula']).values_list('username', flat=True)
+    )
+
+    for linha in linhas:
+        policial = linha.policial
+        for campo in CAMPOS_UNICOS:
+            value = getattr(policial, campo)
+            if value in existentes[campo]:
+                linha.add_erro(campo, f'{value} já cadastrado.')
+            elif value in vistos[campo]:
+                linha.add_erro(campo, f'{value} repetido na linha {vistos[campo][value]}.')
+        if policial.matricula in usuarios and policial.matricula not in existentes['matricula']:
+            linha.add_erro('matricula', f'Já existe usuário {policial.matricula}.')
+        if not linha.erros:
+            for campo in CAMPOS_UNICOS:
+                vistos[campo][getattr(policial, campo)] = linha.numero
+
+
+def criar_usuario(policial):
+    """Usuário do policial, como em Policial.save() (senha definida depois)"""
+    nome = policial.nome.split()
+    return User(
+        username=policial.matricula,
+        email=User.objects.normalize_email(policial.email) or None,
+        first_name=nome[0] if nome else '',
+        last_name=' '.join(nome[1:]),
+        user_type=UserTypeChoices.POLICE,
+        status=UserStatusChoices.ACTIVE,
+        is_active=True,
+    )
+
+
+def gravar_linhas(linhas):
+    """
+    Cria usuários, policiais e dados complementares com um bulk_create por
+    modelo, em uma transação.
+    """
+    with transaction.atomic():
+        usuarios = [criar_usuario(linha.policial) for linha in linhas]
+        User.objects.bulk_create(usuarios)
+        for linha, user in zip(linhas, usuarios):
+            linha.policial.user = user
+        Policial.objects.bulk_create([linha.policial for linha in linhas])
+
+        for prefixo, model in SECOES[1:]:
+            objetos = []
+            for linha in linhas:
+                obj = linha.objetos.get(prefixo)
+                if obj is not None:
+                    obj.policial = linha.policial
+                    objetos.append(obj)
+            if objetos:
+                model.objects.bulk_create(objetos)
+
+
+def gravar_lote(linhas):
+    """
+    Grava o lote; se houver conflito (ex.: cadastro simultâneo), grava as
+    linhas uma a uma para isolar as que falharem.
+
+    Returns:
+        int: Linhas gravadas
+    """
+    if not linhas:
+        return 0
+    try:
+        gravar_linhas(linhas)
+        return len(linhas)
+    except IntegrityError:
+        logger.warning("Conflito ao gravar lote de importação; gravando linha a linha")
+
+    gravadas = 0
+    for linha in linhas:
+        # Descarta pks atribuídos na tentativa anterior
+        for obj in linha.objetos.values():
+            obj.pk = None
+            obj._state.adding = True
+        try:
+            gravar_linhas([linha])
+            gravadas += 1
+        except IntegrityError as e:
+            linha.add_erro('__all__', f'Não foi possível gravar: {e}')
+    return gravadas
+
+
+def ler_planilha(arquivo, nome):
+    """
+    Lê a planilha linha a linha.
+
+    Yields:
+        tuple: (número da linha na planilha, {coluna: valor})
+
+    Raises:
+        ValueError: Formato não suportado
+    """
+    nome = nome.lower()
+    if nome.endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            cabecalho = [str(c).strip().lower() if c is not None else '' for c in next(rows, ())]
+            for numero, row in enumerate(rows, start=2):
+                if any(not _vazio(value) for value in row):
+                    yield numero, dict(zip(cabecalho, row))
+        finally:
+            workbook.close()
+        return
+
+    if nome.endswith('.csv'):
+        texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+        amostra = texto.read(4096)
+        texto.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=';,')
+        except csv.Error:
+            dialeto = csv.excel
+        reader = csv.reader(texto, dialeto)
+        cabecalho = [c.strip().lower() for c in next(reader, [])]
+        for numero, row in enumerate(reader, start=2):
+            if any(not _vazio(value) for value in row):
+                yield numero, dict(zip(cabecalho, row))
+        texto.detach()
+        return
+
+    raise ValueError('Formato não suportado; envie um arquivo .csv ou .xlsx.')
+
+
+def _lotes(iteravel, tamanho):
+    lote = []
+    for item in iteravel:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def contar_linhas(importacao):
+    with importacao.arquivo.open('rb') as arquivo:
+        return sum(1 for _ in ler_planilha(arquivo, importacao.arquivo.name))
+
+
+def processar_importacao(importacao_id, chunk_size=POLICIAL_IMPORT_CHUNK_SIZE):
+    """
+    Processa uma importação pendente.
+
+    Returns:
+        ImportacaoPolicial: A importação atualizada
+    """
+    updated = ImportacaoPolicial.objects.filter(
+        pk=importacao_id, status=StatusImportacaoChoices.PENDENTE
+    ).update(status=StatusImportacaoChoices.PROCESSANDO, iniciada_em=timezone.now())
+    importacao = ImportacaoPolicial.objects.get(pk=importacao_id)
+    if not updated:
+        return importacao
+
+    processadas = importadas = 0
+    erros = []
+    vistos = {campo: {} for campo in CAMPOS_UNICOS}
+    try:
+        total = contar_linhas(importacao)
+        ImportacaoPolicial.objects.filter(pk=importacao.pk).update(total_linhas=total)
+
+        with importacao.arquivo.open('rb') as arquivo:
+            for lote in _lotes(ler_planilha(arquivo, importacao.arquivo.name), chunk_size):
+                linhas = [montar_linha(numero, dados) for numero, dados in lote]
+                validas = [linha for linha in linhas if not linha.erros]
+                verificar_unicidade(validas, vistos)
+                validas = [linha for linha in validas if not linha.erros]
+                importadas += gravar_lote(validas)
+
+                processadas += len(linhas)
+                for linha in linhas:
+                    erros.extend(linha.erros)
+                ImportacaoPolicial.objects.filter(pk=importacao.pk).update(
+                    linhas_processadas=processadas,
+                    linhas_importadas=importadas,
+                    erros=erros,
+                )
+    except Exception as e:
+        logger.exception("Falha na importação %s", importacao.pk)
+        ImportacaoPolicial.objects.filter(pk=importacao.pk).update(
+            status=StatusImportacaoChoices.FALHOU,
+            mensagem=str(e),
+            linhas_processadas=processadas,
+            linhas_importadas=importadas,
+            erros=erros,
+            concluida_em=timezone.now(),
+        )
+    else:
+        ImportacaoPolicial.objects.filter(pk=importacao.pk).update(
+            status=StatusImportacaoChoices.CONCLUIDA,
+            concluida_em=timezone.now(),
+        )
+    finally:
+        if importadas:
+            # bulk_create não dispara post_save
+            invalidate_autocomplete('policiais')
+
+    importacao.refresh_from_db()
+    return importacao
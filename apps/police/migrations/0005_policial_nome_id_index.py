@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0004_remove_dadosfisicos_cor_cabelo_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='policial',
+            index=models.Index(fields=['nome', 'id'], name='police_poli_nome_690419_idx'),
+        ),
+    ]
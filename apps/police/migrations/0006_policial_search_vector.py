@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:31
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Busca textual do efetivo (apenas PostgreSQL).
+# O vetor é mantido por trigger para cobrir também bulk_create/update().
+# Documentos (matrícula, CPF, RG) são indexados sem pontuação.
+CREATE_SEARCH_SQL = """
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+CREATE OR REPLACE FUNCTION police_policial_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', unaccent(coalesce(NEW.nome, ''))), 'A') ||
+        setweight(to_tsvector('simple', unaccent(coalesce(NEW.nome_guerra, ''))), 'A') ||
+        setweight(to_tsvector('simple', regexp_replace(coalesce(NEW.matricula, ''), '[^0-9A-Za-z]', '', 'g')), 'B') ||
+        setweight(to_tsvector('simple', regexp_replace(coalesce(NEW.cpf, ''), '[^0-9]', '', 'g')), 'B') ||
+        setweight(to_tsvector('simple', regexp_replace(coalesce(NEW.rg, ''), '[^0-9A-Za-z]', '', 'g')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER police_policial_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF nome, nome_guerra, matricula, cpf, rg
+    ON police_policial
+    FOR EACH ROW EXECUTE FUNCTION police_policial_search_vector_update();
+
+CREATE INDEX police_policial_search_vector_idx
+    ON police_policial USING gin (search_vector);
+
+UPDATE police_policial SET nome = nome;
+"""
+
+DROP_SEARCH_SQL = """
+DROP INDEX IF EXISTS police_policial_search_vector_idx;
+DROP TRIGGER IF EXISTS police_policial_search_vector_trigger ON police_policial;
+DROP FUNCTION IF EXISTS police_policial_search_vector_update();
+"""
+
+
+def create_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SEARCH_SQL)
+
+
+def drop_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0005_policial_nome_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='policial',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search, drop_search),
+    ]
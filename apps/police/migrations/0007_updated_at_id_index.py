@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0006_policial_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicofuncao',
+            index=models.Index(fields=['updated_at', 'id'], name='police_hist_updated_7e1944_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policial',
+            index=models.Index(fields=['updated_at', 'id'], name='police_poli_updated_cf19ce_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0007_updated_at_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacaoPolicial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active', models.BooleanField(default=True, verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('arquivo', models.FileField(upload_to='importacoes/%Y/%m/', verbose_name='Arquivo')),
+                ('status', models.CharField(choices=[('PE', 'Pendente'), ('PR', 'Processando'), ('CO', 'Concluída'), ('FA', 'Falhou')], default='PE', max_length=2, verbose_name='Situação')),
+                ('total_linhas', models.PositiveIntegerField(default=0, verbose_name='Total de linhas')),
+                ('linhas_processadas', models.PositiveIntegerField(default=0, verbose_name='Linhas processadas')),
+                ('linhas_importadas', models.PositiveIntegerField(default=0, verbose_name='Linhas importadas')),
+                ('erros', models.JSONField(blank=True, default=list, help_text='Lista de {linha, campo, mensagem}', verbose_name='Erros')),
+                ('mensagem', models.TextField(blank=True, verbose_name='Mensagem')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('criado_por', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='importacoes_policiais', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Importação de Policiais',
+                'verbose_name_plural': 'Importações de Policiais',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
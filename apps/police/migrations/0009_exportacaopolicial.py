@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0008_importacaopolicial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportacaoPolicial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active', models.BooleanField(default=True, verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('formato', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'Excel (XLSX)'), ('ndjson', 'NDJSON')], default='csv', max_length=6, verbose_name='Formato')),
+                ('arquivo', models.FileField(blank=True, upload_to='exportacoes/%Y/%m/', verbose_name='Arquivo')),
+                ('status', models.CharField(choices=[('PE', 'Pendente'), ('PR', 'Processando'), ('CO', 'Concluída'), ('FA', 'Falhou')], default='PE', max_length=2, verbose_name='Situação')),
+                ('total_linhas', models.PositiveIntegerField(default=0, verbose_name='Total de linhas')),
+                ('mensagem', models.TextField(blank=True, verbose_name='Mensagem')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('criado_por', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='exportacoes_policiais', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Exportação de Policiais',
+                'verbose_name_plural': 'Exportações de Policiais',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
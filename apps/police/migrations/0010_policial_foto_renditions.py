@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0009_exportacaopolicial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='policial',
+            name='foto_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
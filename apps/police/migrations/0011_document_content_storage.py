@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:37
+
+import apps.utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0010_policial_foto_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='certidaonascimento',
+            name='arquivo',
+            field=models.FileField(blank=True, null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/%Y/%m/', verbose_name='Arquivo'),
+        ),
+        migrations.AlterField(
+            model_name='cnh',
+            name='arquivo',
+            field=models.FileField(blank=True, null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/%Y/%m/', verbose_name='Arquivo'),
+        ),
+        migrations.AlterField(
+            model_name='escolaridade',
+            name='arquivo_diploma',
+            field=models.FileField(blank=True, null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/diplomas/%Y/%m/', verbose_name='Diploma/Certificado'),
+        ),
+        migrations.AlterField(
+            model_name='historicofuncao',
+            name='documento_arquivo',
+            field=models.FileField(blank=True, help_text='Arquivo digital do documento (PDF, DOC, etc)', null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/funcoes/%Y/%m/', verbose_name='Arquivo do Documento'),
+        ),
+        migrations.AlterField(
+            model_name='reservista',
+            name='arquivo',
+            field=models.FileField(blank=True, null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/%Y/%m/', verbose_name='Arquivo'),
+        ),
+        migrations.AlterField(
+            model_name='rg',
+            name='arquivo',
+            field=models.FileField(blank=True, null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/%Y/%m/', verbose_name='Arquivo'),
+        ),
+        migrations.AlterField(
+            model_name='tituloeleitor',
+            name='arquivo',
+            field=models.FileField(blank=True, null=True, storage=apps.utils.storage.get_content_storage, upload_to='documentos/%Y/%m/', verbose_name='Arquivo'),
+        ),
+    ]
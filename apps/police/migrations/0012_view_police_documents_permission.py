@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_permission(apps, schema_editor):
+    EventPermission = apps.get_model('users', 'EventPermission')
+    EventPermission.objects.get_or_create(
+        codename='view_police_documents',
+        defaults={
+            'name': 'Visualizar Documentos de Policiais',
+            'short_name': 'Documentos',
+            'description': 'Permissão para baixar os documentos anexados ao cadastro dos policiais',
+        }
+    )
+
+
+def delete_permission(apps, schema_editor):
+    EventPermission = apps.get_model('users', 'EventPermission')
+    EventPermission.objects.filter(codename='view_police_documents').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0011_document_content_storage'),
+        ('users', '0007_userpermission_updated_at_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_permission, delete_permission),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# Índices das buscas por prefixo do autocomplete (apenas PostgreSQL):
+# UPPER(nome) LIKE 'TERMO%' só usa índice com text_pattern_ops sobre a
+# mesma expressão (ver apps.utils.autocomplete.Autocomplete.filter_prefix).
+CREATE_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS police_grupofuncao_nome_upper_idx
+    ON police_grupofuncao (UPPER(nome) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS police_funcao_nome_upper_idx
+    ON police_funcao (UPPER(nome) text_pattern_ops);
+"""
+
+DROP_INDEXES_SQL = """
+DROP INDEX IF EXISTS police_grupofuncao_nome_upper_idx;
+DROP INDEX IF EXISTS police_funcao_nome_upper_idx;
+"""
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEXES_SQL)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEXES_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0012_view_police_documents_permission'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
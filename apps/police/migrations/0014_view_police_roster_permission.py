@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_permission(apps, schema_editor):
+    EventPermission = apps.get_model('users', 'EventPermission')
+    EventPermission.objects.get_or_create(
+        codename='view_police_roster',
+        defaults={
+            'name': 'Consultar Efetivo pela API',
+            'short_name': 'API do Efetivo',
+            'description': 'Permissão para consultar os dados dos policiais pela API',
+        }
+    )
+
+
+def delete_permission(apps, schema_editor):
+    EventPermission = apps.get_model('users', 'EventPermission')
+    EventPermission.objects.filter(codename='view_police_roster').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('police', '0013_autocomplete_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_permission, delete_permission),
+    ]
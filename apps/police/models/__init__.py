@@ -2,6 +2,8 @@ from .documentos import (
     CNH, RG, TituloEleitor, Reservista, CertidaoNascimento
 )
 from .funcoes import GrupoFuncao, Funcao, HistoricoFuncao
+from .exportacao import ExportacaoPolicial
+from .importacao import ImportacaoPolicial
 from .policial import (
     Policial, DadosFisicos, Fardamento,
     DadosFamiliares, Escolaridade
@@ -19,6 +21,10 @@ __all__ = [
     'GrupoFuncao',
     'Funcao',
     'HistoricoFuncao',
+
+    # Importação e exportação em lote
+    'ImportacaoPolicial',
+    'ExportacaoPolicial',
     
     # Policial e Relacionamentos
     'Policial',
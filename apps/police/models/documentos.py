@@ -3,6 +3,7 @@ from django.db import models
 from localflavor.br.models import BRStateField
 
 from apps.utils.models import BaseModel
+from apps.utils.storage import get_content_storage
 
 
 class Documento(BaseModel):
@@ -13,6 +14,7 @@ class Documento(BaseModel):
     arquivo = models.FileField(
         'Arquivo',
         upload_to='documentos/%Y/%m/',
+        storage=get_content_storage,
         null=True,
         blank=True
     )
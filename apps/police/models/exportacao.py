@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import models
+
+from apps.police.choices import FormatoExportacaoChoices, StatusExportacaoChoices
+from apps.utils.models import BaseModel
+
+
+class ExportacaoPolicial(BaseModel):
+    """
+    Exportação do efetivo gerada em segundo plano pela tarefa
+    exportar_policiais (ver apps.police.exportacao).
+    """
+    formato = models.CharField(
+        'Formato',
+        max_length=6,
+        choices=FormatoExportacaoChoices.choices,
+        default=FormatoExportacaoChoices.CSV
+    )
+    arquivo = models.FileField(
+        'Arquivo',
+        upload_to='exportacoes/%Y/%m/',
+        blank=True
+    )
+    criado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name='exportacoes_policiais',
+        verbose_name='Criado por'
+    )
+    status = models.CharField(
+        'Situação',
+        max_length=2,
+        choices=StatusExportacaoChoices.choices,
+        default=StatusExportacaoChoices.PENDENTE
+    )
+    total_linhas = models.PositiveIntegerField('Total de linhas', default=0)
+    mensagem = models.TextField('Mensagem', blank=True)
+    iniciada_em = models.DateTimeField('Iniciada em', null=True, blank=True)
+    concluida_em = models.DateTimeField('Concluída em', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Exportação de Policiais'
+        verbose_name_plural = 'Exportações de Policiais'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Exportação {self.pk} ({self.get_status_display()})"
+
+    @property
+    def finalizada(self):
+        return self.status in (StatusExportacaoChoices.CONCLUIDA, StatusExportacaoChoices.FALHOU)
@@ -4,6 +4,7 @@ from django.utils import timezone
 
 from apps.police.choices import FuncaoChoices
 from apps.utils.models import BaseModel
+from apps.utils.storage import get_content_storage
 
 
 class GrupoFuncao(BaseModel):
@@ -105,6 +106,7 @@ class HistoricoFuncao(BaseModel):
     documento_arquivo = models.FileField(
         'Arquivo do Documento',
         upload_to='documentos/funcoes/%Y/%m/',
+        storage=get_content_storage,
         null=True,
         blank=True,
         help_text='Arquivo digital do documento (PDF, DOC, etc)'
@@ -122,6 +124,7 @@ class HistoricoFuncao(BaseModel):
             models.Index(fields=['data_inicio']),
             models.Index(fields=['data_fim']),
             models.Index(fields=['matricula_sad']),
+            models.Index(fields=['updated_at', 'id']),
         ]
         constraints = [
             models.CheckConstraint(
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import models
+
+from apps.police.choices import StatusImportacaoChoices
+from apps.utils.models import BaseModel
+
+
+class ImportacaoPolicial(BaseModel):
+    """
+    Importação de policiais a partir de planilha (CSV ou XLSX).
+    Processada em lotes pela tarefa importar_policiais (ver apps.police.importacao).
+    """
+    arquivo = models.FileField(
+        'Arquivo',
+        upload_to='importacoes/%Y/%m/'
+    )
+    criado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name='importacoes_policiais',
+        verbose_name='Criado por'
+    )
+    status = models.CharField(
+        'Situação',
+        max_length=2,
+        choices=StatusImportacaoChoices.choices,
+        default=StatusImportacaoChoices.PENDENTE
+    )
+    total_linhas = models.PositiveIntegerField('Total de linhas', default=0)
+    linhas_processadas = models.PositiveIntegerField('Linhas processadas', default=0)
+    linhas_importadas = models.PositiveIntegerField('Linhas importadas', default=0)
+    erros = models.JSONField(
+        'Erros',
+        default=list,
+        blank=True,
+        help_text='Lista de {linha, campo, mensagem}'
+    )
+    mensagem = models.TextField('Mensagem', blank=True)
+    iniciada_em = models.DateTimeField('Iniciada em', null=True, blank=True)
+    concluida_em = models.DateTimeField('Concluída em', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Importação de Policiais'
+        verbose_name_plural = 'Importações de Policiais'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Importação {self.pk} ({self.get_status_display()})"
+
+    @property
+    def percentual(self):
+        if not self.total_linhas:
+            return 100 if self.status == StatusImportacaoChoices.CONCLUIDA else 0
+        return int(self.linhas_processadas * 100 / self.total_linhas)
+
+    @property
+    def finalizada(self):
+        return self.status in (StatusImportacaoChoices.CONCLUIDA, StatusImportacaoChoices.FALHOU)
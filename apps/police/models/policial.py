@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
 from django.db import models
@@ -11,6 +12,7 @@ from apps.police.choices import (CorCabeloChoices, CorOlhosChoices,
                                  SexoChoices, TipoCabeloChoices,
                                  TipoSanguineoChoices)
 from apps.utils.models import BaseModel
+from apps.utils.storage import get_content_storage
 
 
 class Policial(BaseModel):
@@ -159,6 +161,18 @@ class Policial(BaseModel):
         null=True,
         blank=True
     )
+    # Caminhos das versões redimensionadas da foto (ver apps.police.renditions)
+    foto_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False
+    )
+
+    # Mantido por trigger no PostgreSQL (ver migração 0006 e apps.police.search)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Policial'
@@ -168,6 +182,8 @@ class Policial(BaseModel):
             models.Index(fields=['matricula']),
             models.Index(fields=['cpf']),
             models.Index(fields=['nome']),
+            models.Index(fields=['nome', 'id']),
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def __str__(self):
@@ -392,6 +408,7 @@ class Escolaridade(BaseModel):
     arquivo_diploma = models.FileField(
         'Diploma/Certificado',
         upload_to='documentos/diplomas/%Y/%m/',
+        storage=get_content_storage,
         null=True,
         blank=True
     )
@@ -0,0 +1,17 @@
+from apps.police.models import Policial
+from apps.utils.renditions import ImageRenditions, Rendition, register
+
+
+class FotoPolicialRenditions(ImageRenditions):
+    """Foto do policial: avatar das listas, ficha e impressão (3x4)"""
+    model = Policial
+    field = 'foto'
+    renditions_field = 'foto_renditions'
+    renditions = (
+        Rendition('avatar', (96, 96)),
+        Rendition('card', (300, 400)),
+        Rendition('print', (600, 800), format='JPEG', quality=90),
+    )
+
+
+register(FotoPolicialRenditions)
@@ -0,0 +1,85 @@
+"""
+Busca textual no efetivo policial.
+
+No PostgreSQL, a busca usa o campo Policial.search_vector (mantido por
+trigger, ver migração 0006) com prefixos, sem acentos e ordenada por
+relevância. Em outros bancos, cai para filtros icontains.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, Q
+from unidecode import unidecode
+
+from apps.police.models import Policial
+
+# Campos cobertos pela busca
+SEARCH_FIELDS = ('nome', 'nome_guerra', 'matricula', 'cpf', 'rg')
+
+# Limite padrão de resultados do autocomplete
+SEARCH_RESULTS_LIMIT = 20
+
+# Pontuação removida de documentos (ex.: 111.444.777-35 -> 11144477735)
+_DOCUMENT_PUNCTUATION = re.compile(r'(?<=[0-9A-Za-z])[./-](?=[0-9A-Za-z])')
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_search_terms(term):
+    """
+    Normaliza o texto digitado em termos de busca: sem acentos, minúsculos,
+    documentos sem pontuação.
+
+    Returns:
+        list: Termos normalizados
+    """
+    term = unidecode(term or '').lower()
+    term = _DOCUMENT_PUNCTUATION.sub('', term)
+    return [word for word in _NON_WORD.split(term) if word]
+
+
+def build_search_query(terms):
+    """
+    Monta um SearchQuery com correspondência por prefixo de todos os termos.
+    """
+    raw = ' & '.join(f'{word}:*' for word in terms)
+    return SearchQuery(raw, search_type='raw', config='simple')
+
+
+def search_policiais(term, queryset=None, ranked=True):
+    """
+    Filtra o efetivo pelo texto informado.
+
+    Args:
+        term: Texto digitado (nome, nome de guerra, matrícula, CPF ou RG)
+        queryset: QuerySet base (padrão: todos os policiais)
+        ranked: Se True, ordena por relevância e anota o campo rank
+
+    Returns:
+        QuerySet: Policiais correspondentes
+    """
+    if queryset is None:
+        queryset = Policial.objects.all()
+
+    terms = normalize_search_terms(term)
+    if not terms:
+        return queryset.none()
+
+    if connections[queryset.db].vendor == 'postgresql':
+        query = build_search_query(terms)
+        queryset = queryset.filter(search_vector=query)
+        if ranked:
+            queryset = queryset.annotate(
+                rank=SearchRank(F('search_vector'), query)
+            ).order_by('-rank', 'nome', 'pk')
+        return queryset
+
+    # Fallback sem índice textual (ex.: SQLite em desenvolvimento)
+    for word in terms:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': word})
+        queryset = queryset.filter(condition)
+    if ranked:
+        queryset = queryset.order_by('nome', 'pk')
+    return queryset
@@ -0,0 +1,82 @@
+"""
+Serializers da API somente leitura do efetivo.
+
+Os arquivos dos documentos saem como URL de download autorizado (ver
+apps.police.downloads), não como caminho em /media/.
+"""
+from rest_framework import serializers
+
+from apps.police.models import (CNH, RG, CertidaoNascimento, DadosFisicos,
+                                Fardamento, Policial, Reservista,
+                                TituloEleitor)
+from apps.utils.api import ProtectedFileField, SparseFieldsetSerializer
+
+
+class CNHSerializer(serializers.ModelSerializer):
+    arquivo = ProtectedFileField('cnh')
+
+    class Meta:
+        model = CNH
+        exclude = ['policial']
+
+
+class RGSerializer(serializers.ModelSerializer):
+    arquivo = ProtectedFileField('rg')
+
+    class Meta:
+        model = RG
+        exclude = ['policial']
+
+
+class TituloEleitorSerializer(serializers.ModelSerializer):
+    arquivo = ProtectedFileField('titulo-eleitor')
+
+    class Meta:
+        model = TituloEleitor
+        exclude = ['policial']
+
+
+class ReservistaSerializer(serializers.ModelSerializer):
+    arquivo = ProtectedFileField('reservista')
+
+    class Meta:
+        model = Reservista
+        exclude = ['policial']
+
+
+class CertidaoNascimentoSerializer(serializers.ModelSerializer):
+    arquivo = ProtectedFileField('certidao-nascimento')
+
+    class Meta:
+        model = CertidaoNascimento
+        exclude = ['policial']
+
+
+class DadosFisicosSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DadosFisicos
+        exclude = ['policial']
+
+
+class FardamentoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Fardamento
+        exclude = ['policial']
+
+
+class PolicialSerializer(SparseFieldsetSerializer):
+    """
+    Dados do policial; documentos e dados complementares só com ?expand=.
+    """
+    class Meta:
+        model = Policial
+        exclude = ['search_vector', 'foto_renditions']
+        expandable = {
+            'cnh': CNHSerializer,
+            'rgs': RGSerializer,
+            'titulo_eleitor': TituloEleitorSerializer,
+            'reservista': ReservistaSerializer,
+            'certidao_nascimento': CertidaoNascimentoSerializer,
+            'dados_fisicos': DadosFisicosSerializer,
+            'fardamento': FardamentoSerializer,
+        }
@@ -0,0 +1,23 @@
+"""
+Fontes do feed de alterações do app police (ver apps.utils.sync).
+"""
+from apps.police.models import HistoricoFuncao, Policial
+from apps.utils.sync import ChangeFeed, register
+
+
+class PolicialChangeFeed(ChangeFeed):
+    """Dados dos policiais (mesmo evento da API do efetivo)"""
+    model = Policial
+    exclude = ('search_vector', 'foto_renditions')
+
+    def has_permission(self, request):
+        return request.user.check_permission('view_police_roster')
+
+
+class HistoricoFuncaoChangeFeed(PolicialChangeFeed):
+    model = HistoricoFuncao
+    exclude = ()
+
+
+register('policiais', PolicialChangeFeed)
+register('historico-funcoes', HistoricoFuncaoChangeFeed)
@@ -0,0 +1,18 @@
+"""
+Tarefas assíncronas do app police.
+"""
+from celery import shared_task
+
+from apps.police import exportacao, importacao
+
+
+@shared_task(ignore_result=True)
+def importar_policiais(importacao_id):
+    """Processa uma importação de policiais em lote"""
+    importacao.processar_importacao(importacao_id)
+
+
+@shared_task(ignore_result=True)
+def exportar_policiais(exportacao_id):
+    """Gera o arquivo de uma exportação do efetivo"""
+    exportacao.processar_exportacao(exportacao_id)
@@ -1,3 +1,27 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from apps.police.models import Funcao, GrupoFuncao
+from apps.users.models import User
+from apps.utils.testing import ListQueryCountMixin
+
+
+# As configurações de desenvolvimento exibem a debug toolbar, cujas URLs
+# não são carregadas nos testes (DEBUG=False)
+@override_settings(DEBUG_TOOLBAR_CONFIG={'SHOW_TOOLBAR_CALLBACK': lambda request: False})
+class FuncaoListViewTest(ListQueryCountMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'senha')
+
+    def create_funcoes(self, total):
+        # Um grupo por função: sem select_related, cada linha faria uma consulta
+        start = Funcao.objects.count()
+        for i in range(start, start + total):
+            grupo = GrupoFuncao.objects.create(nome=f'Grupo {i:03d}')
+            Funcao.objects.create(nome=f'Função {i:03d}', grupo=grupo)
+
+    def test_query_count(self):
+        self.client.force_login(self.user)
+        self.assertListQueryCount(reverse('police:funcao-list'), self.create_funcoes)
@@ -4,8 +4,17 @@ from apps.police.views import (FuncaoCreateView, FuncaoDeleteView,
                                FuncaoListView, FuncaoUpdateView,
                                GrupoFuncaoCreateView, GrupoFuncaoDeleteView,
                                GrupoFuncaoListView, GrupoFuncaoUpdateView)
+from apps.police.views.exportacao import (ExportacaoPolicialCreateView,
+                                           ExportacaoPolicialDetailView,
+                                           ExportacaoPolicialDownloadView,
+                                           PolicialExportView)
+from apps.police.views.importacao import (ImportacaoPolicialCreateView,
+                                           ImportacaoPolicialDetailView,
+                                           ImportacaoPolicialErrosView,
+                                           ImportacaoPolicialModeloView,
+                                           ImportacaoPolicialProgressView)
 from apps.police.views.policiais import (PolicialDeleteView, PolicialListView,
-                                         PolicialUpdateView,
+                                         PolicialSearchView, PolicialUpdateView,
                                          PolicialWizardView, PolicialDetailView)
 
 app_name = 'police'
@@ -26,6 +35,18 @@ urlpatterns = [
     # URLs para Policial
     path('policiais/', PolicialListView.as_view(), name='policial-list'),
     path('policiais/novo/', PolicialWizardView.as_view(), name='policial-create'),
+    path('policiais/buscar/', PolicialSearchView.as_view(), name='policial-search'),
+    path('policiais/exportar/', PolicialExportView.as_view(), name='policial-export'),
+    path('policiais/exportacoes/', ExportacaoPolicialCreateView.as_view(), name='exportacao-create'),
+    path('policiais/exportacoes/<int:pk>/', ExportacaoPolicialDetailView.as_view(), name='exportacao-detail'),
+    path('policiais/exportacoes/<int:pk>/download/', ExportacaoPolicialDownloadView.as_view(),
+         name='exportacao-download'),
+    path('policiais/importacoes/', ImportacaoPolicialCreateView.as_view(), name='importacao-create'),
+    path('policiais/importacoes/modelo/', ImportacaoPolicialModeloView.as_view(), name='importacao-modelo'),
+    path('policiais/importacoes/<int:pk>/', ImportacaoPolicialDetailView.as_view(), name='importacao-detail'),
+    path('policiais/importacoes/<int:pk>/progresso/', ImportacaoPolicialProgressView.as_view(),
+         name='importacao-progress'),
+    path('policiais/importacoes/<int:pk>/erros/', ImportacaoPolicialErrosView.as_view(), name='importacao-erros'),
     path('policiais/<int:pk>/', PolicialDetailView.as_view(), name='policial-detail'),  # Nova URL
     path('policiais/<int:pk>/editar/', PolicialUpdateView.as_view(), name='policial-update'),
     path('policiais/<int:pk>/excluir/', PolicialDeleteView.as_view(), name='policial-delete'),
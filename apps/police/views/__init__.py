@@ -3,12 +3,13 @@ from .funcoes import (FuncaoCreateView, FuncaoDeleteView, FuncaoListView,
                       GrupoFuncaoDeleteView, GrupoFuncaoListView,
                       GrupoFuncaoUpdateView)
 from .policiais import (PolicialDeleteView, PolicialListView,
-                        PolicialUpdateView, PolicialWizardView)
+                        PolicialSearchView, PolicialUpdateView,
+                        PolicialWizardView)
 
 __all__ = [
     'FuncaoCreateView', 'FuncaoDeleteView', 'FuncaoListView', 'FuncaoUpdateView',
     'GrupoFuncaoCreateView', 'GrupoFuncaoDeleteView', 'GrupoFuncaoListView',
     'GrupoFuncaoUpdateView', 'PolicialWizardView',
     'PolicialListView', 'PolicialUpdateView',
-    'PolicialDeleteView'
+    'PolicialDeleteView', 'PolicialSearchView'
 ]
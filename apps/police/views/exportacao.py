@@ -0,0 +1,79 @@
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.views import generic
+
+from apps.police import exportacao
+from apps.police.choices import FormatoExportacaoChoices, StatusExportacaoChoices
+from apps.police.forms import ExportacaoPolicialForm
+from apps.police.models import ExportacaoPolicial
+from apps.police.tasks import exportar_policiais
+from apps.utils.downloads import serve_file
+from apps.utils.views import BaseCreateView, BaseDetailView, BaseViewMixin
+
+
+class ExportacaoPolicialMixin(UserPassesTestMixin):
+    """A exportação traz dados pessoais de todo o efetivo: somente equipe"""
+    model = ExportacaoPolicial
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+
+class PolicialExportView(ExportacaoPolicialMixin, BaseViewMixin, generic.View):
+    """Efetivo em CSV ou NDJSON (?formato=), enviado conforme é lido do banco"""
+
+    def get(self, request, *args, **kwargs):
+        formato = request.GET.get('formato', FormatoExportacaoChoices.CSV)
+        if formato not in exportacao.FORMATOS_STREAMING:
+            raise Http404
+        response = StreamingHttpResponse(
+            exportacao.gerar(formato),
+            content_type=exportacao.CONTENT_TYPES[formato],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{exportacao.get_nome_arquivo(formato)}"'
+        )
+        return response
+
+
+class ExportacaoPolicialCreateView(ExportacaoPolicialMixin, BaseCreateView):
+    form_class = ExportacaoPolicialForm
+    template_name = 'police/exportacao/exportacao_form.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'title': 'Exportar Efetivo',
+            'exportacoes': ExportacaoPolicial.objects.select_related('criado_por')[:10],
+            'formatos_streaming': exportacao.FORMATOS_STREAMING,
+        })
+        return context
+
+    def form_valid(self, form):
+        form.instance.criado_por = self.request.user
+        response = super().form_valid(form)
+        pk = self.object.pk
+        transaction.on_commit(lambda: exportar_policiais.delay(pk))
+        return response
+
+    def get_success_url(self):
+        return reverse('police:exportacao-detail', kwargs={'pk': self.object.pk})
+
+
+class ExportacaoPolicialDetailView(ExportacaoPolicialMixin, BaseDetailView):
+    template_name = 'police/exportacao/exportacao_detail.html'
+    detail_select_related = ('criado_por',)
+
+    def get_title(self):
+        return f'Exportação do Efetivo nº {self.object.pk}'
+
+
+class ExportacaoPolicialDownloadView(ExportacaoPolicialMixin, BaseViewMixin, generic.detail.BaseDetailView):
+    """Arquivo gerado pela exportação"""
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.object.status != StatusExportacaoChoices.CONCLUIDA or not self.object.arquivo:
+            raise Http404
+        return serve_file(self.object.arquivo, as_attachment=True)
@@ -63,6 +63,7 @@ class FuncaoListView(BaseListView):
     context_object_name = 'funcoes'
     ordering = ['nome']
     paginate_by = 10
+    list_select_related = ('grupo',)
 
 
 class FuncaoCreateView(BaseCreateView):
@@ -0,0 +1,99 @@
+import csv
+
+from django.db import transaction
+from django.http import HttpResponse
+from django.urls import reverse
+from django.views import generic
+
+from apps.police.forms import ImportacaoPolicialForm
+from apps.police.importacao import get_cabecalho
+from apps.police.models import ImportacaoPolicial
+from apps.police.tasks import importar_policiais
+from apps.utils.views import BaseCreateView, BaseDetailView, BaseViewMixin
+
+
+class ImportacaoPolicialMixin:
+    """Usuários comuns só veem as próprias importações"""
+    model = ImportacaoPolicial
+
+    def get_queryset(self):
+        queryset = ImportacaoPolicial.objects.select_related('criado_por')
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(criado_por=self.request.user)
+        return queryset
+
+
+class ImportacaoPolicialCreateView(ImportacaoPolicialMixin, BaseCreateView):
+    form_class = ImportacaoPolicialForm
+    template_name = 'police/importacao/importacao_form.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'title': 'Importar Policiais',
+            'importacoes': self.get_queryset().defer('erros')[:10],
+        })
+        return context
+
+    def form_valid(self, form):
+        form.instance.criado_por = self.request.user
+        response = super().form_valid(form)
+        # O worker só deve ler a importação depois do commit
+        pk = self.object.pk
+        transaction.on_commit(lambda: importar_policiais.delay(pk))
+        return response
+
+    def get_success_url(self):
+        return reverse('police:importacao-detail', kwargs={'pk': self.object.pk})
+
+
+class ImportacaoPolicialDetailView(ImportacaoPolicialMixin, BaseDetailView):
+    template_name = 'police/importacao/importacao_detail.html'
+
+    def get_title(self):
+        return f'Importação de Policiais nº {self.object.pk}'
+
+
+class ImportacaoPolicialProgressView(ImportacaoPolicialMixin, BaseViewMixin, generic.detail.BaseDetailView):
+    """Andamento da importação (JSON), consultado pela página de detalhes"""
+
+    def render_to_response(self, context, **response_kwargs):
+        importacao = self.object
+        return self.render_to_json_response({
+            'status': importacao.status,
+            'status_display': importacao.get_status_display(),
+            'finalizada': importacao.finalizada,
+            'total_linhas': importacao.total_linhas,
+            'linhas_processadas': importacao.linhas_processadas,
+            'linhas_importadas': importacao.linhas_importadas,
+            'percentual': importacao.percentual,
+            'erros': len(importacao.erros),
+            'mensagem': importacao.mensagem,
+        })
+
+
+class ImportacaoPolicialErrosView(ImportacaoPolicialMixin, BaseViewMixin, generic.detail.BaseDetailView):
+    """Relatório de erros por linha (CSV)"""
+
+    def render_to_response(self, context, **response_kwargs):
+        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = (
+            f'attachment; filename="importacao_{self.object.pk}_erros.csv"'
+        )
+        response.write('\ufeff')  # BOM para o Excel
+        writer = csv.writer(response, delimiter=';')
+        writer.writerow(['linha', 'campo', 'mensagem'])
+        for erro in self.object.erros:
+            writer.writerow([erro['linha'], erro['campo'], erro['mensagem']])
+        return response
+
+
+class ImportacaoPolicialModeloView(BaseViewMixin, generic.View):
+    """Planilha modelo (CSV) com o cabeçalho aceito pela importação"""
+
+    def get(self, request, *args, **kwargs):
+        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="modelo_importacao_policiais.csv"'
+        response.write('\ufeff')  # BOM para o Excel
+        csv.writer(response, delimiter=';').writerow(get_cabecalho())
+        return response
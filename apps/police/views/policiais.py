@@ -1,5 +1,7 @@
 from django.db import transaction
+from django.db.models import Prefetch
 from django.urls import reverse_lazy
+from django.views import generic
 
 from apps.police.forms import (PolicialContatoForm, PolicialDadosBancariosForm,
                                PolicialDadosFisicosForm,
@@ -8,9 +10,10 @@ from apps.police.forms import (PolicialContatoForm, PolicialDadosBancariosForm,
                                PolicialFamiliaresForm, PolicialFardamentoForm,
                                PolicialForm)
 from apps.police.models import (DadosFamiliares, DadosFisicos, Escolaridade,
-                                Fardamento, Policial)
+                                Fardamento, HistoricoFuncao, Policial)
+from apps.police.search import SEARCH_RESULTS_LIMIT, search_policiais
 from apps.utils.views import (BaseDeleteView, BaseDetailView, BaseListView,
-                              BaseUpdateView, BaseWizardView)
+                              BaseUpdateView, BaseViewMixin, BaseWizardView)
 
 
 class PolicialListView(BaseListView):
@@ -19,13 +22,42 @@ class PolicialListView(BaseListView):
     context_object_name = 'policiais'
     ordering = ['nome']
     paginate_by = 10
+    keyset_pagination = True
+    keyset_count = True
+    estimate_count = True
+
+    def get_queryset(self):
+        """Aplica o filtro de busca textual (?q=)"""
+        queryset = super().get_queryset().defer('search_vector')
+        term = self.request.GET.get('q', '').strip()
+        if term:
+            # A ordenação por nome é mantida para a paginação por cursor
+            queryset = search_policiais(term, queryset, ranked=False)
+        return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Policiais'
+        context['q'] = self.request.GET.get('q', '')
         return context
 
 
+class PolicialSearchView(BaseViewMixin, generic.View):
+    """Busca do efetivo para autocomplete (JSON)"""
+
+    def get(self, request, *args, **kwargs):
+        term = request.GET.get('q', '').strip()
+        try:
+            limit = min(int(request.GET.get('limit', SEARCH_RESULTS_LIMIT)), SEARCH_RESULTS_LIMIT)
+        except ValueError:
+            limit = SEARCH_RESULTS_LIMIT
+
+        results = search_policiais(term).values(
+            'id', 'matricula', 'nome', 'nome_guerra'
+        )[:max(limit, 1)]
+        return self.render_to_json_response({'results': list(results)})
+
+
 class PolicialUpdateView(BaseUpdateView):
     model = Policial
     form_class = PolicialForm
@@ -201,6 +233,26 @@ class PolicialDetailView(BaseDetailView):
     context_object_name = 'policial'
     subtitle = 'Informações completas do policial'
 
+    # Plano de carregamento da ficha completa do policial
+    detail_select_related = (
+        'user',
+        'dados_fisicos',
+        'fardamento',
+        'cnh',
+        'titulo_eleitor',
+        'reservista',
+        'certidao_nascimento',
+    )
+    detail_prefetch_related = (
+        'rgs',
+        'familiares',
+        'escolaridades',
+        Prefetch(
+            'historico_funcoes',
+            queryset=HistoricoFuncao.objects.select_related('funcao__grupo')
+        ),
+    )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = f'Detalhes do Policial: {self.object.nome}'
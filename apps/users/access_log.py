@@ -0,0 +1,206 @@
+"""
+Gravação em lote do log de acessos (UserAccess).
+
+Com ACCESS_LOG_BUFFER_ENABLED, os eventos de acesso são serializados e
+enfileirados em uma lista do Redis de REDIS_URL (persistida pelo appendonly
+do Redis), sem tocar o banco durante o login. A tarefa flush_access_log
+(Celery beat) ou o comando de mesmo nome grava os eventos com bulk_create
+em lotes de ACCESS_LOG_BATCH_SIZE.
+
+Um lote só é removido da fila depois de gravado: se o worker cair no meio
+da gravação, os eventos continuam na fila (entrega pelo menos uma vez).
+Eventos que não podem ser gravados (JSON inválido, usuário excluído, valor
+recusado pelo banco) vão para a lista DEAD_LETTER_KEY, para não travar a
+fila; falhas de conexão interrompem a execução e o lote é repetido depois.
+
+Sem Redis, com o Redis fora do ar ou com o buffer desabilitado, o evento é
+gravado na hora.
+"""
+import json
+import logging
+
+from django.db import (DatabaseError, InterfaceError, OperationalError,
+                       transaction)
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis.exceptions import LockError, RedisError
+
+from apps.users.models.auth.constants import (ACCESS_LOG_BATCH_SIZE,
+                                              ACCESS_LOG_BUFFER_ENABLED)
+from apps.users.models.auth.user import UserAccess
+from apps.utils.cache import get_redis_client
+
+BUFFER_KEY = 'access_log:buffer'
+DEAD_LETTER_KEY = 'access_log:dead'
+FLUSH_LOCK_KEY = 'access_log:flush_lock'
+FLUSH_LOCK_TIMEOUT = 60 * 5
+
+USER_AGENT_MAX_LENGTH = UserAccess._meta.get_field('user_agent').max_length
+
+logger = logging.getLogger(__name__)
+
+
+def get_buffer():
+    """
+    Retorna o cliente Redis ou None se o buffer não puder ser usado.
+    """
+    if not ACCESS_LOG_BUFFER_ENABLED:
+        return None
+    return get_redis_client()
+
+
+def log_access(user, ip_address=None, user_agent=None, session_id=None,
+               success=True, details=None):
+    """
+    Registra um evento de acesso, enfileirando-o quando o buffer está ativo.
+
+    A data/hora é a do evento, não a da gravação.
+    """
+    event = {
+        'user_id': str(user.pk),
+        'date_time': timezone.now().isoformat(),
+        'ip_address': ip_address,
+        'user_agent': (user_agent or '')[:USER_AGENT_MAX_LENGTH] or None,
+        'session_id': session_id,
+        'success': success,
+        'details': details,
+    }
+    client = get_buffer()
+    if client is not None:
+        try:
+            client.rpush(BUFFER_KEY, json.dumps(event))
+            return
+        except RedisError as e:
+            logger.warning("Falha ao enfileirar evento de acesso, gravando direto no banco: %s", e)
+    UserAccess.objects.bulk_create([_build_access(event)])
+
+
+def _build_access(event):
+    return UserAccess(
+        user_id=event['user_id'],
+        date_time=parse_datetime(event['date_time']),
+        ip_address=event['ip_address'],
+        user_agent=event['user_agent'],
+        session_id=event['session_id'],
+        success=event['success'],
+        details=event['details'],
+    )
+
+
+def _parse_event(raw):
+    """
+    Returns:
+        UserAccess ou None se o evento for inválido
+    """
+    try:
+        access = _build_access(json.loads(raw))
+    except (ValueError, TypeError, KeyError) as e:
+        logger.warning("Evento de acesso inválido enviado para %s: %s", DEAD_LETTER_KEY, e)
+        return None
+    if access.date_time is None:
+        logger.warning("Evento de acesso sem data enviado para %s", DEAD_LETTER_KEY)
+        return None
+    return access
+
+
+def _write_batch(events):
+    """
+    Grava um lote; se o banco recusar algum evento, grava os demais
+    individualmente para não travar a fila.
+
+    Args:
+        events: Pares (evento bruto, UserAccess)
+
+    Returns:
+        list: Eventos brutos recusados pelo banco
+    """
+    try:
+        with transaction.atomic():
+            UserAccess.objects.bulk_create([access for _, access in events])
+        return []
+    except (OperationalError, InterfaceError):
+        raise
+    except DatabaseError:
+        pass
+
+    rejected = []
+    for raw, access in events:
+        try:
+            with transaction.atomic():
+                UserAccess.objects.bulk_create([access])
+        except (OperationalError, InterfaceError):
+            raise
+        except DatabaseError as e:
+            logger.warning(
+                "Evento de acesso do usuário %s recusado pelo banco e enviado para %s: %s",
+                access.user_id, DEAD_LETTER_KEY, e
+            )
+            rejected.append(raw)
+    return rejected
+
+
+def pending_count():
+    """Número de eventos aguardando gravação"""
+    client = get_buffer()
+    return client.llen(BUFFER_KEY) if client is not None else 0
+
+
+def flush_access_log(batch_size=ACCESS_LOG_BATCH_SIZE, max_batches=None):
+    """
+    Grava os eventos enfileirados em lotes.
+
+    Apenas um processo grava por vez: a trava do Redis tem dono (token) e
+    sua validade é renovada antes de cada lote e conferida antes de removê-lo
+    da fila; se tiver expirado (lote mais lento que FLUSH_LOCK_TIMEOUT), a
+    execução para com LockNotOwnedError sem remover o lote. Chamadas
+    concorrentes retornam 0 imediatamente.
+
+    Args:
+        batch_size: Eventos por bulk_create
+        max_batches: Limite de lotes nesta execução (None: esvazia a fila)
+
+    Returns:
+        int: Número de eventos gravados
+    """
+    client = get_buffer()
+    if client is None:
+        return 0
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    written = 0
+    batches = 0
+    try:
+        while max_batches is None or batches < max_batches:
+            # Renova a validade da trava para o lote (LockNotOwnedError se expirou)
+            lock.reacquire()
+            raw_events = client.lrange(BUFFER_KEY, 0, batch_size - 1)
+            if not raw_events:
+                break
+            events = []
+            dead = []
+            for raw in raw_events:
+                access = _parse_event(raw)
+                if access is None:
+                    dead.append(raw)
+                else:
+                    events.append((raw, access))
+            rejected = _write_batch(events) if events else []
+            dead.extend(rejected)
+
+            # Confirma que a trava ainda é deste processo antes de remover o lote
+            lock.reacquire()
+            pipe = client.pipeline()
+            if dead:
+                pipe.rpush(DEAD_LETTER_KEY, *dead)
+            pipe.ltrim(BUFFER_KEY, len(raw_events), -1)
+            pipe.execute()
+            written += len(events) - len(rejected)
+            batches += 1
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            pass
+    return written
@@ -1,8 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.cache import bump_nav_menu_version
+from apps.users.cache import invalidate_user_permissions
 from apps.users.models import User, UserAccess, Permission, EventPermission, UserPermission
+from apps.users.models.auth.choices import PermissionChoices
+from apps.utils.pagination import EstimatedCountPaginator
 
 
 @admin.register(User)
@@ -32,7 +38,8 @@ class UserAdmin(DjangoUserAdmin):
     ordering = ('username',)
     filter_horizontal = ('groups', 'user_permissions')
     
-    actions = ['activate_users', 'deactivate_users', 'suspend_users']
+    actions = ['activate_users', 'deactivate_users', 'suspend_users',
+               'clear_permission_cache']
     
     def activate_users(self, request, queryset):
         """Ativa usuários selecionados"""
@@ -55,6 +62,13 @@ class UserAdmin(DjangoUserAdmin):
         self.message_user(request, f"{queryset.count()} usuários foram suspensos com sucesso.")
     suspend_users.short_description = "Suspender usuários selecionados"
 
+    def clear_permission_cache(self, request, queryset):
+        """Invalida o cache de permissões dos usuários selecionados"""
+        user_ids = list(queryset.values_list('pk', flat=True))
+        invalidate_user_permissions(*user_ids)
+        self.message_user(request, f"Cache de permissões limpo para {len(user_ids)} usuários.")
+    clear_permission_cache.short_description = "Limpar cache de permissões"
+
 
 @admin.register(UserAccess)
 class UserAccessAdmin(admin.ModelAdmin):
@@ -62,8 +76,12 @@ class UserAccessAdmin(admin.ModelAdmin):
     list_display = ('user', 'date_time', 'ip_address', 'success')
     list_filter = ('success', 'date_time')
     search_fields = ('user__username', 'ip_address', 'user_agent')
-    date_hierarchy = 'date_time'
+    # Sem date_hierarchy: a navegação por datas agrega a tabela inteira.
+    # O filtro por date_time gera intervalos que atingem só as partições
+    # dos meses envolvidos.
     readonly_fields = ('date_time', 'user', 'ip_address', 'user_agent', 'session_id', 'success', 'details')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Permission)
@@ -87,9 +105,44 @@ class UserPermissionAdmin(admin.ModelAdmin):
     list_filter = ('permission', 'event')
     search_fields = ('user__username', 'event__name', 'event__codename')
     date_hierarchy = 'updated_at'
+
+    actions = ['grant_permissions', 'revoke_permissions']
     
     def permission_display(self, obj):
         """Mostra o valor da permissão de forma mais amigável"""
-        from apps.users.models.auth.choices import PermissionChoices
         return _('Sim') if obj.permission == PermissionChoices.YES else _('Não')
     permission_display.short_description = _('Permissão')
+
+    def _set_permission(self, request, queryset, permission):
+        """
+        Altera as permissões em massa.
+        O update() não dispara sinais nem o auto_now, então os caches
+        (permissões e menu) são invalidados e updated_at (usado pelo feed de
+        alterações) é gravado aqui. A invalidação fica para depois do commit:
+        antes dele, outra requisição regravaria no cache as permissões antigas.
+        """
+        user_ids = set(queryset.values_list('user_id', flat=True))
+        updated = queryset.update(
+            permission=permission,
+            legacy_value=PermissionChoices.to_legacy(permission),
+            updated_at=timezone.now()
+        )
+
+        def invalidate():
+            invalidate_user_permissions(*user_ids)
+            bump_nav_menu_version()
+
+        transaction.on_commit(invalidate)
+        return updated
+
+    def grant_permissions(self, request, queryset):
+        """Concede as permissões selecionadas"""
+        updated = self._set_permission(request, queryset, PermissionChoices.YES)
+        self.message_user(request, f"{updated} permissões foram concedidas com sucesso.")
+    grant_permissions.short_description = "Conceder permissões selecionadas"
+
+    def revoke_permissions(self, request, queryset):
+        """Revoga as permissões selecionadas"""
+        updated = self._set_permission(request, queryset, PermissionChoices.NO)
+        self.message_user(request, f"{updated} permissões foram revogadas com sucesso.")
+    revoke_permissions.short_description = "Revogar permissões selecionadas"
@@ -5,3 +5,13 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     label = 'users'  # O label deve ser um identificador Python válido
+
+    def ready(self):
+        # Registra os sinais de invalidação do cache de permissões
+        from apps.users import signals  # noqa
+
+        # Registra as fontes de autocomplete
+        from apps.users import autocomplete  # noqa
+
+        # Registra as fontes do feed de alterações
+        from apps.users import sync  # noqa
@@ -0,0 +1,107 @@
+"""
+Autenticação por token da API com cache.
+
+O TokenAuthentication do DRF consulta token e usuário (JOIN) a cada
+requisição. CachedTokenAuthentication guarda no cache, por
+TOKEN_CACHE_TIMEOUT segundos, os campos do usuário dono do token (sem a
+senha) e monta o usuário a partir deles, sem acessar o banco.
+
+As entradas são removidas quando o token é excluído e quando o usuário é
+salvo (desativação, suspensão, edição no admin) ou bloqueado/desbloqueado
+por tentativas de login (ver User.invalidate_token_cache). A chave do cache
+usa o hash do token, que não fica exposto no Redis.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from apps.users.models.auth.constants import TOKEN_CACHE_TIMEOUT
+from apps.users.models.auth.user import User
+
+TOKEN_CACHE_KEY = 'auth_token:{digest}'
+
+# Campos do usuário que não vão para o cache
+EXCLUDED_USER_FIELDS = ('password',)
+
+
+def get_token_cache_key(key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return TOKEN_CACHE_KEY.format(digest=digest)
+
+
+def invalidate_tokens(*keys):
+    """Remove do cache as entradas dos tokens informados"""
+    cache.delete_many([get_token_cache_key(key) for key in keys])
+
+
+def invalidate_user_tokens(*user_ids):
+    """
+    Remove do cache as entradas dos tokens dos usuários informados.
+    Deve ser chamado após alterações feitas com queryset.update().
+    """
+    from rest_framework.authtoken.models import Token
+
+    keys = list(Token.objects.filter(user_id__in=user_ids).values_list('key', flat=True))
+    if keys:
+        invalidate_tokens(*keys)
+
+
+def _user_fields():
+    return [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname not in EXCLUDED_USER_FIELDS
+    ]
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication que resolve token → usuário pelo cache.
+
+    A validação (usuário ativo e não bloqueado) é refeita a cada requisição
+    sobre os dados em cache, então um bloqueio que expira passa a valer sem
+    esperar a expiração da entrada.
+    """
+
+    def authenticate_credentials(self, key):
+        if not TOKEN_CACHE_TIMEOUT:
+            user, token = super().authenticate_credentials(key)
+            self.check_user(user)
+            return user, token
+
+        cache_key = get_token_cache_key(key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            entry = self._load_entry(key)
+            cache.set(cache_key, entry, TOKEN_CACHE_TIMEOUT)
+
+        user = User.from_db(User.objects.db, list(entry['user']), list(entry['user'].values()))
+        token = self.get_model()(key=key, user=user, created=entry['created'])
+        self.check_user(user)
+        return user, token
+
+    def _load_entry(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        return {
+            'user': {name: getattr(token.user, name) for name in _user_fields()},
+            'created': token.created,
+        }
+
+    def check_user(self, user):
+        """
+        Raises:
+            AuthenticationFailed: Usuário inativo, suspenso ou bloqueado
+        """
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if user.is_locked_out():
+            raise exceptions.AuthenticationFailed(
+                'Conta temporariamente bloqueada por excesso de tentativas de login.'
+            )
@@ -0,0 +1,26 @@
+"""
+Fontes de autocomplete do app users (ver apps.utils.autocomplete).
+"""
+from apps.users.models import User
+from apps.utils.autocomplete import Autocomplete, register
+
+
+class UserAutocomplete(Autocomplete):
+    """
+    Busca por prefixo de username ou matrícula, sem diferenciar maiúsculas
+    (índices UPPER() da migração 0008).
+    """
+    model = User
+    fields = ('username', 'first_name', 'last_name', 'registration_number')
+    label = '{username}'
+    ordering = ('username',)
+    min_length = 2
+
+    def has_permission(self, request):
+        return request.user.is_staff
+
+    def filter_queryset(self, queryset, term):
+        return self.filter_prefix(queryset, term, 'username', 'registration_number')
+
+
+register('usuarios', UserAutocomplete)
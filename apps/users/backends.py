@@ -1,7 +1,17 @@
+import logging
+
 from django.contrib.auth.backends import ModelBackend
 from ipware import get_client_ip
 
-from apps.users.models.auth.user import User, UserAccess
+from apps.users import throttle
+from apps.users.access_log import log_access
+from apps.users.exceptions import (IncorrectCredentialsException,
+                                   TooManyLoginAttemptsException,
+                                   UserAccountLockedException)
+from apps.users.models.auth.constants import LOGIN_THROTTLE_ENABLED
+from apps.users.models.auth.user import User
+
+logger = logging.getLogger(__name__)
 
 
 class CustomAuthBackend(ModelBackend):
@@ -11,70 +21,131 @@ class CustomAuthBackend(ModelBackend):
     2. Gerencia tentativas de login e bloqueio de conta
     3. Usa ipware para detecção confiável de IP
     """
-    
+
     def user_can_authenticate(self, user):
         """
         Sobrescreve o método da classe pai para verificar também o bloqueio.
         """
         return super().user_can_authenticate(user) and not user.is_locked_out()
-    
+
     def authenticate(self, request, username=None, password=None, **kwargs):
         if username is None:
             username = kwargs.get('username')
-            
-        if username is None or password is None:
-            return None
-            
+
         try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(registration_number=username)
-            except User.DoesNotExist:
-                if request:
-                    ip = self.get_client_ip(request)
-                    self.log_failed_attempt(username, ip)
-                return None
-        
-        if user.is_locked_out():
+            return self.authenticate_credentials(request, username, password)
+        except (IncorrectCredentialsException, TooManyLoginAttemptsException,
+                UserAccountLockedException):
             return None
-        
-        if user.check_password(password) and self.user_can_authenticate(user):
-            if request:
-                ip = self.get_client_ip(request)
-                user.record_login_attempt(success=True, ip_address=ip)
-            return user
-        else:
-            if request:
-                ip = self.get_client_ip(request)
-                user.record_login_attempt(success=False, ip_address=ip)
-            return None
-    
+
+    def authenticate_credentials(self, request, username, password):
+        """
+        Fluxo completo de login: uma consulta pelo usuário, verificação de
+        bloqueio e senha e registro da tentativa.
+
+        Com LOGIN_THROTTLE_ENABLED, as falhas são contadas no cache por
+        conta e por IP (apps.users.throttle) e o banco só é gravado quando
+        o bloqueio começa; caso contrário, cada falha incrementa o contador
+        da conta no banco.
+
+        O IP bloqueado recusa a tentativa antes de qualquer consulta ou
+        verificação de senha, exceto para logins que já entraram a partir
+        dele (throttle.is_known_login), para que uma unidade atrás do mesmo
+        NAT não fique sem acesso. As falhas desses logins continuam contando
+        para o bloqueio de cada conta.
+
+        Raises:
+            IncorrectCredentialsException: Usuário inexistente ou senha inválida
+            UserAccountLockedException: Conta bloqueada (inclusive nesta tentativa)
+            TooManyLoginAttemptsException: Tentativa vinda de IP bloqueado
+
+        Returns:
+            User: Usuário autenticado
+        """
+        ip = self.get_client_ip(request) if request else None
+        ip_locked = LOGIN_THROTTLE_ENABLED and throttle.get_ip_lockout(ip)
+
+        if ip_locked and not throttle.is_known_login(ip, username):
+            raise TooManyLoginAttemptsException(ip)
+
+        if not username or password is None:
+            raise IncorrectCredentialsException()
+
+        user = User.objects.get_by_login(username)
+
+        if user is None:
+            # Executa o hasher para não revelar, pelo tempo de resposta,
+            # que o usuário não existe (como no ModelBackend)
+            User().set_password(password)
+            self.log_failed_attempt(username, ip)
+            if LOGIN_THROTTLE_ENABLED:
+                throttle.register_failure(None, ip)
+            raise IncorrectCredentialsException()
+
+        if user.is_locked_out():
+            raise UserAccountLockedException(user.username, user.lockout_until)
+
+        if not (user.check_password(password) and self.user_can_authenticate(user)):
+            self.register_user_failure(user, ip)
+            log_access(
+                user,
+                ip_address=ip,
+                user_agent=request.META.get('HTTP_USER_AGENT') if request else None,
+                success=False,
+                details='Senha inválida ou usuário inativo',
+            )
+            if user.is_locked_out():
+                raise UserAccountLockedException(user.username, user.lockout_until)
+            if ip_locked:
+                raise TooManyLoginAttemptsException(ip)
+            raise IncorrectCredentialsException()
+
+        if LOGIN_THROTTLE_ENABLED:
+            throttle.reset_user(user.username)
+            throttle.remember_login(ip, username, user.username)
+        user.record_login_attempt(success=True, ip_address=ip)
+        user.backend = f'{self.__module__}.{self.__class__.__qualname__}'
+        return user
+
+    def register_user_failure(self, user, ip):
+        """
+        Registra a falha de login de um usuário existente.
+        """
+        if not LOGIN_THROTTLE_ENABLED:
+            user.record_login_attempt(success=False, ip_address=ip)
+            return
+
+        attempts = throttle.register_failure(user.username, ip)
+        if throttle.should_lock(attempts):
+            user.start_lockout(attempts)
+            throttle.reset_user(user.username)
+
     def get_client_ip(self, request):
         """
         Obtém o IP do cliente usando ipware, que lida melhor com proxies e diferentes
         configurações de servidor.
-        
+
         Returns:
             str|None: O endereço IP do cliente ou None se não for possível determinar
         """
         client_ip, is_routable = get_client_ip(request)
         if client_ip is None:
             return None
-            
+
         return client_ip
-    
+
     def log_failed_attempt(self, username, ip):
         """
         Registra uma tentativa de login falha sem usuário identificado.
-        
+
+        O log de acessos (UserAccess) exige um usuário, por isso essas
+        tentativas vão para o logger do backend.
+
         Args:
             username: O identificador tentado (username ou matrícula)
             ip: O endereço IP do cliente (pode ser None)
         """
-        UserAccess.objects.create(
-            user=None,
-            ip_address=ip,
-            success=False,
-            details=f"Tentativa de login com identificador inválido: {username}"
+        logger.warning(
+            "Tentativa de login com identificador inválido: %s (IP: %s)",
+            username, ip
         )
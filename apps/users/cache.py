@@ -0,0 +1,113 @@
+"""
+Cache compartilhado de permissões de usuários.
+
+O conjunto de códigos de eventos permitidos de cada usuário é armazenado no
+cache configurado (Redis), com chave composta por uma versão global e uma
+versão por usuário. Alterações em UserPermission incrementam a versão do
+usuário; alterações em EventPermission incrementam a versão global. Entradas
+antigas deixam de ser lidas e expiram pelo timeout.
+
+O cache é opt-in e controlado por PERMISSION_CACHE_ENABLED.
+"""
+import time
+
+from django.core.cache import cache
+
+from apps.users.models.auth.constants import (PERMISSION_CACHE_ENABLED,
+                                              PERMISSION_CACHE_TIMEOUT)
+from apps.utils.cache import incr_counter
+
+GLOBAL_VERSION_KEY = 'user_perms:version'
+USER_VERSION_KEY = 'user_perms:version:{user_id}'
+PERMISSIONS_KEY = 'user_perms:{global_version}:{user_id}:{user_version}'
+HITS_KEY = 'user_perms:stats:hits'
+MISSES_KEY = 'user_perms:stats:misses'
+
+
+def _initial_version():
+    """
+    Versão inicial baseada no relógio.
+
+    Se uma chave de versão for removida do cache, a nova versão nunca
+    coincide com uma anterior, evitando servir um conjunto desatualizado.
+    """
+    return int(time.time() * 1000)
+
+
+def get_permissions_cache_key(user_id):
+    """
+    Monta a chave do conjunto de permissões do usuário.
+    """
+    user_version_key = USER_VERSION_KEY.format(user_id=user_id)
+    versions = cache.get_many([GLOBAL_VERSION_KEY, user_version_key])
+    return PERMISSIONS_KEY.format(
+        global_version=versions.get(GLOBAL_VERSION_KEY, 0),
+        user_id=user_id,
+        user_version=versions.get(user_version_key, 0),
+    )
+
+
+def get_cached_event_permissions(user_id, loader):
+    """
+    Retorna as permissões do usuário a partir do cache compartilhado.
+
+    Args:
+        user_id: Identificador do usuário
+        loader: Função sem argumentos que carrega o conjunto do banco
+
+    Returns:
+        frozenset: Códigos (codename) dos eventos permitidos
+    """
+    if not PERMISSION_CACHE_ENABLED:
+        return loader()
+
+    key = get_permissions_cache_key(user_id)
+    codenames = cache.get(key)
+    if codenames is not None:
+        incr_counter(HITS_KEY)
+        return frozenset(codenames)
+
+    incr_counter(MISSES_KEY)
+    codenames = loader()
+    cache.set(key, list(codenames), PERMISSION_CACHE_TIMEOUT)
+    return codenames
+
+
+def invalidate_user_permissions(*user_ids):
+    """
+    Invalida o cache de permissões dos usuários informados.
+    Deve ser chamado após alterações em massa (ex.: queryset.update()),
+    que não disparam sinais.
+    """
+    for user_id in user_ids:
+        incr_counter(USER_VERSION_KEY.format(user_id=user_id), _initial_version())
+
+
+def invalidate_all_permissions():
+    """
+    Invalida o cache de permissões de todos os usuários.
+    """
+    incr_counter(GLOBAL_VERSION_KEY, _initial_version())
+
+
+def get_permission_cache_stats():
+    """
+    Retorna os contadores de acertos e falhas do cache para monitoramento.
+    """
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'enabled': PERMISSION_CACHE_ENABLED,
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_permission_cache_stats():
+    """
+    Zera os contadores de acertos e falhas.
+    """
+    cache.delete_many([HITS_KEY, MISSES_KEY])
@@ -18,6 +18,14 @@ class UserAccountLockedException(Exception):
         super().__init__(self.message)
 
 
+class TooManyLoginAttemptsException(Exception):
+    """Exceção para excesso de tentativas de login a partir do mesmo IP."""
+    def __init__(self, ip=None, message=None):
+        self.ip = ip
+        self.message = message or "Muitas tentativas de login. Aguarde alguns minutos e tente novamente."
+        super().__init__(self.message)
+
+
 class PasswordExpiredException(Exception):
     """Exceção para senha expirada."""
     def __init__(self, username, message=None):
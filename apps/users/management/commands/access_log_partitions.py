@@ -0,0 +1,58 @@
+"""
+Mantém as partições mensais do log de acessos (PostgreSQL).
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users import partitions
+from apps.users.models.auth.constants import (
+    ACCESS_LOG_PARTITION_MONTHS_AHEAD, ACCESS_LOG_RETENTION_MONTHS)
+
+
+class Command(BaseCommand):
+    help = 'Cria as partições futuras do log de acessos e aplica a retenção'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=ACCESS_LOG_PARTITION_MONTHS_AHEAD,
+            help='Meses a criar à frente do atual',
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=ACCESS_LOG_RETENTION_MONTHS,
+            help='Meses mantidos na tabela (0 desativa a retenção)',
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Exclui as partições antigas em vez de apenas desanexá-las',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='Apenas lista as partições existentes',
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            self.stdout.write(self.style.WARNING(
+                'A tabela do log de acessos não está particionada neste banco.'
+            ))
+            return
+
+        if options['list']:
+            for name, month in partitions.list_partitions():
+                self.stdout.write(f'{month:%m/%Y}  {name}')
+            return
+
+        for name in partitions.ensure_partitions(options['months_ahead']):
+            self.stdout.write(self.style.SUCCESS(f'Partição criada: {name}'))
+
+        removed = partitions.apply_retention(
+            options['retention_months'], drop=options['drop']
+        )
+        action = 'excluída' if options['drop'] else 'desanexada'
+        for name in removed:
+            self.stdout.write(self.style.SUCCESS(f'Partição {action}: {name}'))
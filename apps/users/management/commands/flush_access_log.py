@@ -0,0 +1,27 @@
+"""
+Grava em lote os eventos de acesso enfileirados no Redis.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.access_log import flush_access_log, pending_count
+
+
+class Command(BaseCommand):
+    help = 'Grava no banco os eventos de acesso pendentes no buffer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Eventos por lote (padrão: ACCESS_LOG_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        kwargs = {}
+        if options['batch_size']:
+            kwargs['batch_size'] = options['batch_size']
+        written = flush_access_log(**kwargs)
+        self.stdout.write(self.style.SUCCESS(
+            f'{written} evento(s) gravado(s); {pending_count()} pendente(s).'
+        ))
@@ -0,0 +1,30 @@
+"""
+Exibe os contadores do cache compartilhado de permissões.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.cache import (get_permission_cache_stats,
+                              reset_permission_cache_stats)
+
+
+class Command(BaseCommand):
+    help = 'Exibe acertos/falhas do cache de permissões de usuários'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Zera os contadores após exibi-los',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_permission_cache_stats()
+        self.stdout.write(
+            f"Habilitado: {'sim' if stats['enabled'] else 'não'}\n"
+            f"Acertos: {stats['hits']}\n"
+            f"Falhas: {stats['misses']}\n"
+            f"Taxa de acerto: {stats['hit_rate']:.1%}"
+        )
+        if options['reset']:
+            reset_permission_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Contadores zerados.'))
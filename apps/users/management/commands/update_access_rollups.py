@@ -0,0 +1,27 @@
+"""
+Atualiza os resumos diários do log de acessos.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.rollups import reset_access_rollups, update_access_rollups
+
+
+class Command(BaseCommand):
+    help = 'Processa os acessos novos nos resumos diários por usuário e por IP'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Apaga os resumos e reprocessa todo o log',
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_access_rollups()
+            self.stdout.write(self.style.WARNING('Resumos apagados.'))
+
+        days = update_access_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(days)} dia(s) recalculado(s).'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_eventpermission_active_permission_active_user_active_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='registration_number',
+            field=models.CharField(blank=True, db_index=True, max_length=30, null=True, verbose_name='Matrícula'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:16
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_registration_number_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='useraccess',
+            name='date_time',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Data/hora'),
+        ),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:18
+
+import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Meses criados à frente do atual durante a migração; depois disso as
+# partições são mantidas por apps.users.partitions.ensure_partitions(). Não
+# há partição padrão (ela impediria o DETACH ... CONCURRENTLY da retenção):
+# uma linha fora dos meses criados é rejeitada pelo banco.
+MONTHS_AHEAD = 6
+
+TABLE = 'USUARIO_ACESSO_LOG'
+STAGING = 'USUARIO_ACESSO_LOG_part'
+SEQUENCE = 'USUARIO_ACESSO_LOG_id_seq'
+
+# Índice e FK de user_id com os nomes gerados pelo Django na 0001
+CREATE_USER_INDEX_SQL = (
+    'CREATE INDEX "USUARIO_ACESSO_LOG_user_id_2124990a" '
+    'ON "USUARIO_ACESSO_LOG" ("user_id")'
+)
+CREATE_USER_FK_SQL = (
+    'ALTER TABLE "USUARIO_ACESSO_LOG" '
+    'ADD CONSTRAINT "USUARIO_ACESSO_LOG_user_id_2124990a_fk_USUARIOS_id" '
+    'FOREIGN KEY ("user_id") REFERENCES "USUARIOS" ("id") DEFERRABLE INITIALLY DEFERRED'
+)
+
+
+def _add_months(value, months):
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1, day=1)
+
+
+def partition_access_log(apps, schema_editor):
+    """
+    Recria USUARIO_ACESSO_LOG como tabela particionada por mês (PostgreSQL).
+
+    A chave primária passa a ser (id, date_time), como exige o
+    particionamento; o id continua único pela sequência.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        f'CREATE TABLE "{STAGING}" (LIKE "{TABLE}" INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE (date_time)'
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT min(date_time) FROM "{TABLE}"')
+        oldest = cursor.fetchone()[0] or timezone.now()
+
+    oldest = timezone.localtime(oldest)
+    month = timezone.make_aware(datetime.datetime(oldest.year, oldest.month, 1))
+    last = _add_months(timezone.localtime(), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        schema_editor.execute(
+            f'CREATE TABLE "{TABLE}_p{month.year:04d}_{month.month:02d}" '
+            f'PARTITION OF "{STAGING}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    schema_editor.execute(f'INSERT INTO "{STAGING}" SELECT * FROM "{TABLE}"')
+    schema_editor.execute(f'DROP TABLE "{TABLE}"')
+    schema_editor.execute(f'ALTER TABLE "{STAGING}" RENAME TO "{TABLE}"')
+
+    schema_editor.execute(f'CREATE SEQUENCE "{SEQUENCE}" OWNED BY "{TABLE}".id')
+    schema_editor.execute(
+        f"SELECT setval('\"{SEQUENCE}\"', coalesce(max(id), 0) + 1, false) FROM \"{TABLE}\""
+    )
+    schema_editor.execute(
+        f"ALTER TABLE \"{TABLE}\" ALTER COLUMN id SET DEFAULT nextval('\"{SEQUENCE}\"')"
+    )
+    schema_editor.execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY (id, date_time)'
+    )
+    schema_editor.execute(CREATE_USER_INDEX_SQL)
+    schema_editor.execute(CREATE_USER_FK_SQL)
+
+
+def unpartition_access_log(apps, schema_editor):
+    """
+    Volta USUARIO_ACESSO_LOG a uma tabela comum, com id identity e chave
+    primária só no id. Partições já desanexadas pela retenção ficam como
+    tabelas avulsas e não voltam para a tabela.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    # LIKE de uma tabela particionada gera uma tabela comum
+    schema_editor.execute(f'CREATE TABLE "{STAGING}" (LIKE "{TABLE}")')
+    schema_editor.execute(f'INSERT INTO "{STAGING}" SELECT * FROM "{TABLE}"')
+    schema_editor.execute(f'DROP TABLE "{TABLE}"')
+    schema_editor.execute(f'ALTER TABLE "{STAGING}" RENAME TO "{TABLE}"')
+
+    schema_editor.execute(
+        f'ALTER TABLE "{TABLE}" ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY'
+    )
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('\"{TABLE}\"', 'id'), "
+        f'coalesce(max(id), 0) + 1, false) FROM "{TABLE}"'
+    )
+    schema_editor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY (id)')
+    schema_editor.execute(CREATE_USER_INDEX_SQL)
+    schema_editor.execute(CREATE_USER_FK_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_useraccess_date_time_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_access_log, unpartition_access_log),
+        migrations.AddIndex(
+            model_name='useraccess',
+            index=models.Index(fields=['date_time'], name='USUARIO_ACE_date_ti_56d693_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useraccess',
+            index=models.Index(fields=['user', 'date_time'], name='USUARIO_ACE_user_id_cbea98_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_useraccess_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Nome')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Último ID processado')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Marca de processamento',
+                'verbose_name_plural': 'Marcas de processamento',
+                'db_table': 'USUARIO_ACESSO_MARCA',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyIPAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('ip_address', models.GenericIPAddressField(verbose_name='Endereço IP')),
+                ('success_count', models.PositiveIntegerField(default=0, verbose_name='Acessos')),
+                ('failure_count', models.PositiveIntegerField(default=0, verbose_name='Falhas')),
+                ('user_count', models.PositiveIntegerField(default=0, verbose_name='Usuários distintos')),
+            ],
+            options={
+                'verbose_name': 'Resumo diário de acessos por IP',
+                'verbose_name_plural': 'Resumos diários de acessos por IP',
+                'db_table': 'USUARIO_ACESSO_IP_DIARIO',
+                'ordering': ['-date'],
+                'unique_together': {('date', 'ip_address')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyUserAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('success_count', models.PositiveIntegerField(default=0, verbose_name='Acessos')),
+                ('failure_count', models.PositiveIntegerField(default=0, verbose_name='Falhas')),
+                ('session_count', models.PositiveIntegerField(default=0, verbose_name='Sessões distintas')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_accesses', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Resumo diário de acessos por usuário',
+                'verbose_name_plural': 'Resumos diários de acessos por usuário',
+                'db_table': 'USUARIO_ACESSO_DIARIO',
+                'ordering': ['-date'],
+                'unique_together': {('date', 'user')},
+            },
+        ),
+    ]
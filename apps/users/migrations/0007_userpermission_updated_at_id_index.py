@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_access_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userpermission',
+            index=models.Index(fields=['updated_at', 'id'], name='USUARIO_PER_updated_525d91_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Índices da busca por prefixo do autocomplete de usuários (apenas
+# PostgreSQL): UPPER(coluna) LIKE 'TERMO%' só usa índice com
+# text_pattern_ops sobre a mesma expressão (ver
+# apps.utils.autocomplete.Autocomplete.filter_prefix).
+CREATE_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS usuarios_username_upper_idx
+    ON "USUARIOS" (UPPER(username) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS usuarios_registration_number_upper_idx
+    ON "USUARIOS" (UPPER(registration_number) text_pattern_ops);
+"""
+
+DROP_INDEXES_SQL = """
+DROP INDEX IF EXISTS usuarios_username_upper_idx;
+DROP INDEX IF EXISTS usuarios_registration_number_upper_idx;
+"""
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEXES_SQL)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEXES_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_userpermission_updated_at_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,4 +1,6 @@
 from apps.users.models.auth.user import User, UserAccess
 from apps.users.models.auth.permissions import Permission, EventPermission, UserPermission
+from apps.users.models.auth.access_stats import DailyIPAccess, DailyUserAccess, RollupWatermark
 
-__all__ = ['User', 'UserAccess', 'Permission', 'EventPermission', 'UserPermission']
+__all__ = ['User', 'UserAccess', 'Permission', 'EventPermission', 'UserPermission',
+           'DailyIPAccess', 'DailyUserAccess', 'RollupWatermark']
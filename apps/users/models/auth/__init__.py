@@ -2,3 +2,4 @@ from apps.users.models.auth.constants import *
 from apps.users.models.auth.managers import UserManager
 from apps.users.models.auth.permissions import Permission, EventPermission, UserPermission
 from apps.users.models.auth.user import User, UserAccess
+from apps.users.models.auth.access_stats import DailyIPAccess, DailyUserAccess, RollupWatermark
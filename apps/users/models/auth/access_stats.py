@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.users.models.auth.user import User
+
+
+class DailyUserAccess(models.Model):
+    """
+    Resumo diário dos acessos de cada usuário, gerado a partir de
+    UserAccess por apps.users.rollups.
+    """
+    date = models.DateField(_('Data'))
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='daily_accesses',
+        verbose_name=_('Usuário')
+    )
+    success_count = models.PositiveIntegerField(_('Acessos'), default=0)
+    failure_count = models.PositiveIntegerField(_('Falhas'), default=0)
+    session_count = models.PositiveIntegerField(_('Sessões distintas'), default=0)
+
+    class Meta:
+        verbose_name = _('Resumo diário de acessos por usuário')
+        verbose_name_plural = _('Resumos diários de acessos por usuário')
+        db_table = 'USUARIO_ACESSO_DIARIO'
+        ordering = ['-date']
+        unique_together = ['date', 'user']
+
+    def __str__(self):
+        return f"{self.user} em {self.date:%d/%m/%Y}"
+
+
+class DailyIPAccess(models.Model):
+    """
+    Resumo diário dos acessos por endereço IP.
+    """
+    date = models.DateField(_('Data'))
+    ip_address = models.GenericIPAddressField(_('Endereço IP'))
+    success_count = models.PositiveIntegerField(_('Acessos'), default=0)
+    failure_count = models.PositiveIntegerField(_('Falhas'), default=0)
+    user_count = models.PositiveIntegerField(_('Usuários distintos'), default=0)
+
+    class Meta:
+        verbose_name = _('Resumo diário de acessos por IP')
+        verbose_name_plural = _('Resumos diários de acessos por IP')
+        db_table = 'USUARIO_ACESSO_IP_DIARIO'
+        ordering = ['-date']
+        unique_together = ['date', 'ip_address']
+
+    def __str__(self):
+        return f"{self.ip_address} em {self.date:%d/%m/%Y}"
+
+
+class RollupWatermark(models.Model):
+    """
+    Último registro processado por um job incremental de resumo.
+    """
+    name = models.CharField(_('Nome'), max_length=50, unique=True)
+    last_id = models.BigIntegerField(_('Último ID processado'), default=0)
+    updated_at = models.DateTimeField(_('Atualizado em'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Marca de processamento')
+        verbose_name_plural = _('Marcas de processamento')
+        db_table = 'USUARIO_ACESSO_MARCA'
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
@@ -22,6 +22,30 @@ PASSWORD_EXPIRY_DAYS = getattr(settings, 'PASSWORD_EXPIRY_DAYS', 90)
 MAX_LOGIN_ATTEMPTS = getattr(settings, 'MAX_LOGIN_ATTEMPTS', 5)
 LOGIN_LOCKOUT_MINUTES = getattr(settings, 'LOGIN_LOCKOUT_MINUTES', 30)
 
+# Controle de tentativas no cache (ver apps.users.throttle)
+LOGIN_THROTTLE_ENABLED = getattr(settings, 'LOGIN_THROTTLE_ENABLED', True)
+LOGIN_WINDOW_MINUTES = getattr(settings, 'LOGIN_WINDOW_MINUTES', 15)
+LOGIN_IP_MAX_ATTEMPTS = getattr(settings, 'LOGIN_IP_MAX_ATTEMPTS', 50)
+LOGIN_IP_WINDOW_MINUTES = getattr(settings, 'LOGIN_IP_WINDOW_MINUTES', 15)
+LOGIN_IP_LOCKOUT_MINUTES = getattr(settings, 'LOGIN_IP_LOCKOUT_MINUTES', 15)
+LOGIN_KNOWN_IP_DAYS = getattr(settings, 'LOGIN_KNOWN_IP_DAYS', 30)
+
+# Log de acessos gravado em lote (ver apps.users.access_log)
+ACCESS_LOG_BUFFER_ENABLED = getattr(settings, 'ACCESS_LOG_BUFFER_ENABLED', False)
+ACCESS_LOG_BATCH_SIZE = getattr(settings, 'ACCESS_LOG_BATCH_SIZE', 500)
+
+# Partições mensais do log de acessos (ver apps.users.partitions)
+ACCESS_LOG_PARTITION_MONTHS_AHEAD = getattr(settings, 'ACCESS_LOG_PARTITION_MONTHS_AHEAD', 6)
+ACCESS_LOG_RETENTION_MONTHS = getattr(settings, 'ACCESS_LOG_RETENTION_MONTHS', 24)
+
+# Resumos diários do log de acessos (ver apps.users.rollups)
+ACCESS_ROLLUP_LAG_SECONDS = getattr(settings, 'ACCESS_ROLLUP_LAG_SECONDS', 60 * 10)
+
+# Sessões no Redis (ver apps.users.session_engine)
+SESSION_TOUCH_INTERVAL = getattr(settings, 'SESSION_TOUCH_INTERVAL', 300)
+SESSION_WRITE_BEHIND_ENABLED = getattr(settings, 'SESSION_WRITE_BEHIND_ENABLED', False)
+SESSION_FLUSH_BATCH_SIZE = getattr(settings, 'SESSION_FLUSH_BATCH_SIZE', 500)
+
 # Constantes para permissões
 PERMISSION_YES = PermissionChoices.YES
 PERMISSION_NO = PermissionChoices.NO
@@ -29,3 +53,10 @@ PERMISSION_NO = PermissionChoices.NO
 # Constantes para acesso
 ACCESS_ALLOWED = AccessChoices.ALLOWED
 ACCESS_DENIED = AccessChoices.DENIED
+
+# Cache compartilhado de permissões (opt-in)
+PERMISSION_CACHE_ENABLED = getattr(settings, 'PERMISSION_CACHE_ENABLED', False)
+PERMISSION_CACHE_TIMEOUT = getattr(settings, 'PERMISSION_CACHE_TIMEOUT', 300)
+
+# Cache da autenticação por token da API (0 desabilita; ver apps.users.authentication)
+TOKEN_CACHE_TIMEOUT = getattr(settings, 'TOKEN_CACHE_TIMEOUT', 60)
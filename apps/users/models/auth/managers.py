@@ -1,5 +1,5 @@
 from django.contrib.auth.models import UserManager as DjangoUserManager
-from django.db.models import Q
+from django.db.models import Case, IntegerField, Q, Value, When
 from django.utils import timezone
 
 from apps.users.models.auth.constants import USER_STATUS_ACTIVE, USER_TYPE_ADMIN
@@ -110,3 +110,20 @@ class UserManager(DjangoUserManager):
         Retorna usuários por tipo.
         """
         return self.get_queryset().filter(user_type=user_type)
+
+    def get_by_login(self, identifier):
+        """
+        Busca o usuário pelo identificador de login (username ou matrícula)
+        em uma única consulta indexada. O username tem precedência.
+
+        Returns:
+            User|None: Usuário encontrado ou None
+        """
+        if not identifier:
+            return None
+        return self.get_queryset().filter(
+            Q(username=identifier) | Q(registration_number=identifier)
+        ).order_by(
+            Case(When(username=identifier, then=Value(0)),
+                 default=Value(1), output_field=IntegerField())
+        ).first()
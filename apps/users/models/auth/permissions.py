@@ -82,6 +82,9 @@ class UserPermission(BaseModel):
         verbose_name_plural = _('Permissões dos usuários')
         db_table = 'USUARIO_PERMISSAO'
         unique_together = ['user', 'event']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
         
     def __str__(self):
         return f"{self.user} - {self.event}"
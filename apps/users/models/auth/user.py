@@ -1,5 +1,5 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -28,7 +28,7 @@ class User(AbstractUser, UUIDBaseModel):
     last_name = models.CharField(_('Sobrenome'), max_length=150, blank=True)
 
     # Campos específicos do sistema
-    registration_number = models.CharField(_('Matrícula'), max_length=30, blank=True, null=True)
+    registration_number = models.CharField(_('Matrícula'), max_length=30, blank=True, null=True, db_index=True)
 
     # Tipo e status do usuário
     user_type = models.IntegerField(
@@ -115,31 +115,152 @@ class User(AbstractUser, UUIDBaseModel):
     def record_login_attempt(self, success, ip_address=None):
         """
         Registra uma tentativa de login e bloqueia o usuário após muitas tentativas.
-        """
-        from apps.users.models.auth.constants import MAX_LOGIN_ATTEMPTS, LOGIN_LOCKOUT_MINUTES
 
+        Os contadores são atualizados com um único UPDATE condicional, sem
+        ler e regravar a linha, para que logins simultâneos não se percam.
+        O log de acessos é registrado à parte (ver apps.users.access_log).
+        """
         if success:
-            self.login_attempts = 0
-            self.lockout_until = None
-            if ip_address:
-                self.last_login_ip = ip_address
+            self._record_login_success(ip_address)
         else:
-            self.login_attempts += 1
+            self._record_login_failure()
+
+    def _record_login_success(self, ip_address):
+        """Zera tentativas e bloqueio, gravando apenas se algo mudou"""
+        changes = {}
+        if self.login_attempts or self.lockout_until:
+            changes.update(login_attempts=0, lockout_until=None)
+        if ip_address and ip_address != self.last_login_ip:
+            changes['last_login_ip'] = ip_address
+        if changes:
+            User.objects.filter(pk=self.pk).update(**changes)
+            for field, value in changes.items():
+                setattr(self, field, value)
+            if 'lockout_until' in changes:
+                self.invalidate_token_cache()
+
+    def start_lockout(self, attempts):
+        """
+        Inicia o bloqueio da conta por LOGIN_LOCKOUT_MINUTES.
+
+        Usado pelo controle de tentativas no cache (apps.users.throttle),
+        que só grava no banco quando o bloqueio começa.
+        """
+        from apps.users.models.auth.constants import LOGIN_LOCKOUT_MINUTES
+
+        self.login_attempts = attempts
+        self.lockout_until = timezone.now() + timezone.timedelta(minutes=LOGIN_LOCKOUT_MINUTES)
+        User.objects.filter(pk=self.pk).update(
+            login_attempts=self.login_attempts,
+            lockout_until=self.lockout_until,
+        )
+        self.invalidate_token_cache()
+
+    def _record_login_failure(self):
+        """
+        Incrementa as tentativas e inicia o bloqueio ao atingir o limite.
+
+        Um bloqueio já expirado recomeça a contagem e é limpo no mesmo
+        UPDATE; um novo bloqueio só começa quando a contagem atinge o
+        limite. O novo estado vem do próprio UPDATE (RETURNING), suportado
+        pelo PostgreSQL e pelo SQLite usados para a tabela de usuários.
+        """
+        from django.db import connections
+
+        from apps.users.models.auth.constants import (LOGIN_LOCKOUT_MINUTES,
+                                                      MAX_LOGIN_ATTEMPTS)
+
+        now = timezone.now()
+        lockout = now + timezone.timedelta(minutes=LOGIN_LOCKOUT_MINUTES)
+        connection = connections[User.objects.db]
+        qn = connection.ops.quote_name
+        opts = self._meta
+        attempts_field = opts.get_field('login_attempts')
+        until_field = opts.get_field('lockout_until')
+
+        attempts = qn(attempts_field.column)
+        until = qn(until_field.column)
+        new_attempts = (
+            f'CASE WHEN {until} IS NOT NULL AND {until} <= %s '
+            f'THEN 1 ELSE {attempts} + 1 END'
+        )
+        # No SET as colunas têm os valores anteriores ao UPDATE
+        sql = (
+            f'UPDATE {qn(opts.db_table)} SET {attempts} = {new_attempts}, '
+            f'{until} = CASE WHEN {new_attempts} >= %s THEN %s '
+            f'WHEN {until} <= %s THEN NULL ELSE {until} END '
+            f'WHERE {qn(opts.pk.column)} = %s RETURNING {attempts}'
+        )
+        now_value = until_field.get_db_prep_value(now, connection)
+        params = [
+            now_value, now_value, MAX_LOGIN_ATTEMPTS,
+            until_field.get_db_prep_value(lockout, connection), now_value,
+            opts.pk.get_db_prep_value(self.pk, connection),
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
 
+        if row is not None:
+            self.login_attempts = row[0]
             if self.login_attempts >= MAX_LOGIN_ATTEMPTS:
-                self.lockout_until = timezone.now() + timezone.timedelta(minutes=LOGIN_LOCKOUT_MINUTES)
+                self.lockout_until = lockout
+                self.invalidate_token_cache()
+            elif self.lockout_until is not None and self.lockout_until <= now:
+                self.lockout_until = None
 
-        self.save(update_fields=['login_attempts',
-                  'lockout_until', 'last_login_ip'])
+    def invalidate_token_cache(self):
+        """
+        Descarta os tokens da API do usuário em cache (ver
+        apps.users.authentication) após o commit. Necessário após
+        queryset.update(), que não dispara post_save.
+        """
+        from apps.users.authentication import invalidate_user_tokens
 
-        # Registra o acesso
-        if success:
-            UserAccess.objects.create(
+        user_id = self.pk
+        transaction.on_commit(lambda: invalidate_user_tokens(user_id))
+
+    def get_event_permissions(self):
+        """
+        Retorna o conjunto de códigos de eventos permitidos ao usuário.
+
+        Todas as permissões concedidas são carregadas em uma única consulta
+        (USUARIO_PERMISSAO x EVENTO_SISTEMA) e memorizadas na instância,
+        de modo que verificações seguintes na mesma requisição não acessam
+        o banco. Com PERMISSION_CACHE_ENABLED, o conjunto também é
+        compartilhado entre processos pelo cache (ver apps.users.cache).
+
+        Returns:
+            frozenset: Códigos (codename) dos eventos permitidos
+        """
+        if not hasattr(self, '_event_permissions_cache'):
+            from apps.users.cache import get_cached_event_permissions
+
+            self._event_permissions_cache = get_cached_event_permissions(
+                self.pk, self._load_event_permissions
+            )
+        return self._event_permissions_cache
+
+    def _load_event_permissions(self):
+        """
+        Carrega do banco os códigos dos eventos permitidos ao usuário.
+        """
+        from apps.users.models.auth.permissions import UserPermission
+        from apps.users.models.auth.choices import PermissionChoices
+
+        return frozenset(
+            UserPermission.objects.filter(
                 user=self,
-                ip_address=ip_address,
-                success=success
-            )    
-    
+                permission=PermissionChoices.YES
+            ).values_list('event__codename', flat=True)
+        )
+
+    def clear_event_permissions_cache(self):
+        """
+        Descarta o conjunto de permissões memorizado na instância.
+        """
+        self.__dict__.pop('_event_permissions_cache', None)
+
     def has_event_permission(self, event_codename):
         """
         Verifica se o usuário tem permissão para o evento especificado.
@@ -154,13 +275,7 @@ class User(AbstractUser, UUIDBaseModel):
         if self.is_superuser:
             return True
 
-        # Verifica nas permissões do usuário usando IntegerChoices
-        from apps.users.models.auth.choices import PermissionChoices
-        
-        return self.user_permissions.filter(
-            event__codename=event_codename,
-            permission=PermissionChoices.YES
-        ).exists()
+        return event_codename in self.get_event_permissions()
 
     def check_permission(self, event_codename):
         """
@@ -176,21 +291,9 @@ class User(AbstractUser, UUIDBaseModel):
         # Atalho para usuários superusuários
         if self.is_superuser:
             return True
-            
-        # Para usuários normais, verificamos nas permissões
-        from apps.users.models.auth.permissions import UserPermission, EventPermission
-        from apps.users.models.auth.choices import PermissionChoices
-        
-        try:
-            # Tentamos obter o evento pelo codename
-            event = EventPermission.objects.get(codename=event_codename)
-            
-            # Verificamos a permissão do usuário
-            perm = UserPermission.objects.get(user=self, event=event)
-            return perm.permission == PermissionChoices.YES
-        except (EventPermission.DoesNotExist, UserPermission.DoesNotExist):
-            # Se o evento ou permissão não existir, negamos acesso
-            return False
+
+        # Se o evento ou permissão não existir, o código não estará no conjunto
+        return event_codename in self.get_event_permissions()
 
     def activate(self):
         """
@@ -268,7 +371,8 @@ class UserAccess(models.Model):
         related_name='access_logs',
         verbose_name=_('Usuário')
     )
-    date_time = models.DateTimeField(_('Data/hora'), auto_now_add=True)
+    # Preenchido com a hora do evento, que pode ser gravado depois em lote
+    date_time = models.DateTimeField(_('Data/hora'), default=timezone.now, editable=False)
     ip_address = models.GenericIPAddressField(_('Endereço IP'), null=True, blank=True)
     user_agent = models.CharField(_('User Agent'), max_length=255, blank=True, null=True)
     session_id = models.CharField(_('ID da sessão'), max_length=100, blank=True, null=True)
@@ -280,6 +384,11 @@ class UserAccess(models.Model):
         verbose_name_plural = _('Logs de acesso')
         db_table = 'USUARIO_ACESSO_LOG'
         ordering = ['-date_time']
+        # No PostgreSQL a tabela é particionada por mês (ver apps.users.partitions)
+        indexes = [
+            models.Index(fields=['date_time']),
+            models.Index(fields=['user', 'date_time']),
+        ]
 
     def __str__(self):
         return f"Acesso de {self.user} em {self.date_time.strftime('%d/%m/%Y %H:%M')}"
@@ -0,0 +1,179 @@
+"""
+Particionamento mensal do log de acessos (USUARIO_ACESSO_LOG).
+
+No PostgreSQL a tabela é particionada por intervalo de date_time (ver a
+migração 0005), com uma partição por mês. Este módulo cria as partições
+futuras e aplica a retenção, desanexando (ou excluindo) as partições antigas.
+
+Não há partição padrão: com ela o PostgreSQL não aceita DETACH PARTITION
+CONCURRENTLY, e criar um mês cujas linhas já caíram nela exigiria bloquear a
+tabela. Por isso as partições são criadas ACCESS_LOG_PARTITION_MONTHS_AHEAD
+meses à frente; uma linha fora dos meses criados é rejeitada pelo banco.
+
+Em outros bancos as funções não fazem nada.
+"""
+import datetime
+import re
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.users.models.auth.constants import (
+    ACCESS_LOG_PARTITION_MONTHS_AHEAD, ACCESS_LOG_RETENTION_MONTHS)
+from apps.users.models.auth.user import UserAccess
+
+PARTITION_NAME = '{table}_p{year:04d}_{month:02d}'
+_PARTITION_RE = re.compile(r'_p(\d{4})_(\d{2})$')
+
+
+def _connection():
+    return connections[UserAccess.objects.db]
+
+
+def is_partitioned():
+    """Indica se a tabela do log está particionada no banco atual"""
+    connection = _connection()
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(UserAccess._meta.db_table)]
+        )
+        row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def month_start(value):
+    """Primeiro instante do mês de value (no fuso atual)"""
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1, day=1)
+
+
+def partition_name(month):
+    return PARTITION_NAME.format(
+        table=UserAccess._meta.db_table, year=month.year, month=month.month
+    )
+
+
+def _partitions(detach_pending=False):
+    connection = _connection()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass AND i.inhdetachpending = %s
+            """,
+            [connection.ops.quote_name(UserAccess._meta.db_table), detach_pending]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.search(name)
+        if match:
+            partitions.append((name, datetime.date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def list_partitions():
+    """
+    Partições mensais anexadas à tabela.
+
+    Returns:
+        list: Tuplas (nome, primeiro dia do mês) em ordem cronológica
+    """
+    return _partitions()
+
+
+def create_partition(month):
+    """
+    Cria a partição do mês, se não existir.
+
+    Returns:
+        bool: True se a partição foi criada
+    """
+    connection = _connection()
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    start = timezone.make_aware(datetime.datetime(month.year, month.month, 1))
+    end = add_months(start, 1)
+
+    if name in dict(list_partitions()):
+        return False
+
+    # DDL não aceita parâmetros; os limites são gerados aqui
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {qn(name)} PARTITION OF {qn(UserAccess._meta.db_table)} '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return True
+
+
+def ensure_partitions(months_ahead=ACCESS_LOG_PARTITION_MONTHS_AHEAD, now=None):
+    """
+    Garante as partições do mês atual e dos próximos meses.
+
+    Returns:
+        list: Nomes das partições criadas
+    """
+    if not is_partitioned():
+        return []
+    current = month_start(now or timezone.now())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_partition(month):
+            created.append(partition_name(month))
+    return created
+
+
+def apply_retention(retention_months=ACCESS_LOG_RETENTION_MONTHS, drop=False, now=None):
+    """
+    Remove da tabela as partições com mais de retention_months meses.
+
+    Por padrão a partição é apenas desanexada (continua no banco como
+    tabela comum, para arquivamento); com drop=True ela é excluída.
+
+    Usa DETACH PARTITION CONCURRENTLY, que não pode rodar dentro de uma
+    transação: chame fora de transaction.atomic().
+
+    Returns:
+        list: Nomes das partições desanexadas ou excluídas
+    """
+    if not retention_months or not is_partitioned():
+        return []
+    connection = _connection()
+    if connection.in_atomic_block:
+        raise transaction.TransactionManagementError(
+            'apply_retention() não pode ser chamada dentro de uma transação.'
+        )
+    qn = connection.ops.quote_name
+    table = qn(UserAccess._meta.db_table)
+    oldest_kept = add_months(month_start(now or timezone.now()), -retention_months).date()
+
+    removed = []
+    with connection.cursor() as cursor:
+        # CONCURRENTLY usa duas transações; se a execução anterior foi
+        # interrompida entre elas, a partição ficou pendente
+        for name, month in _partitions(detach_pending=True):
+            cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {qn(name)} FINALIZE')
+            if drop:
+                cursor.execute(f'DROP TABLE {qn(name)}')
+            removed.append(name)
+
+        for name, month in list_partitions():
+            if month >= oldest_kept:
+                break
+            cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {qn(name)} CONCURRENTLY')
+            if drop:
+                cursor.execute(f'DROP TABLE {qn(name)}')
+            removed.append(name)
+    return removed
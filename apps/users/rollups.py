@@ -0,0 +1,116 @@
+"""
+Resumos diários do log de acessos.
+
+O job update_access_rollups() lê apenas os registros de UserAccess com id
+acima da marca (RollupWatermark) para descobrir quais dias mudaram e
+recalcula esses dias em DailyUserAccess e DailyIPAccess.
+
+O id vem da sequência antes do commit: uma transação lenta pode gravar um id
+menor que a marca depois que ela avançou. Por isso cada execução também
+revisita os acessos com date_time até ACCESS_ROLLUP_LAG_SECONDS antes da
+execução anterior. Recalcular o dia
+inteiro (e não somar incrementos) mantém corretas as contagens distintas
+de sessões e usuários; a consulta do dia usa o índice de date_time e, no
+PostgreSQL, apenas a partição do mês.
+
+Os painéis leem somente os resumos, nunca o log bruto.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.users.models.auth.access_stats import (DailyIPAccess,
+                                                 DailyUserAccess,
+                                                 RollupWatermark)
+from apps.users.models.auth.constants import ACCESS_ROLLUP_LAG_SECONDS
+from apps.users.models.auth.user import UserAccess
+
+WATERMARK_NAME = 'access_log'
+
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def rebuild_day(day):
+    """
+    Recalcula os resumos de um dia a partir do log de acessos.
+    """
+    start, end = _day_range(day)
+    accesses = UserAccess.objects.filter(date_time__gte=start, date_time__lt=end).order_by()
+    counts = {
+        'success_count': Count('id', filter=Q(success=True)),
+        'failure_count': Count('id', filter=Q(success=False)),
+    }
+
+    per_user = [
+        DailyUserAccess(date=day, user_id=row['user'], **{
+            key: row[key] for key in ('success_count', 'failure_count', 'session_count')
+        })
+        for row in accesses.values('user').annotate(
+            session_count=Count('session_id', distinct=True), **counts
+        )
+    ]
+    per_ip = [
+        DailyIPAccess(date=day, ip_address=row['ip_address'], **{
+            key: row[key] for key in ('success_count', 'failure_count', 'user_count')
+        })
+        for row in accesses.exclude(ip_address__isnull=True).values('ip_address').annotate(
+            user_count=Count('user', distinct=True), **counts
+        )
+    ]
+
+    with transaction.atomic():
+        DailyUserAccess.objects.filter(date=day).delete()
+        DailyIPAccess.objects.filter(date=day).delete()
+        DailyUserAccess.objects.bulk_create(per_user)
+        DailyIPAccess.objects.bulk_create(per_ip)
+
+
+def update_access_rollups(lag_seconds=ACCESS_ROLLUP_LAG_SECONDS):
+    """
+    Processa os acessos novos desde a última execução.
+
+    Além dos ids acima da marca, revisita os acessos com date_time a partir
+    de lag_seconds antes da execução anterior (updated_at da marca).
+
+    Returns:
+        list: Dias recalculados
+    """
+    watermark, created = RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+    new_accesses = Q(id__gt=watermark.last_id)
+    if not created:
+        cutoff = watermark.updated_at - datetime.timedelta(seconds=lag_seconds)
+        new_accesses |= Q(date_time__gte=cutoff)
+
+    max_id = UserAccess.objects.aggregate(max_id=Max('id'))['max_id']
+    if max_id is None:
+        return []
+
+    days = sorted(
+        UserAccess.objects.filter(new_accesses).order_by()
+        .annotate(day=TruncDate('date_time'))
+        .values_list('day', flat=True)
+        .distinct()
+    )
+    for day in days:
+        rebuild_day(day)
+
+    # updated_at (auto_now) marca a execução, mesmo sem ids novos
+    watermark.last_id = max_id
+    watermark.save(update_fields=['last_id', 'updated_at'])
+    return days
+
+
+def reset_access_rollups():
+    """
+    Apaga os resumos e zera a marca; a próxima execução reprocessa o log.
+    """
+    with transaction.atomic():
+        DailyUserAccess.objects.all().delete()
+        DailyIPAccess.objects.all().delete()
+        RollupWatermark.objects.filter(name=WATERMARK_NAME).update(last_id=0)
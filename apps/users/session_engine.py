@@ -0,0 +1,253 @@
+"""
+Engine de sessões no Redis com gravação posterior opcional no banco.
+
+Configure com SESSION_ENGINE = 'apps.users.session_engine'. As sessões
+ficam no cache SESSION_CACHE_ALIAS (Redis) e nenhuma requisição lê ou grava
+django_session:
+
+- Uma sessão marcada como modificada, mas com o mesmo conteúdo já gravado,
+  não é regravada; as alterações de uma requisição resultam em uma única
+  escrita (feita pelo SessionMiddleware ao final).
+- Gravações que apenas renovam a expiração (SESSION_SAVE_EVERY_REQUEST)
+  acontecem no máximo uma vez a cada SESSION_TOUCH_INTERVAL segundos.
+
+Com SESSION_WRITE_BEHIND_ENABLED, as chaves gravadas entram em um conjunto
+no Redis (REDIS_URL) e a tarefa flush_sessions (Celery beat) as copia em lote para
+django_session.
+
+Uma sessão ausente do Redis (reinício, despejo de memória, ou criada antes
+da troca de SESSION_ENGINE) é restaurada de django_session na próxima
+leitura, mesmo sem a gravação posterior. O logout exclui a sessão do banco
+imediatamente e deixa uma marca (TOMBSTONE_KEY) no cache: um flush que já
+tinha lido a sessão antes do logout a exclui de novo após gravar o lote.
+
+Sem Redis, a gravação no banco é feita na hora.
+"""
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, UpdateError
+from django.contrib.sessions.backends.cache import \
+    SessionStore as CacheSessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.utils import timezone
+from redis.exceptions import LockError
+
+from apps.users.models.auth.constants import (SESSION_FLUSH_BATCH_SIZE,
+                                              SESSION_TOUCH_INTERVAL,
+                                              SESSION_WRITE_BEHIND_ENABLED)
+from apps.utils.cache import get_redis_client
+
+KEY_PREFIX = 'sessions:'
+DIRTY_KEY = 'sessions:dirty'
+FLUSH_LOCK_KEY = 'sessions:flush_lock'
+FLUSH_LOCK_TIMEOUT = 60 * 5
+TOMBSTONE_KEY = 'sessions:deleted:{key}'
+
+
+def _get_cache():
+    return caches[settings.SESSION_CACHE_ALIAS]
+
+
+def get_dirty_set():
+    """
+    Retorna o cliente Redis (REDIS_URL) ou None se a gravação posterior
+    estiver desabilitada ou as sessões não estiverem num cache Redis
+    (compartilhado entre os processos).
+    """
+    if not SESSION_WRITE_BEHIND_ENABLED or not isinstance(_get_cache(), RedisCache):
+        return None
+    return get_redis_client()
+
+
+class SessionStore(CacheSessionStore):
+    """
+    Cada entrada do cache guarda os dados da sessão ('d'), o instante da
+    última gravação ('t') e a data de expiração ('e').
+    """
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._saved_data = None
+        self._saved_at = None
+
+    def load(self):
+        try:
+            entry = self._cache.get(self.cache_key)
+        except Exception:
+            entry = None
+        if entry is None:
+            entry = self._restore_from_db()
+        if entry is None:
+            self._session_key = None
+            return {}
+        self._remember(entry)
+        return entry['d']
+
+    async def aload(self):
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(self.load)()
+
+    def _remember(self, entry):
+        self._saved_data = self.serializer().dumps(entry['d'])
+        self._saved_at = entry['t']
+
+    def _restore_from_db(self):
+        """Recoloca no cache uma sessão que só existe no banco"""
+        if self._cache.get(TOMBSTONE_KEY.format(key=self.session_key)) is not None:
+            return None
+        session = Session.objects.filter(
+            session_key=self.session_key, expire_date__gt=timezone.now()
+        ).first()
+        if session is None:
+            return None
+        entry = {
+            'd': self.decode(session.session_data),
+            't': timezone.now().timestamp(),
+            'e': session.expire_date,
+        }
+        age = int((session.expire_date - timezone.now()).total_seconds())
+        self._cache.set(self.cache_key, entry, max(age, 1))
+        return entry
+
+    def _is_touch_only(self, data):
+        """Nada mudou e a última gravação é recente"""
+        if self._saved_at is None or self.serializer().dumps(data) != self._saved_data:
+            return False
+        return timezone.now().timestamp() - self._saved_at < SESSION_TOUCH_INTERVAL
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        if not must_create and self._is_touch_only(data):
+            return
+
+        age = self.get_expiry_age()
+        if not must_create and not self._cache.touch(self.cache_key, age):
+            raise UpdateError
+        entry = {
+            'd': data,
+            't': timezone.now().timestamp(),
+            'e': self.get_expiry_date(),
+        }
+        func = self._cache.add if must_create else self._cache.set
+        if not func(self.cache_key, entry, age) and must_create:
+            raise CreateError
+        self._remember(entry)
+
+        if SESSION_WRITE_BEHIND_ENABLED:
+            client = get_dirty_set()
+            if client is None:
+                _write_sessions([(self.session_key, entry)])
+            else:
+                client.sadd(DIRTY_KEY, self.session_key)
+
+    async def asave(self, must_create=False):
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(self.save)(must_create)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        if SESSION_WRITE_BEHIND_ENABLED:
+            # Antes de excluir do banco: ver flush_sessions()
+            self._cache.set(TOMBSTONE_KEY.format(key=session_key), 1, settings.SESSION_COOKIE_AGE)
+        self._cache.delete(self.cache_key_prefix + session_key)
+        if SESSION_WRITE_BEHIND_ENABLED:
+            client = get_dirty_set()
+            if client is not None:
+                client.srem(DIRTY_KEY, session_key)
+        # A sessão pode estar no banco mesmo sem a gravação posterior (ver load)
+        Session.objects.filter(session_key=session_key).delete()
+
+    async def adelete(self, session_key=None):
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(self.delete)(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        Session.objects.filter(expire_date__lt=timezone.now()).delete()
+
+
+def _write_sessions(items):
+    """
+    Grava (insere ou atualiza) as sessões no banco em uma única consulta.
+
+    Args:
+        items: Pares (chave da sessão, entrada do cache)
+    """
+    store = SessionStore()
+    Session.objects.bulk_create(
+        [
+            Session(
+                session_key=key,
+                session_data=store.encode(entry['d']),
+                expire_date=entry['e'],
+            )
+            for key, entry in items
+        ],
+        update_conflicts=True,
+        unique_fields=['session_key'],
+        update_fields=['session_data', 'expire_date'],
+    )
+
+
+def flush_sessions(batch_size=SESSION_FLUSH_BATCH_SIZE):
+    """
+    Copia para o banco as sessões gravadas no Redis desde a última execução.
+
+    Sessões que já saíram do cache (logout, expiração) são ignoradas. Um
+    logout entre a leitura do cache e a gravação deixa a marca de exclusão:
+    depois de gravar o lote, as sessões marcadas são excluídas de novo. Se a
+    gravação falhar, as chaves voltam ao conjunto para a próxima execução.
+
+    Returns:
+        int: Número de sessões gravadas
+    """
+    client = get_dirty_set()
+    if client is None:
+        return 0
+    # Trava com dono (token), renovada a cada lote
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    cache = _get_cache()
+    written = 0
+    try:
+        while True:
+            lock.reacquire()
+            keys = [key.decode() for key in client.spop(DIRTY_KEY, batch_size)]
+            if not keys:
+                break
+            entries = cache.get_many([KEY_PREFIX + key for key in keys])
+            items = [
+                (key, entries[KEY_PREFIX + key]) for key in keys
+                if KEY_PREFIX + key in entries
+            ]
+            try:
+                if items:
+                    _write_sessions(items)
+            except Exception:
+                client.sadd(DIRTY_KEY, *keys)
+                raise
+
+            deleted = cache.get_many([TOMBSTONE_KEY.format(key=key) for key, _ in items])
+            if deleted:
+                deleted_keys = [key for key, _ in items if TOMBSTONE_KEY.format(key=key) in deleted]
+                Session.objects.filter(session_key__in=deleted_keys).delete()
+            written += len(items) - len(deleted)
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            pass
+    return written
@@ -0,0 +1,68 @@
+"""
+Sinais do app users.
+"""
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from ipware import get_client_ip
+from rest_framework.authtoken.models import Token
+
+from apps.users.access_log import log_access
+from apps.users.authentication import invalidate_tokens, invalidate_user_tokens
+from apps.users.cache import (invalidate_all_permissions,
+                              invalidate_user_permissions)
+from apps.users.models.auth.permissions import EventPermission, UserPermission
+from apps.users.models.auth.user import User
+
+
+@receiver(post_save, sender=UserPermission, dispatch_uid='user_permission_saved')
+@receiver(post_delete, sender=UserPermission, dispatch_uid='user_permission_deleted')
+def invalidate_user_permission_cache(sender, instance, **kwargs):
+    """
+    Invalida o cache de permissões do usuário afetado após o commit (antes
+    dele, uma requisição concorrente regravaria as permissões antigas).
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_permissions(user_id))
+
+
+@receiver(post_save, sender=EventPermission, dispatch_uid='event_permission_saved')
+@receiver(post_delete, sender=EventPermission, dispatch_uid='event_permission_deleted')
+def invalidate_event_permission_cache(sender, instance, **kwargs):
+    """Um evento pode afetar qualquer usuário, então invalida todos"""
+    transaction.on_commit(invalidate_all_permissions)
+
+
+@receiver(post_save, sender=Token, dispatch_uid='token_saved')
+@receiver(post_delete, sender=Token, dispatch_uid='token_deleted')
+def invalidate_token_cache(sender, instance, **kwargs):
+    """Remove do cache o token alterado ou excluído, após o commit"""
+    key = instance.key
+    transaction.on_commit(lambda: invalidate_tokens(key))
+
+
+@receiver(post_save, sender=User, dispatch_uid='user_saved_token_cache')
+def invalidate_user_token_cache(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Qualquer alteração do usuário (ativação, suspensão, edição) invalida
+    seus tokens em cache após o commit; a gravação de last_login no login não.
+    """
+    if created or (update_fields and set(update_fields) == {'last_login'}):
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user_tokens(user_id))
+
+
+@receiver(user_logged_in, dispatch_uid='user_logged_in_access_log')
+def log_user_login(sender, request, user, **kwargs):
+    """Registra o acesso após o login, já com a sessão definitiva"""
+    if request is None:
+        return
+    session = getattr(request, 'session', None)
+    log_access(
+        user,
+        ip_address=get_client_ip(request)[0],
+        user_agent=request.META.get('HTTP_USER_AGENT'),
+        session_id=session.session_key if session is not None else None,
+    )
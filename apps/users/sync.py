@@ -0,0 +1,16 @@
+"""
+Fontes do feed de alterações do app users (ver apps.utils.sync).
+"""
+from apps.users.models import UserPermission
+from apps.utils.sync import ChangeFeed, register
+
+
+class UserPermissionChangeFeed(ChangeFeed):
+    """Permissões por usuário (somente equipe)"""
+    model = UserPermission
+
+    def has_permission(self, request):
+        return request.user.is_staff
+
+
+register('permissoes-usuario', UserPermissionChangeFeed)
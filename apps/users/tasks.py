@@ -0,0 +1,31 @@
+"""
+Tarefas assíncronas do app users.
+"""
+from celery import shared_task
+
+from apps.users import access_log, partitions, rollups, session_engine
+
+
+@shared_task(ignore_result=True)
+def flush_access_log():
+    """Grava em lote os eventos de acesso enfileirados"""
+    return access_log.flush_access_log()
+
+
+@shared_task(ignore_result=True)
+def maintain_access_log_partitions():
+    """Cria as partições futuras do log de acessos e aplica a retenção"""
+    partitions.ensure_partitions()
+    partitions.apply_retention()
+
+
+@shared_task(ignore_result=True)
+def update_access_rollups():
+    """Atualiza os resumos diários com os acessos novos"""
+    rollups.update_access_rollups()
+
+
+@shared_task(ignore_result=True)
+def flush_sessions():
+    """Copia para o banco as sessões alteradas no Redis"""
+    session_engine.flush_sessions()
@@ -1,3 +1,85 @@
-from django.test import TestCase
+import datetime
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from apps.users import throttle
+from apps.users.access_log import log_access
+from apps.users.backends import CustomAuthBackend
+from apps.users.exceptions import TooManyLoginAttemptsException
+from apps.users.models import User, UserAccess
+from apps.users.models.auth.constants import MAX_LOGIN_ATTEMPTS
+
+
+class LoginLockoutTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('fulano', 'fulano@example.com', 'senha')
+
+    def fail(self, times):
+        for _ in range(times):
+            self.user.record_login_attempt(False)
+        self.user.refresh_from_db()
+
+    def test_lockout_rearms_after_expiry(self):
+        self.fail(MAX_LOGIN_ATTEMPTS)
+        self.assertTrue(self.user.is_locked_out())
+
+        User.objects.filter(pk=self.user.pk).update(
+            lockout_until=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_locked_out())
+
+        # A primeira falha após a expiração recomeça a contagem e limpa o bloqueio
+        self.fail(1)
+        self.assertEqual(self.user.login_attempts, 1)
+        self.assertIsNone(self.user.lockout_until)
+
+        self.fail(MAX_LOGIN_ATTEMPTS - 1)
+        self.assertEqual(self.user.login_attempts, MAX_LOGIN_ATTEMPTS)
+        self.assertTrue(self.user.is_locked_out())
+
+
+@mock.patch('apps.users.backends.LOGIN_THROTTLE_ENABLED', True)
+class IpLockoutTest(TestCase):
+    ip = '203.0.113.7'
+
+    def setUp(self):
+        cache.clear()
+        self.backend = CustomAuthBackend()
+        self.user = User.objects.create_user('fulano', 'fulano@example.com', 'senha')
+        self.request = RequestFactory().post('/login/', REMOTE_ADDR=self.ip)
+
+    def lock_ip(self):
+        cache.set(throttle.IP_LOCK_KEY.format(ident=throttle._ident(self.ip)), time.time() + 60)
+
+    def test_locked_ip_rejects_before_password_check(self):
+        self.lock_ip()
+        with mock.patch.object(User, 'check_password') as check_password:
+            with self.assertRaises(TooManyLoginAttemptsException):
+                self.backend.authenticate_credentials(self.request, 'fulano', 'senha')
+        check_password.assert_not_called()
+
+    def test_locked_ip_accepts_known_login(self):
+        self.backend.authenticate_credentials(self.request, 'fulano', 'senha')
+        self.lock_ip()
+        user = self.backend.authenticate_credentials(self.request, 'fulano', 'senha')
+        self.assertEqual(user.pk, self.user.pk)
+        with self.assertRaises(TooManyLoginAttemptsException):
+            self.backend.authenticate_credentials(self.request, 'fulano', 'errada')
+
+
+class AccessLogTest(TestCase):
+
+    def test_falls_back_to_database_when_redis_is_down(self):
+        user = User.objects.create_user('fulano', 'fulano@example.com', 'senha')
+        client = mock.Mock()
+        client.rpush.side_effect = RedisConnectionError()
+        with mock.patch('apps.users.access_log.get_buffer', return_value=client):
+            log_access(user, ip_address='203.0.113.7', details='Login')
+        self.assertTrue(UserAccess.objects.filter(user=user, details='Login').exists())
@@ -0,0 +1,130 @@
+"""
+Controle de tentativas de login no cache (Redis).
+
+As falhas são contadas em janelas deslizantes por usuário e por IP do
+cliente. A janela deslizante é aproximada por dois baldes fixos (atual e
+anterior, este ponderado pelo tempo restante), o que permite usar apenas
+add/incr do cache configurado.
+
+O banco só é tocado quando um bloqueio começa (User.lockout_until) ou
+termina (login bem-sucedido); falhas intermediárias e tentativas contra
+usuários inexistentes não geram escrita em USUARIOS.
+
+Um IP bloqueado recusa todas as tentativas antes da verificação da senha,
+exceto as de pares (IP, login) que já entraram com sucesso a partir dele
+nos últimos LOGIN_KNOWN_IP_DAYS dias (unidades atrás do mesmo NAT).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from apps.users.models.auth.constants import (LOGIN_IP_LOCKOUT_MINUTES,
+                                              LOGIN_IP_MAX_ATTEMPTS,
+                                              LOGIN_IP_WINDOW_MINUTES,
+                                              LOGIN_KNOWN_IP_DAYS,
+                                              LOGIN_WINDOW_MINUTES,
+                                              MAX_LOGIN_ATTEMPTS)
+
+BUCKET_KEY = 'login_throttle:{scope}:{ident}:{bucket}'
+IP_LOCK_KEY = 'login_throttle:lock:ip:{ident}'
+KNOWN_LOGIN_KEY = 'login_throttle:known:{ident}'
+
+
+def _ident(value):
+    """Identificador curto e seguro para a chave de cache"""
+    return hashlib.sha1(str(value).lower().encode()).hexdigest()
+
+
+def _bucket_keys(scope, value, window):
+    now = time.time()
+    bucket = int(now // window)
+    ident = _ident(value)
+    current = BUCKET_KEY.format(scope=scope, ident=ident, bucket=bucket)
+    previous = BUCKET_KEY.format(scope=scope, ident=ident, bucket=bucket - 1)
+    elapsed = (now % window) / window
+    return current, previous, elapsed
+
+
+def _count(scope, value, window, increment=False):
+    """
+    Retorna o número de falhas na janela deslizante, registrando uma nova
+    falha se increment for True.
+    """
+    current, previous, elapsed = _bucket_keys(scope, value, window)
+    if increment:
+        # Os baldes vivem duas janelas, o suficiente para servir de "anterior"
+        if not cache.add(current, 1, timeout=window * 2):
+            try:
+                cache.incr(current)
+            except ValueError:
+                cache.set(current, 1, timeout=window * 2)
+    counts = cache.get_many([current, previous])
+    return int(counts.get(current, 0) + counts.get(previous, 0) * (1 - elapsed))
+
+
+def get_ip_lockout(ip):
+    """
+    Retorna o fim do bloqueio do IP (timestamp) ou None.
+    """
+    if not ip:
+        return None
+    return cache.get(IP_LOCK_KEY.format(ident=_ident(ip)))
+
+
+def register_failure(username, ip):
+    """
+    Registra uma tentativa falha para o usuário e para o IP.
+
+    Quando o IP excede LOGIN_IP_MAX_ATTEMPTS na janela, ele é bloqueado
+    por LOGIN_IP_LOCKOUT_MINUTES apenas no cache (ver is_known_login).
+
+    Args:
+        username: Identificador da conta (None para usuário inexistente)
+        ip: IP do cliente (pode ser None)
+
+    Returns:
+        int: Falhas do usuário na janela (0 se username for None)
+    """
+    if ip:
+        ip_window = LOGIN_IP_WINDOW_MINUTES * 60
+        if _count('ip', ip, ip_window, increment=True) >= LOGIN_IP_MAX_ATTEMPTS:
+            lockout = LOGIN_IP_LOCKOUT_MINUTES * 60
+            cache.add(IP_LOCK_KEY.format(ident=_ident(ip)), time.time() + lockout, timeout=lockout)
+
+    if username is None:
+        return 0
+    return _count('user', username, LOGIN_WINDOW_MINUTES * 60, increment=True)
+
+
+def should_lock(attempts):
+    """Indica se o número de falhas deve iniciar o bloqueio da conta"""
+    return attempts >= MAX_LOGIN_ATTEMPTS
+
+
+def reset_user(username):
+    """
+    Zera as falhas do usuário (login bem-sucedido ou bloqueio iniciado).
+    """
+    window = LOGIN_WINDOW_MINUTES * 60
+    current, previous, _ = _bucket_keys('user', username, window)
+    cache.delete_many([current, previous])
+
+
+def _known_key(ip, login):
+    return KNOWN_LOGIN_KEY.format(ident=_ident(f'{ip}|{login}'))
+
+
+def remember_login(ip, *logins):
+    """
+    Guarda os pares (IP, login) de um login bem-sucedido, que continuam
+    podendo entrar enquanto o IP estiver bloqueado.
+    """
+    if ip:
+        timeout = LOGIN_KNOWN_IP_DAYS * 24 * 60 * 60
+        cache.set_many({_known_key(ip, login): 1 for login in logins if login}, timeout=timeout)
+
+
+def is_known_login(ip, login):
+    """Indica se o login já entrou com sucesso a partir do IP"""
+    return bool(ip and login) and cache.get(_known_key(ip, login)) is not None
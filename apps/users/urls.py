@@ -13,6 +13,7 @@ urlpatterns = [
     path('login/', views.SignInView.as_view(), name='login'),
     path('logout/', views.SignOutView.as_view(), name='logout'),
     path('perfil/', views.ProfileView.as_view(), name='profile'),
+    path('acessos/painel/', views.AccessDashboardView.as_view(), name='access_dashboard'),
 
     # URLs para gerenciamento de permissões
     path('usuario/<int:user_id>/permissoes/',
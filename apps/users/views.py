@@ -1,16 +1,23 @@
+import datetime
+
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth import authenticate, login
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth import login
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.views import LogoutView
+from django.db.models import Count, Max, Sum
 from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.views.generic import TemplateView
 
+from apps.users.backends import CustomAuthBackend
 from apps.users.exceptions import (IncorrectCredentialsException,
+                                   TooManyLoginAttemptsException,
                                    UserAccountLockedException)
-from apps.users.models import User
+from apps.users.models import (DailyIPAccess, DailyUserAccess, RollupWatermark,
+                               User)
 from apps.users.models.auth.permissions import EventPermission
 
 
@@ -35,32 +42,15 @@ class SignInView(TemplateView):
         password = request.POST.get("password")
 
         try:
-            try:
-                user = User.objects.get(username=username)
-            except User.DoesNotExist:
-                raise IncorrectCredentialsException()
-
-            if user.is_locked_out():
-                raise UserAccountLockedException(username, user.lockout_until)
-
-            user = authenticate(request, username=username, password=password)
-            if user is None:
-                user = User.objects.get(username=username)
-                user.record_login_attempt(success=False, ip_address=request.META.get('REMOTE_ADDR'))
-                raise IncorrectCredentialsException()
-
-            login(request, user)
-            
-            user.record_login_attempt(
-                success=True,
-                ip_address=request.META.get('REMOTE_ADDR')
+            user = CustomAuthBackend().authenticate_credentials(
+                request, username, password
             )
-            
+            login(request, user)
             return HttpResponseRedirect(reverse("core:home"))
 
         except IncorrectCredentialsException:
             messages.error(request, "Usuário ou senha inválidos, favor tente novamente")
-        except UserAccountLockedException as e:
+        except (UserAccountLockedException, TooManyLoginAttemptsException) as e:
             messages.error(request, str(e))
         
         return self.render_to_response(self.get_context_data())
@@ -99,3 +89,48 @@ class UserPermissionsView(LoginRequiredMixin, TemplateView):
             'events': EventPermission.objects.all()
         })
         return context
+
+
+class AccessDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """
+    Painel de acessos para a equipe administrativa.
+    Lê apenas os resumos diários (ver apps.users.rollups).
+    """
+    template_name = "users/access_dashboard.html"
+    days = 30
+    top_ips = 10
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        today = timezone.localdate()
+        period_start = today - datetime.timedelta(days=self.days - 1)
+        week_start = today - datetime.timedelta(days=today.weekday())
+
+        daily = DailyUserAccess.objects.filter(date__gte=period_start).values('date').annotate(
+            success=Sum('success_count'),
+            failure=Sum('failure_count'),
+            users=Count('user'),
+        ).order_by('-date')
+
+        failed_ips = DailyIPAccess.objects.filter(
+            date__gte=today - datetime.timedelta(days=6)
+        ).values('ip_address').annotate(
+            failures=Sum('failure_count'),
+            successes=Sum('success_count'),
+            users=Max('user_count'),
+        ).filter(failures__gt=0).order_by('-failures')[:self.top_ips]
+
+        context.update({
+            'title': 'Painel de Acessos',
+            'days': self.days,
+            'daily': daily,
+            'failed_ips': failed_ips,
+            'week_users': DailyUserAccess.objects.filter(
+                date__gte=week_start, success_count__gt=0
+            ).values('user').distinct().count(),
+            'watermark': RollupWatermark.objects.filter(name='access_log').first(),
+        })
+        return context
@@ -0,0 +1,275 @@
+"""
+Bases para APIs somente leitura (Django REST Framework).
+
+- KeysetCursorPagination: paginação por cursor sobre KeysetPaginator, sem
+  OFFSET nem COUNT(*).
+- SparseFieldsetSerializer e SparseFieldsetMixin: o cliente escolhe as
+  colunas com ?fields= e os relacionamentos com ?expand=. As escolhas viram
+  .only(), select_related() e prefetch_related() no queryset, de modo que
+  colunas e tabelas não pedidas nunca são consultadas.
+- ChangeFeedView: feed de alterações para sincronização incremental (ver
+  apps.utils.sync).
+- HasEventPermission: exige o evento permission_required da view
+  (User.check_permission).
+- ProtectedFileField: URL de download autorizado de um arquivo protegido
+  (ver apps.utils.downloads), nunca o caminho em /media/.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from apps.utils import downloads, sync
+from apps.utils.pagination import InvalidCursor, KeysetPaginator
+
+
+def _split_param(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class HasEventPermission(BasePermission):
+    """
+    Permite o acesso a usuários com o evento permission_required da view
+    (superusuários sempre). Sem permission_required, nega.
+    """
+
+    def has_permission(self, request, view):
+        codename = getattr(view, 'permission_required', None)
+        user = request.user
+        return bool(codename and user and user.is_authenticated and user.check_permission(codename))
+
+
+class ProtectedFileField(serializers.Field):
+    """
+    URL absoluta de download autorizado do FileField de mesmo nome (ou de
+    source), registrado em apps.utils.downloads como name.
+    """
+
+    def __init__(self, name, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.download_name = name
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = downloads.get_download_url(self.download_name, value.instance)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Paginação por cursor na ordenação da view (atributo ordering), com a
+    chave primária como desempate.
+
+    A resposta traz next, previous (URLs ou None) e results.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(
+            queryset,
+            self.get_page_size(request),
+            ordering=getattr(view, 'ordering', None),
+        )
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor as e:
+            raise NotFound(e.message)
+        return list(self.page)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data,
+        })
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer com campos escolhidos pelo cliente.
+
+    Meta.expandable mapeia relacionamentos opcionais para seus serializers;
+    eles só entram na resposta quando pedidos em expand.
+
+    Args:
+        fields: Nomes dos campos a manter (None: todos)
+        expand: Relacionamentos de Meta.expandable a incluir
+    """
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        model = self.Meta.model
+        for name in expand:
+            relation = model._meta.get_field(name)
+            many = relation.one_to_many or relation.many_to_many
+            self.fields[name] = self.Meta.expandable[name](many=many, read_only=True)
+        if fields is not None:
+            for name in set(self.fields) - set(fields) - set(expand):
+                self.fields.pop(name)
+
+
+def _model_fields(serializer):
+    """Colunas do modelo usadas pelos campos simples do serializer"""
+    model = serializer.Meta.model
+    names = []
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.BaseSerializer):
+            continue
+        source = field.source.split('.')[0]
+        try:
+            if model._meta.get_field(source).concrete:
+                names.append(source)
+        except FieldDoesNotExist:
+            continue
+    return names
+
+
+def optimize_queryset(queryset, serializer, extra_fields=()):
+    """
+    Restringe o queryset às colunas e relacionamentos do serializer.
+
+    Relacionamentos para um objeto vêm por select_related (somente as
+    colunas do serializer aninhado); relacionamentos para muitos, por
+    prefetch_related com .only().
+
+    Args:
+        extra_fields: Colunas sempre carregadas (ex.: campos de ordenação)
+    """
+    model = queryset.model
+    only = list(_model_fields(serializer)) + [name.lstrip('-') for name in extra_fields]
+    select, prefetch = [], []
+
+    for name, field in serializer.fields.items():
+        if not isinstance(field, serializers.BaseSerializer):
+            continue
+        relation = model._meta.get_field(name)
+        nested = getattr(field, 'child', field)
+        columns = _model_fields(nested)
+        if relation.one_to_many or relation.many_to_many:
+            related = relation.related_model
+            prefetch.append(Prefetch(
+                name,
+                queryset=related.objects.only(*columns, relation.field.name),
+            ))
+        else:
+            select.append(name)
+            only.extend(f'{name}__{column}' for column in columns)
+
+    queryset = queryset.only(*only)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin para ViewSets com SparseFieldsetSerializer: lê ?fields= e
+    ?expand= (listas separadas por vírgula) e ajusta o queryset.
+    Os campos de ordering são sempre carregados, para a paginação.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def _available_fields(self):
+        serializer_class = self.get_serializer_class()
+        return (
+            set(serializer_class(context=self.get_serializer_context()).fields),
+            set(getattr(serializer_class.Meta, 'expandable', {})),
+        )
+
+    @cached_property
+    def sparse_fieldset(self):
+        """
+        Returns:
+            tuple: (campos ou None, relacionamentos a expandir)
+
+        Raises:
+            ValidationError: Campo ou relacionamento desconhecido
+        """
+        params = self.request.query_params
+        fields = params.get(self.fields_query_param)
+        fields = _split_param(fields) if fields is not None else None
+        expand = _split_param(params.get(self.expand_query_param, ''))
+
+        available, expandable = self._available_fields()
+        errors = {}
+        invalid_fields = set(fields or ()) - available - set(expand)
+        if invalid_fields:
+            errors[self.fields_query_param] = f"Campos inválidos: {', '.join(sorted(invalid_fields))}."
+        invalid_expand = set(expand) - expandable
+        if invalid_expand:
+            errors[self.expand_query_param] = (
+                f"Relacionamentos inválidos: {', '.join(sorted(invalid_expand))}."
+            )
+        if errors:
+            raise ValidationError(errors)
+        return fields, expand
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.sparse_fieldset
+        kwargs.setdefault('fields', fields)
+        kwargs.setdefault('expand', expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        return optimize_queryset(
+            super().get_queryset(),
+            self.get_serializer(),
+            extra_fields=getattr(self, 'ordering', None) or (),
+        )
+
+
+class ChangeFeedView(APIView):
+    """
+    Alterações desde a marca ?since= nas fontes ?resources= (padrão: todas
+    as permitidas ao usuário), com até ?limit= linhas por fonte.
+    """
+
+    def get(self, request, *args, **kwargs):
+        feeds = sync.get_feeds(request)
+        resources = _split_param(request.query_params.get('resources', ''))
+        if resources:
+            unknown = set(resources) - set(feeds)
+            if unknown:
+                raise ValidationError({'resources': f"Fontes inválidas: {', '.join(sorted(unknown))}."})
+            feeds = {name: feeds[name] for name in resources}
+
+        try:
+            limit = int(request.query_params.get('limit', sync.SYNC_PAGE_SIZE))
+        except ValueError:
+            limit = sync.SYNC_PAGE_SIZE
+
+        try:
+            data = sync.get_changes(request, feeds, request.query_params.get('since'), limit)
+        except sync.InvalidWatermark as e:
+            raise ValidationError({'since': e.message})
+        return Response(data)
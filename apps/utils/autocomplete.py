@@ -0,0 +1,166 @@
+"""
+Autocomplete (typeahead) genérico para selects remotos.
+
+Cada app declara suas fontes (subclasses de Autocomplete) e as registra
+em AppConfig.ready(). A view AutocompleteView atende todas as fontes em
+/utils/autocomplete/<nome>/?q=<texto>&limit=<n>, no formato do select2.
+
+As consultas retornam apenas linhas de values() (sem instanciar modelos)
+e são limitadas a AUTOCOMPLETE_MAX_RESULTS. Prefixos curtos, que são os
+mais frequentes e os mais caros, ficam em cache versionado por fonte; a
+versão é incrementada quando o modelo (ou um de depends_on) é salvo ou
+excluído.
+
+Buscas por prefixo sem diferenciar maiúsculas usam filter_prefix
+(UPPER(campo) LIKE 'TERMO%'); no PostgreSQL cada campo precisa de um índice
+funcional UPPER(campo) com text_pattern_ops, criado por migração.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Upper
+from django.db.models.signals import post_delete, post_save
+
+from apps.utils.cache import get_counter, incr_counter
+
+AUTOCOMPLETE_MAX_RESULTS = getattr(settings, 'AUTOCOMPLETE_MAX_RESULTS', 20)
+AUTOCOMPLETE_CACHE_PREFIX_LENGTH = getattr(settings, 'AUTOCOMPLETE_CACHE_PREFIX_LENGTH', 3)
+AUTOCOMPLETE_CACHE_TIMEOUT = getattr(settings, 'AUTOCOMPLETE_CACHE_TIMEOUT', 60 * 10)
+
+VERSION_KEY = 'autocomplete:version:{name}'
+RESULTS_KEY = 'autocomplete:{name}:{version}:{term}'
+
+_registry = {}
+
+
+class Autocomplete:
+    """
+    Fonte de dados de um autocomplete.
+
+    Atributos:
+        model: Modelo consultado
+        fields: Campos retornados por values() (o pk é incluído sempre)
+        label: Formato do texto exibido, usando os campos de fields
+        ordering: Ordenação dos resultados
+        min_length: Tamanho mínimo do texto para consultar
+        depends_on: Outros modelos exibidos nos resultados (ex.: campos de
+            relacionamentos em fields), que também invalidam o cache
+    """
+    model = None
+    fields = ()
+    label = None
+    ordering = None
+    min_length = 1
+    depends_on = ()
+
+    def has_permission(self, request):
+        """Define quem pode consultar a fonte (padrão: usuários autenticados)"""
+        return True
+
+    def get_queryset(self):
+        queryset = self.model._default_manager.all()
+        if self.ordering:
+            queryset = queryset.order_by(*self.ordering)
+        return queryset
+
+    def filter_queryset(self, queryset, term):
+        """Aplica o texto digitado; deve usar filtros cobertos por índice"""
+        raise NotImplementedError(
+            "Você deve implementar filter_queryset em %s" % self.__class__.__name__
+        )
+
+    def filter_prefix(self, queryset, term, *fields):
+        """
+        Linhas em que algum dos campos começa com term, sem diferenciar
+        maiúsculas, na forma coberta pelo índice UPPER(campo)
+        text_pattern_ops.
+        """
+        aliases = {f'{field}_upper': Upper(field) for field in fields}
+        condition = Q()
+        for alias in aliases:
+            condition |= Q(**{f'{alias}__startswith': term.upper()})
+        return queryset.alias(**aliases).filter(condition)
+
+    def get_label(self, row):
+        if self.label:
+            return self.label.format(**row)
+        return str(row['pk'])
+
+    def get_rows(self, term, limit):
+        queryset = self.get_queryset()
+        if term:
+            queryset = self.filter_queryset(queryset, term)
+        results = []
+        for row in queryset.values('pk', *self.fields)[:limit]:
+            text = self.get_label(row)
+            results.append({'id': row.pop('pk'), 'text': text, **row})
+        return results
+
+
+def normalize_term(term):
+    """Normaliza o texto digitado para consulta e chave de cache"""
+    return ' '.join((term or '').split()).lower()
+
+
+def register(name, source):
+    """
+    Registra uma fonte de autocomplete e conecta a invalidação do cache.
+
+    Args:
+        name: Nome usado na URL
+        source: Classe (subclasse de Autocomplete)
+    """
+    _registry[name] = source()
+
+    def invalidate(sender, **kwargs):
+        invalidate_autocomplete(name)
+
+    for model in (source.model, *source.depends_on):
+        label = model._meta.label_lower
+        post_save.connect(invalidate, sender=model, weak=False,
+                          dispatch_uid=f'autocomplete_save_{name}_{label}')
+        post_delete.connect(invalidate, sender=model, weak=False,
+                            dispatch_uid=f'autocomplete_delete_{name}_{label}')
+
+
+def invalidate_autocomplete(name):
+    """
+    Descarta o cache de uma fonte. Usado após gravações que não disparam
+    sinais (bulk_create, update()).
+    """
+    incr_counter(VERSION_KEY.format(name=name))
+
+
+def get_autocomplete(name):
+    """Retorna a fonte registrada ou None"""
+    return _registry.get(name)
+
+
+def search(name, term, limit=None):
+    """
+    Consulta uma fonte registrada.
+
+    Resultados de textos com até AUTOCOMPLETE_CACHE_PREFIX_LENGTH caracteres
+    são cacheados com AUTOCOMPLETE_MAX_RESULTS linhas e recortados no limite.
+
+    Returns:
+        tuple: (linhas, existem_mais)
+    """
+    source = _registry[name]
+    term = normalize_term(term)
+    limit = max(1, min(limit or AUTOCOMPLETE_MAX_RESULTS, AUTOCOMPLETE_MAX_RESULTS))
+
+    if len(term) < source.min_length:
+        return [], False
+
+    if len(term) > AUTOCOMPLETE_CACHE_PREFIX_LENGTH:
+        rows = source.get_rows(term, limit + 1)
+        return rows[:limit], len(rows) > limit
+
+    version = get_counter(VERSION_KEY.format(name=name))
+    key = RESULTS_KEY.format(name=name, version=version, term=term)
+    rows = cache.get(key)
+    if rows is None:
+        rows = source.get_rows(term, AUTOCOMPLETE_MAX_RESULTS + 1)
+        cache.set(key, rows, AUTOCOMPLETE_CACHE_TIMEOUT)
+    return rows[:limit], len(rows) > limit
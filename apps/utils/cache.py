@@ -0,0 +1,52 @@
+"""
+Utilitários de cache compartilhados entre os apps.
+"""
+import redis
+from django.conf import settings
+from django.core.cache import cache
+
+REDIS_URL = getattr(settings, 'REDIS_URL', None)
+
+_redis_client = None
+
+
+def incr_counter(key, initial=1):
+    """
+    Incrementa um contador persistente no cache, criando-o com initial se
+    necessário. Usado para versões de invalidação e métricas.
+
+    Returns:
+        int: Valor atual do contador
+    """
+    if cache.add(key, initial, timeout=None):
+        return initial
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # A chave expirou entre o add e o incr
+        cache.set(key, initial, timeout=None)
+        return initial
+
+
+def get_counter(key, default=0):
+    """
+    Retorna o valor atual de um contador sem criá-lo.
+    """
+    return cache.get(key, default)
+
+
+def get_redis_client():
+    """
+    Cliente redis-py de REDIS_URL, para estruturas que o cache do Django não
+    oferece (listas, conjuntos, travas). O pool de conexões é compartilhado
+    pelo processo.
+
+    Returns:
+        redis.Redis ou None se REDIS_URL não estiver configurado
+    """
+    global _redis_client
+    if not REDIS_URL:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
@@ -0,0 +1,96 @@
+"""
+Downloads autorizados de arquivos de mídia.
+
+O nginx não serve os documentos em /media/: cada app declara os campos de
+arquivo protegidos (subclasses de ProtectedFile) e os registra em
+AppConfig.ready(). A view ProtectedDownloadView atende todos em
+/utils/arquivos/<nome>/<pk>/: verifica a permissão e responde apenas com o
+cabeçalho X-Accel-Redirect para a location interna PROTECTED_MEDIA_PREFIX
+do nginx, que envia o arquivo. O Django nunca lê o arquivo.
+
+Sem nginx (desenvolvimento), PROTECTED_MEDIA_X_ACCEL = False faz o próprio
+Django enviar o arquivo.
+"""
+import mimetypes
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from django.utils.http import content_disposition_header
+from django.utils.text import slugify
+
+PROTECTED_MEDIA_X_ACCEL = getattr(settings, 'PROTECTED_MEDIA_X_ACCEL', True)
+PROTECTED_MEDIA_PREFIX = getattr(settings, 'PROTECTED_MEDIA_PREFIX', '/protected/')
+
+_registry = {}
+
+
+class ProtectedFile:
+    """
+    Campo de arquivo servido somente após verificação de permissão.
+
+    Atributos:
+        model: Modelo com o campo
+        field: Nome do FileField
+        permission: Código do evento exigido (check_permission); None para
+            qualquer usuário autenticado
+        as_attachment: Força o download em vez de abrir no navegador
+    """
+    model = None
+    field = None
+    permission = None
+    as_attachment = False
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def has_permission(self, request, obj):
+        if self.permission is None:
+            return True
+        return request.user.check_permission(self.permission)
+
+    def get_filename(self, obj, file):
+        """Nome sugerido ao navegador (os blobs só têm o hash no nome)"""
+        ext = posixpath.splitext(file.name)[1]
+        return f'{slugify(self.model._meta.verbose_name)}-{obj.pk}{ext}'
+
+
+def register(name, source):
+    """
+    Registra um campo de arquivo protegido.
+
+    Args:
+        name: Nome usado na URL
+        source: Classe (subclasse de ProtectedFile)
+    """
+    _registry[name] = source()
+
+
+def get_protected_file(name):
+    """Retorna a fonte registrada ou None"""
+    return _registry.get(name)
+
+
+def get_download_url(name, obj):
+    return reverse('utils:download', kwargs={'name': name, 'pk': obj.pk})
+
+
+def serve_file(file, filename=None, as_attachment=True):
+    """
+    Resposta que entrega o arquivo do FieldFile.
+
+    Returns:
+        HttpResponse: Com X-Accel-Redirect (corpo vazio) ou FileResponse
+    """
+    filename = filename or posixpath.basename(file.name)
+    if not PROTECTED_MEDIA_X_ACCEL:
+        return FileResponse(file.open('rb'), as_attachment=as_attachment, filename=filename)
+
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = HttpResponse(content_type=content_type)
+    response['X-Accel-Redirect'] = PROTECTED_MEDIA_PREFIX + quote(file.name)
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['Cache-Control'] = 'private, max-age=0'
+    return response
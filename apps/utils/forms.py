@@ -0,0 +1,144 @@
+"""
+Campos e widgets de formulário compartilhados.
+"""
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.html import format_html
+
+from apps.utils import resumable
+
+
+class RemoteSelect(forms.Select):
+    """
+    Select com opções carregadas sob demanda pelo select2.
+
+    Renderiza apenas a opção selecionada; as demais vêm do endpoint de
+    autocomplete (ver apps.utils.autocomplete) informado em data-ajax--url,
+    que o select2 lê automaticamente ao ser inicializado no elemento.
+    """
+
+    def __init__(self, autocomplete, attrs=None):
+        self.autocomplete = autocomplete
+        default_attrs = {'class': 'form-control select2'}
+        default_attrs.update(attrs or {})
+        super().__init__(attrs=default_attrs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.setdefault('data-ajax--url', reverse(
+            'utils:autocomplete', kwargs={'name': self.autocomplete}
+        ))
+        attrs.setdefault('data-ajax--delay', 250)
+        attrs.setdefault('data-ajax--cache', 'true')
+        if not self.is_required:
+            attrs.setdefault('data-allow-clear', 'true')
+            attrs.setdefault('data-placeholder', '')
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        """Monta somente a opção vazia e os valores selecionados"""
+        default = (None, [], 0)
+        groups = [default]
+        selected_choices = {str(v) for v in value if str(v) not in self.choices.field.empty_values}
+        if not self.is_required and not self.allow_multiple_selected:
+            default[1].append(self.create_option(name, '', '', False, 0))
+
+        if not selected_choices:
+            return groups
+
+        field = self.choices.field
+        to_field_name = field.to_field_name or 'pk'
+        queryset = field.queryset.filter(**{f'{to_field_name}__in': selected_choices})
+        for index, obj in enumerate(queryset, start=1):
+            option_value = field.prepare_value(obj)
+            default[1].append(self.create_option(
+                name, option_value, field.label_from_instance(obj), True, index,
+                subindex=None, attrs=attrs
+            ))
+        return groups
+
+
+class RemoteModelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField que não carrega a tabela inteira no formulário.
+
+    O valor enviado é validado com uma única consulta pelo pk (ou
+    to_field_name) dentro do queryset informado.
+    """
+
+    def __init__(self, queryset, autocomplete, *, widget=None, **kwargs):
+        widget = widget or RemoteSelect(autocomplete)
+        super().__init__(queryset, widget=widget, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        key = self.to_field_name or 'pk'
+        try:
+            obj = self.queryset.filter(**{key: value}).first()
+        except (ValueError, TypeError, ValidationError):
+            obj = None
+        if obj is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
+
+
+class ResumableFileInput(forms.FileInput):
+    """
+    Campo de arquivo enviado em partes (ver apps.utils.resumable).
+
+    O script utils/js/resumable-upload.js envia o arquivo escolhido para o
+    endpoint de uploads, guarda o id no campo oculto <nome>__upload e limpa o
+    campo de arquivo, de modo que o formulário envia apenas o id. Serve a
+    qualquer FileField; sem o script, o arquivo segue no POST normalmente.
+
+    O id só é aceito para uploads de user, definido pelo formulário (ver
+    ResumableUploadFormMixin).
+    """
+    upload_suffix = '__upload'
+    user = None
+
+    class Media:
+        js = ('utils/js/resumable-upload.js',)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.setdefault('data-resumable-url', reverse('utils:upload-create'))
+        return attrs
+
+    def render(self, name, value, attrs=None, renderer=None):
+        html = super().render(name, value, attrs, renderer)
+        return html + format_html(
+            '<input type="hidden" name="{}" data-resumable-for="{}">',
+            name + self.upload_suffix, (attrs or {}).get('id', ''),
+        )
+
+    def value_from_datadict(self, data, files, name):
+        upload_id = data.get(name + self.upload_suffix)
+        if upload_id:
+            return resumable.get_uploaded_file(upload_id, self.user)
+        return super().value_from_datadict(data, files, name)
+
+    def value_omitted_from_data(self, data, files, name):
+        return (
+            super().value_omitted_from_data(data, files, name)
+            and name + self.upload_suffix not in data
+        )
+
+
+class ResumableUploadFormMixin:
+    """
+    Formulário com campos ResumableFileInput: recebe user e o repassa aos
+    widgets, que só aceitam uploads desse usuário.
+    """
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            if isinstance(field.widget, ResumableFileInput):
+                field.widget.user = user
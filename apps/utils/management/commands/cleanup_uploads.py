@@ -0,0 +1,22 @@
+"""
+Remoção dos uploads em partes abandonados ou já utilizados.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.utils.resumable import RESUMABLE_UPLOAD_EXPIRATION_HOURS, cleanup
+
+
+class Command(BaseCommand):
+    help = 'Remove os uploads em partes abandonados e os registros dos já utilizados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=RESUMABLE_UPLOAD_EXPIRATION_HOURS,
+            help='Horas sem receber partes para um upload ser considerado abandonado',
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup(options['hours'])
+        self.stdout.write(self.style.SUCCESS(f'{removed} upload(s) removido(s).'))
@@ -0,0 +1,35 @@
+"""
+Manutenção do armazenamento deduplicado de documentos.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.utils.storage import adopt_legacy_files, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as referências dos blobs e apaga os que não são mais usados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--adopt',
+            action='store_true',
+            help='Converte antes os arquivos antigos (fora de blobs/), eliminando duplicados',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=24,
+            help='Idade mínima, em horas, de um blob sem referências para ser apagado',
+        )
+
+    def handle(self, *args, **options):
+        if options['adopt']:
+            adopted, freed = adopt_legacy_files()
+            self.stdout.write(self.style.SUCCESS(
+                f'{adopted} arquivo(s) convertido(s), {freed / 1024 / 1024:.1f} MB liberados.'
+            ))
+
+        fixed, deleted = reconcile(options['grace_hours'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{fixed} contador(es) corrigido(s), {deleted} blob(s) apagado(s).'
+        ))
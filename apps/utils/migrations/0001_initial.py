@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Nome')),
+                ('size', models.BigIntegerField(default=0, verbose_name='Tamanho')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='Referências')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Arquivo armazenado',
+                'verbose_name_plural': 'Arquivos armazenados',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:43
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumableUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255, verbose_name='Nome do arquivo')),
+                ('size', models.BigIntegerField(verbose_name='Tamanho')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Bytes recebidos')),
+                ('sha256', models.CharField(blank=True, max_length=64, verbose_name='SHA-256')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Upload em partes',
+                'verbose_name_plural': 'Uploads em partes',
+            },
+        ),
+    ]
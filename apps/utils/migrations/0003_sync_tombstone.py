@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0002_resumable_upload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=50, verbose_name='Fonte')),
+                ('object_id', models.CharField(max_length=64, verbose_name='ID do registro')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Excluído em')),
+            ],
+            options={
+                'verbose_name': 'Exclusão sincronizada',
+                'verbose_name_plural': 'Exclusões sincronizadas',
+                'indexes': [models.Index(fields=['resource', 'updated_at', 'id'], name='utils_synct_resourc_7b6dab_idx')],
+            },
+        ),
+    ]
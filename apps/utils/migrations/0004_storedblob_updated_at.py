@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0003_sync_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedblob',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0004_storedblob_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumableupload',
+            name='consumed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Utilizado em'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 import uuid
 
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class BaseModel(models.Model):
@@ -19,3 +21,85 @@ class UUIDBaseModel(BaseModel):
     class Meta:
         abstract = True
 
+
+
+class StoredBlob(models.Model):
+    """
+    Arquivo do armazenamento endereçado por conteúdo e número de campos que
+    o referenciam (ver apps.utils.storage).
+
+    A linha é travada (select_for_update) por quem grava o arquivo e pela
+    coleta de blobs sem uso, que assim nunca se sobrepõem.
+    """
+    name = models.CharField('Nome', max_length=255, primary_key=True)
+    size = models.BigIntegerField('Tamanho', default=0)
+    references = models.PositiveIntegerField('Referências', default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Arquivo armazenado'
+        verbose_name_plural = 'Arquivos armazenados'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def remove_reference(cls, name):
+        """Decrementa o contador; o arquivo só é apagado pela coleta"""
+        cls.objects.filter(name=name, references__gt=0).update(
+            references=models.F('references') - 1, updated_at=timezone.now()
+        )
+
+
+class ResumableUpload(models.Model):
+    """
+    Upload enviado em partes, que pode ser retomado do ponto em que parou
+    (ver apps.utils.resumable).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Usuário'
+    )
+    filename = models.CharField('Nome do arquivo', max_length=255)
+    size = models.BigIntegerField('Tamanho')
+    offset = models.BigIntegerField('Bytes recebidos', default=0)
+    sha256 = models.CharField('SHA-256', max_length=64, blank=True)
+    completed_at = models.DateTimeField('Concluído em', null=True, blank=True)
+    consumed_at = models.DateTimeField('Utilizado em', null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Upload em partes'
+        verbose_name_plural = 'Uploads em partes'
+
+    def __str__(self):
+        return self.filename
+
+    @property
+    def is_complete(self):
+        return self.completed_at is not None
+
+
+class SyncTombstone(models.Model):
+    """
+    Registro de exclusão física para o feed de alterações (ver
+    apps.utils.sync): o nome da fonte e a chave da linha excluída.
+    """
+    resource = models.CharField('Fonte', max_length=50)
+    object_id = models.CharField('ID do registro', max_length=64)
+    updated_at = models.DateTimeField('Excluído em', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Exclusão sincronizada'
+        verbose_name_plural = 'Exclusões sincronizadas'
+        indexes = [
+            models.Index(fields=['resource', 'updated_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.resource}: {self.object_id}"
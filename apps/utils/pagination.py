@@ -0,0 +1,292 @@
+"""
+Paginação para listagens grandes.
+
+- KeysetPaginator: em vez de OFFSET, cada página é obtida filtrando a partir
+  da última chave de ordenação vista, o que mantém o custo constante mesmo em
+  páginas profundas. O cursor é um token opaco com os valores da chave e a
+  direção da navegação.
+- EstimatedCountPaginator: paginação por número de página que usa as
+  estatísticas do planejador do PostgreSQL no lugar de COUNT(*) em tabelas
+  grandes.
+"""
+import base64
+import json
+from collections.abc import Sequence
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+# Abaixo deste número de linhas estimadas, a contagem exata é usada
+ESTIMATED_COUNT_THRESHOLD = getattr(settings, 'ESTIMATED_COUNT_THRESHOLD', 10000)
+
+
+def _get_reltuples(connection, db_table):
+    """
+    Linhas estimadas da tabela segundo pg_class (None se nunca analisada).
+    Em tabelas particionadas, soma as estimativas das partições.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE WHEN c.relkind = 'p' THEN (
+                       SELECT sum(greatest(p.reltuples, 0))::bigint
+                       FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid
+                       WHERE i.inhparent = c.oid)
+                   ELSE c.reltuples::bigint END
+            FROM pg_class c WHERE c.oid = %s::regclass
+            """,
+            [connection.ops.quote_name(db_table)]
+        )
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def _get_plan_rows(queryset):
+    """Linhas estimadas pelo planejador para a consulta (EXPLAIN)"""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_count(queryset, threshold=None):
+    """
+    Estima a quantidade de registros de um queryset.
+
+    Sem filtros, usa pg_class.reltuples; com filtros, a estimativa do
+    EXPLAIN. Se o banco não for PostgreSQL ou a estimativa ficar abaixo do
+    limite, executa a contagem exata.
+
+    Returns:
+        tuple: (quantidade, True se estimada)
+    """
+    threshold = ESTIMATED_COUNT_THRESHOLD if threshold is None else threshold
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count(), False
+
+    if not queryset.query.where and not queryset.query.distinct:
+        estimate = _get_reltuples(connection, queryset.model._meta.db_table)
+    else:
+        estimate = _get_plan_rows(queryset)
+
+    if estimate is None or estimate < threshold:
+        return queryset.count(), False
+    return estimate, True
+
+
+class InvalidCursor(Exception):
+    """Exceção para cursores malformados ou incompatíveis com a ordenação."""
+    def __init__(self, message=None):
+        self.message = message or "Cursor de paginação inválido."
+        super().__init__(self.message)
+
+
+def encode_cursor(values, direction):
+    """Codifica os valores da chave de ordenação em um token opaco"""
+    payload = json.dumps([direction, values], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decodifica um token gerado por encode_cursor"""
+    try:
+        padding = '=' * (-len(token) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(token + padding))
+    except (TypeError, ValueError):
+        raise InvalidCursor()
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or not isinstance(values, list):
+        raise InvalidCursor()
+    return direction, values
+
+
+class KeysetPaginator:
+    """
+    Paginador por chave.
+
+    Args:
+        queryset: QuerySet a paginar
+        per_page: Quantidade de registros por página
+        ordering: Campos de ordenação (aceita prefixo '-' e lookups com '__').
+            A chave primária é acrescentada como desempate se ausente.
+        with_count: Se True, expõe o total de registros
+        estimate_count: Se True, o total é estimado (ver estimate_count)
+    """
+    is_estimated = False
+
+    def __init__(self, queryset, per_page, ordering=None, with_count=False,
+                 estimate_count=False):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = self._normalize_ordering(
+            ordering or queryset.query.order_by or queryset.model._meta.ordering
+        )
+        self.with_count = with_count
+        self.estimate_count = estimate_count
+
+    def _normalize_ordering(self, ordering):
+        """Garante uma ordenação total acrescentando a chave primária"""
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        ordering = [field for field in ordering if isinstance(field, str)]
+        pk_name = self.queryset.model._meta.pk.name
+        names = {field.lstrip('-') for field in ordering}
+        if not names & {'pk', pk_name}:
+            ordering.append(pk_name)
+        return ordering
+
+    @cached_property
+    def count(self):
+        """Total de registros ou None quando a contagem está desabilitada"""
+        if not self.with_count:
+            return None
+        if self.estimate_count:
+            count, self.is_estimated = estimate_count(self.queryset)
+            return count
+        return self.queryset.count()
+
+    def get_cursor_values(self, obj):
+        """Extrai de um objeto os valores da chave de ordenação"""
+        return [
+            attrgetter(field.lstrip('-').replace('__', '.'))(obj)
+            for field in self.ordering
+        ]
+
+    def _seek_filter(self, values, reverse):
+        """
+        Monta o filtro (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        respeitando a direção de cada campo.
+        """
+        condition = Q()
+        equals = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            condition |= equals & Q(**{lookup: value})
+            equals &= Q(**{name: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        ]
+
+    def page(self, cursor=None):
+        """
+        Retorna a página correspondente ao cursor (ou a primeira página).
+
+        Raises:
+            InvalidCursor: Se o cursor for inválido
+        """
+        if not cursor:
+            direction, values = CURSOR_NEXT, None
+        else:
+            direction, values = decode_cursor(cursor)
+            if len(values) != len(self.ordering):
+                raise InvalidCursor()
+
+        backwards = direction == CURSOR_PREVIOUS
+        queryset = self.queryset.order_by(
+            *(self._reversed_ordering() if backwards else self.ordering)
+        )
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=values is not None)
+
+
+class KeysetPage(Sequence):
+    """
+    Página de resultados do KeysetPaginator.
+    Expõe a mesma interface básica de django.core.paginator.Page.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        """Token da próxima página ou None"""
+        if not self.has_next():
+            return None
+        values = self.paginator.get_cursor_values(self.object_list[-1])
+        return encode_cursor(values, CURSOR_NEXT)
+
+    @property
+    def previous_cursor(self):
+        """Token da página anterior ou None"""
+        if not self.has_previous():
+            return None
+        values = self.paginator.get_cursor_values(self.object_list[0])
+        return encode_cursor(values, CURSOR_PREVIOUS)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador que troca COUNT(*) por estimativas do PostgreSQL em tabelas
+    grandes. Como o total é aproximado, páginas além da estimativa continuam
+    acessíveis em vez de gerar EmptyPage.
+    """
+    is_estimated = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        count, self.is_estimated = estimate_count(self.object_list)
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.is_estimated and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        return self._get_page(self.object_list[bottom:top], number, self)
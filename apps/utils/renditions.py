@@ -0,0 +1,245 @@
+"""
+Versões redimensionadas (renditions) de imagens enviadas.
+
+Cada app declara as versões de um campo de imagem (subclasse de
+ImageRenditions) e as registra em AppConfig.ready(). As versões são geradas
+com Pillow pela tarefa apps.utils.tasks.generate_renditions, quando a imagem
+é salva ou, se ainda não existirem, no primeiro pedido da URL.
+
+Os arquivos ficam ao lado do original, com o hash do conteúdo no nome
+(foto.avatar.1a2b3c4d5e6f.webp): sem metadados EXIF (a orientação é
+aplicada antes) e recodificados com compressão otimizada. Como o nome muda
+sempre que o conteúdo muda, o nginx pode servi-los com cache longo.
+
+Os caminhos gerados ficam no JSONField renditions_field do modelo, junto
+do nome do original de que foram gerados (chave 'source').
+"""
+import hashlib
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+
+RENDITION_LOCK_TIMEOUT = getattr(settings, 'RENDITION_LOCK_TIMEOUT', 60 * 5)
+
+LOCK_KEY = 'renditions:pending:{key}:{pk}'
+SOURCE_KEY = 'source'
+
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp', 'PNG': 'png'}
+
+_registry = {}
+
+
+class Rendition:
+    """
+    Uma versão da imagem.
+
+    Args:
+        name: Nome da versão (usado no arquivo e nos templates)
+        size: (largura, altura) máximas
+        crop: Recorta no centro para a proporção exata de size
+        format: Formato do Pillow (JPEG, WEBP ou PNG)
+        quality: Qualidade da compressão
+    """
+
+    def __init__(self, name, size, crop=True, format='WEBP', quality=82):
+        self.name = name
+        self.size = size
+        self.crop = crop
+        self.format = format
+        self.quality = quality
+
+    @property
+    def extension(self):
+        return EXTENSIONS[self.format]
+
+
+class ImageRenditions:
+    """
+    Versões de um campo de imagem.
+
+    Atributos:
+        model: Modelo com o campo
+        field: Nome do ImageField
+        renditions_field: Nome do JSONField que guarda os caminhos gerados
+        renditions: Versões (instâncias de Rendition)
+    """
+    model = None
+    field = None
+    renditions_field = None
+    renditions = ()
+
+    @property
+    def key(self):
+        return get_key(self.model, self.field)
+
+    def get_rendition(self, name):
+        for rendition in self.renditions:
+            if rendition.name == name:
+                return rendition
+        raise KeyError(name)
+
+
+def get_key(model, field):
+    return f'{model._meta.label_lower}.{field}'
+
+
+def register(source):
+    """
+    Registra as versões de um campo e conecta a geração ao salvar.
+
+    Args:
+        source: Classe (subclasse de ImageRenditions)
+    """
+    config = source()
+    _registry[config.key] = config
+
+    def image_saved(sender, instance, **kwargs):
+        if is_outdated(config, instance):
+            schedule(config, instance.pk)
+
+    post_save.connect(image_saved, sender=config.model, weak=False,
+                      dispatch_uid=f'renditions_{config.key}')
+
+
+def get_config(key):
+    """Retorna a configuração registrada ou None"""
+    return _registry.get(key)
+
+
+def is_outdated(config, instance):
+    """Indica se as versões salvas não correspondem à imagem atual"""
+    image = getattr(instance, config.field)
+    stored = getattr(instance, config.renditions_field) or {}
+    if not image:
+        return bool(stored)
+    return stored.get(SOURCE_KEY) != image.name
+
+
+def schedule(config, pk):
+    """Agenda a geração das versões (uma vez por objeto enquanto pendente)"""
+    if not cache.add(LOCK_KEY.format(key=config.key, pk=pk), 1, RENDITION_LOCK_TIMEOUT):
+        return
+    from apps.utils.tasks import generate_renditions
+    transaction.on_commit(lambda: generate_renditions.delay(config.key, pk))
+
+
+def render(image, rendition):
+    """
+    Redimensiona e codifica uma versão.
+
+    Returns:
+        bytes: Conteúdo do arquivo
+    """
+    if rendition.crop:
+        image = ImageOps.fit(image, rendition.size, Image.LANCZOS)
+    else:
+        image = image.copy()
+        image.thumbnail(rendition.size, Image.LANCZOS)
+
+    output = io.BytesIO()
+    options = {'quality': rendition.quality, 'optimize': True}
+    if rendition.format == 'JPEG':
+        options['progressive'] = True
+    elif rendition.format == 'WEBP':
+        options = {'quality': rendition.quality, 'method': 6}
+    # Sem exif=: os metadados do original não são copiados
+    image.save(output, rendition.format, **options)
+    return output.getvalue()
+
+
+def open_image(file, renditions):
+    """Abre a imagem já orientada (EXIF) e em RGB"""
+    image = Image.open(file)
+    # Decodifica JPEGs direto numa escala reduzida, suficiente para a maior
+    # versão em qualquer orientação
+    side = max(max(rendition.size) for rendition in renditions)
+    image.draft('RGB', (side, side))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+def get_rendition_name(source_name, rendition, content):
+    root = posixpath.splitext(source_name)[0]
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f'{root}.{rendition.name}.{digest}.{rendition.extension}'
+
+
+def generate(key, pk):
+    """
+    Gera as versões da imagem atual do objeto e remove as anteriores.
+
+    Returns:
+        dict: Caminhos por versão (vazio se não houver imagem)
+    """
+    config = _registry[key]
+    model = config.model
+    try:
+        instance = model._default_manager.only(config.field, config.renditions_field).get(pk=pk)
+    except model.DoesNotExist:
+        return {}
+
+    image_file = getattr(instance, config.field)
+    previous = getattr(instance, config.renditions_field) or {}
+    paths = {}
+    try:
+        if image_file:
+            storage = image_file.storage
+            with image_file.open('rb') as file:
+                image = open_image(file, config.renditions)
+                for rendition in config.renditions:
+                    content = render(image, rendition)
+                    name = get_rendition_name(image_file.name, rendition, content)
+                    if not storage.exists(name):
+                        name = storage.save(name, ContentFile(content))
+                    paths[rendition.name] = name
+            paths[SOURCE_KEY] = image_file.name
+
+        # Não sobrescreve se a imagem mudou durante a geração
+        if image_file:
+            same_image = Q(**{config.field: image_file.name})
+        else:
+            same_image = Q(**{config.field: ''}) | Q(**{f'{config.field}__isnull': True})
+        updated = model._default_manager.filter(same_image, pk=pk).update(
+            **{config.renditions_field: paths}
+        )
+    finally:
+        cache.delete(LOCK_KEY.format(key=key, pk=pk))
+
+    if updated:
+        storage = image_file.storage
+        current = set(paths.values())
+        for name, path in previous.items():
+            if name != SOURCE_KEY and path not in current:
+                storage.delete(path)
+    return paths
+
+
+def get_url(instance, field, name):
+    """
+    URL de uma versão da imagem.
+
+    Enquanto a versão não existir, agenda a geração e retorna a URL do
+    original.
+
+    Returns:
+        str: URL ou '' se não houver imagem
+    """
+    config = _registry[get_key(type(instance), field)]
+    config.get_rendition(name)
+    image_file = getattr(instance, field)
+    if not image_file:
+        return ''
+    stored = getattr(instance, config.renditions_field) or {}
+    if stored.get(SOURCE_KEY) == image_file.name and name in stored:
+        return image_file.storage.url(stored[name])
+    schedule(config, instance.pk)
+    return image_file.url
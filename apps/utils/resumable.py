@@ -0,0 +1,286 @@
+"""
+Uploads em partes, retomáveis (no estilo do protocolo tus).
+
+Documentos digitalizados grandes, enviados por conexões ruins, não cabem num
+único POST multipart: uma queda recomeça tudo do zero. Aqui o cliente:
+
+1. cria o upload (POST /utils/uploads/) com nome e tamanho;
+2. envia partes de até RESUMABLE_UPLOAD_CHUNK_SIZE (PATCH com o cabeçalho
+   Upload-Offset e, opcionalmente, Upload-Checksum: sha256 <base64>);
+3. após uma falha, consulta o offset (HEAD) e continua dali.
+
+Checksum divergente responde 460, como no tus.
+
+Cada parte é gravada direto na posição final de um único arquivo em
+MEDIA_ROOT/RESUMABLE_UPLOAD_DIR; não há etapa de montagem. Ao receber o
+último byte, o SHA-256 do arquivo é calculado (uma leitura) e comparado com
+o informado na criação.
+
+O upload concluído é entregue a qualquer FileField como
+ResumableUploadedFile (ver apps.utils.forms.ResumableFileInput): ele expõe
+temporary_file_path() e sha256, então o armazenamento apenas move
+(rename) o arquivo para o destino, sem copiá-lo nem recalcular o hash.
+
+Só o usuário que criou o upload pode usá-lo, e uma única vez: ao ser
+gravado pelo armazenamento, o upload é marcado como utilizado
+(consumed_at) e depois removido por cleanup().
+"""
+import base64
+import binascii
+import datetime
+import hashlib
+import mimetypes
+import os
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.utils.models import ResumableUpload
+from apps.utils.storage import hash_chunks
+
+RESUMABLE_UPLOAD_DIR = getattr(settings, 'RESUMABLE_UPLOAD_DIR', 'resumable')
+RESUMABLE_UPLOAD_MAX_SIZE = getattr(settings, 'RESUMABLE_UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+RESUMABLE_UPLOAD_CHUNK_SIZE = getattr(settings, 'RESUMABLE_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+RESUMABLE_UPLOAD_EXPIRATION_HOURS = getattr(settings, 'RESUMABLE_UPLOAD_EXPIRATION_HOURS', 24)
+
+LOCK_KEY = 'resumable:lock:{pk}'
+LOCK_TIMEOUT = 60 * 5
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Erro no envio de uma parte; status é o código HTTP da resposta"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def get_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, RESUMABLE_UPLOAD_DIR, f'{upload.pk}.part')
+
+
+def create_upload(user, filename, size, sha256=''):
+    """
+    Cria o upload e o arquivo vazio que receberá as partes.
+
+    Returns:
+        ResumableUpload: O upload criado
+    """
+    if size <= 0:
+        raise UploadError('Tamanho inválido.')
+    if size > RESUMABLE_UPLOAD_MAX_SIZE:
+        raise UploadError('Arquivo maior que o permitido.', status=413)
+    sha256 = (sha256 or '').lower()
+    if sha256 and (len(sha256) != 64 or not all(c in '0123456789abcdef' for c in sha256)):
+        raise UploadError('SHA-256 inválido.')
+
+    upload = ResumableUpload.objects.create(
+        user=user,
+        filename=os.path.basename(filename)[:255],
+        size=size,
+        sha256=sha256,
+    )
+    path = get_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return upload
+
+
+def get_status(upload):
+    """Estado do upload devolvido ao cliente"""
+    return {
+        'id': str(upload.pk),
+        'url': reverse('utils:upload', kwargs={'pk': upload.pk}),
+        'size': upload.size,
+        'offset': upload.offset,
+        'complete': upload.is_complete,
+        'chunk_size': RESUMABLE_UPLOAD_CHUNK_SIZE,
+    }
+
+
+def parse_checksum(header):
+    """
+    Lê o cabeçalho Upload-Checksum ('sha256 <base64>').
+
+    Returns:
+        bytes: Digest esperado ou None se não informado
+    """
+    if not header:
+        return None
+    algorithm, _, value = header.partition(' ')
+    if algorithm.lower() != 'sha256':
+        raise UploadError('Algoritmo de checksum não suportado.')
+    try:
+        return base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        raise UploadError('Checksum inválido.')
+
+
+def write_chunk(upload, offset, stream, length, checksum=None):
+    """
+    Grava uma parte na posição offset do arquivo.
+
+    A parte só é aceita inteira: se a conexão cair ou o checksum não
+    conferir, o arquivo volta ao offset anterior e o cliente reenvia a parte.
+
+    Args:
+        upload: ResumableUpload
+        offset: Posição informada pelo cliente (deve ser a atual)
+        stream: Objeto com read() (o corpo da requisição)
+        length: Tamanho da parte (Content-Length)
+        checksum: Digest SHA-256 esperado da parte, ou None
+
+    Returns:
+        ResumableUpload: O upload atualizado
+    """
+    if upload.is_complete:
+        raise UploadError('Upload já concluído.', status=409)
+    if length <= 0 or length > RESUMABLE_UPLOAD_CHUNK_SIZE:
+        raise UploadError('Tamanho da parte inválido.', status=413)
+    if offset + length > upload.size:
+        raise UploadError('A parte ultrapassa o tamanho do arquivo.')
+
+    # Uma parte por vez: duas abas retomando o mesmo upload se sobreporiam
+    lock = LOCK_KEY.format(pk=upload.pk)
+    if not cache.add(lock, 1, LOCK_TIMEOUT):
+        raise UploadError('Outra parte deste upload está sendo recebida.', status=409)
+    try:
+        upload.refresh_from_db(fields=['offset', 'completed_at'])
+        if offset != upload.offset:
+            raise UploadError('Offset divergente.', status=409)
+
+        digest = hashlib.sha256()
+        received = 0
+        with open(get_path(upload), 'r+b') as file:
+            file.seek(offset)
+            try:
+                while received < length:
+                    block = stream.read(min(BLOCK_SIZE, length - received))
+                    if not block:
+                        break
+                    digest.update(block)
+                    file.write(block)
+                    received += len(block)
+                if received != length:
+                    raise UploadError('Parte incompleta.')
+                if checksum is not None and digest.digest() != checksum:
+                    raise UploadError('Checksum da parte não confere.', status=460)
+                file.flush()
+                os.fsync(file.fileno())
+            except Exception:
+                file.truncate(offset)
+                raise
+
+        upload.offset = offset + received
+        ResumableUpload.objects.filter(pk=upload.pk, offset=offset).update(offset=upload.offset)
+        if upload.offset == upload.size:
+            complete(upload)
+    finally:
+        cache.delete(lock)
+    return upload
+
+
+def complete(upload):
+    """Confere o SHA-256 do arquivo montado e marca o upload como concluído"""
+    path = get_path(upload)
+    with open(path, 'rb') as file:
+        digest, size = hash_chunks(iter(lambda: file.read(BLOCK_SIZE), b''))
+    if size != upload.size or (upload.sha256 and digest != upload.sha256):
+        discard(upload)
+        raise UploadError('O arquivo recebido não confere com o enviado.', status=460)
+
+    upload.sha256 = digest
+    upload.completed_at = timezone.now()
+    ResumableUpload.objects.filter(pk=upload.pk).update(
+        sha256=upload.sha256, completed_at=upload.completed_at
+    )
+
+
+def discard(upload):
+    """Apaga o upload e o arquivo"""
+    try:
+        os.remove(get_path(upload))
+    except FileNotFoundError:
+        pass
+    ResumableUpload.objects.filter(pk=upload.pk).delete()
+
+
+class ResumableUploadedFile(UploadedFile):
+    """
+    Upload concluído, aceito por qualquer FileField. O armazenamento move o
+    arquivo (temporary_file_path) em vez de copiá-lo.
+    """
+
+    def __init__(self, upload):
+        path = get_path(upload)
+        content_type = mimetypes.guess_type(upload.filename)[0] or 'application/octet-stream'
+        super().__init__(open(path, 'rb'), upload.filename, content_type, upload.size, None)
+        self.sha256 = upload.sha256
+        self.upload_id = upload.pk
+        self._path = path
+        self._consumed = False
+
+    def temporary_file_path(self):
+        """
+        Chamado pelo armazenamento ao gravar o arquivo: marca o upload como
+        utilizado (na transação corrente), o que impede um segundo uso.
+        """
+        if not self._consumed:
+            consumed = ResumableUpload.objects.filter(
+                pk=self.upload_id, consumed_at__isnull=True
+            ).update(consumed_at=timezone.now())
+            if not consumed:
+                raise UploadError('Upload já utilizado.', status=409)
+            self._consumed = True
+        return self._path
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # Arquivo já movido para o destino
+            pass
+
+
+def get_uploaded_file(upload_id, user):
+    """
+    Arquivo de um upload do usuário, concluído e ainda não utilizado.
+
+    Returns:
+        ResumableUploadedFile ou None
+    """
+    if user is None or not user.is_authenticated:
+        return None
+    try:
+        upload_id = uuid.UUID(str(upload_id))
+    except ValueError:
+        return None
+    upload = ResumableUpload.objects.filter(
+        pk=upload_id, user=user, completed_at__isnull=False, consumed_at__isnull=True
+    ).first()
+    if upload is None or not os.path.exists(get_path(upload)):
+        return None
+    return ResumableUploadedFile(upload)
+
+
+def cleanup(hours=RESUMABLE_UPLOAD_EXPIRATION_HOURS):
+    """
+    Remove uploads abandonados há mais de hours e os já utilizados (o
+    arquivo pode ter ficado, se o armazenamento já tinha o mesmo conteúdo).
+
+    Returns:
+        int: Uploads removidos
+    """
+    cutoff = timezone.now() - datetime.timedelta(hours=hours)
+    removed = 0
+    for upload in ResumableUpload.objects.iterator():
+        if (upload.updated_at < cutoff or upload.consumed_at is not None
+                or (upload.is_complete and not os.path.exists(get_path(upload)))):
+            discard(upload)
+            removed += 1
+    return removed
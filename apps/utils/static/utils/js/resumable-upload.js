@@ -0,0 +1,161 @@
+/**
+ * Upload em partes, retomável (ver apps.utils.resumable e
+ * apps.utils.forms.ResumableFileInput).
+ *
+ * Ao escolher o arquivo, envia-o em partes para data-resumable-url. Após
+ * uma falha de rede, consulta o offset no servidor e continua dali. O id do
+ * upload fica em localStorage: recarregar a página e escolher o mesmo
+ * arquivo retoma o envio. Concluído, o id vai para o campo oculto e o campo
+ * de arquivo é limpo.
+ */
+(function () {
+    'use strict';
+
+    const MAX_RETRIES = 8;
+
+    function getCsrfToken(input) {
+        const form = input.closest('form');
+        const field = form && form.querySelector('input[name=csrfmiddlewaretoken]');
+        if (field) {
+            return field.value;
+        }
+        const match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+        return match ? decodeURIComponent(match[1]) : '';
+    }
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function sha256Base64(buffer) {
+        const digest = await crypto.subtle.digest('SHA-256', buffer);
+        return btoa(String.fromCharCode(...new Uint8Array(digest)));
+    }
+
+    class ResumableUpload {
+        constructor(input) {
+            this.input = input;
+            this.hidden = document.querySelector(`input[data-resumable-for="${input.id}"]`);
+            this.status = document.createElement('div');
+            this.status.className = 'form-text';
+            input.insertAdjacentElement('afterend', this.status);
+            input.addEventListener('change', () => this.start());
+        }
+
+        storageKey(file) {
+            return `resumable:${this.input.name}:${file.name}:${file.size}:${file.lastModified}`;
+        }
+
+        async request(method, url, options = {}) {
+            const headers = Object.assign({'X-CSRFToken': getCsrfToken(this.input)}, options.headers);
+            return fetch(url, Object.assign({}, options, {method, headers, credentials: 'same-origin'}));
+        }
+
+        async create(file) {
+            const key = this.storageKey(file);
+            const saved = localStorage.getItem(key);
+            if (saved) {
+                const response = await this.request('GET', saved);
+                if (response.ok) {
+                    return response.json();
+                }
+                localStorage.removeItem(key);
+            }
+            const body = new FormData();
+            body.append('filename', file.name);
+            body.append('size', file.size);
+            const response = await this.request('POST', this.input.dataset.resumableUrl, {body});
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error(data.errors);
+            }
+            localStorage.setItem(key, data.url);
+            return data;
+        }
+
+        async send(file, upload) {
+            let retries = 0;
+            while (!upload.complete) {
+                const chunk = file.slice(upload.offset, upload.offset + upload.chunk_size);
+                const buffer = await chunk.arrayBuffer();
+                const headers = {
+                    'Content-Type': 'application/offset+octet-stream',
+                    'Upload-Offset': upload.offset,
+                };
+                // crypto.subtle só existe em contextos seguros (HTTPS)
+                if (window.crypto && crypto.subtle) {
+                    headers['Upload-Checksum'] = 'sha256 ' + await sha256Base64(buffer);
+                }
+                let response;
+                try {
+                    response = await this.request('PATCH', upload.url, {body: buffer, headers});
+                } catch (error) {
+                    response = null;
+                }
+
+                if (response && response.ok) {
+                    upload = await response.json();
+                    retries = 0;
+                    this.progress(upload);
+                    continue;
+                }
+                if (response && response.status < 500 && ![409, 460].includes(response.status)) {
+                    const data = await response.json();
+                    throw new Error(data.errors);
+                }
+
+                // Falha de rede ou conflito: espera e retoma do offset do servidor
+                if (++retries > MAX_RETRIES) {
+                    throw new Error('Falha de conexão. Escolha o arquivo novamente para continuar.');
+                }
+                this.status.textContent = 'Conexão instável, tentando novamente...';
+                await sleep(Math.min(30000, 1000 * 2 ** retries));
+                try {
+                    const current = await this.request('GET', upload.url);
+                    if (current.ok) {
+                        upload = await current.json();
+                    }
+                } catch (error) {
+                    // Continua tentando com o offset conhecido
+                }
+            }
+            return upload;
+        }
+
+        progress(upload) {
+            const percent = Math.floor(upload.offset * 100 / upload.size);
+            this.status.textContent = `Enviando... ${percent}%`;
+        }
+
+        async start() {
+            const file = this.input.files[0];
+            this.hidden.value = '';
+            if (!file) {
+                return;
+            }
+            const form = this.input.form;
+            const submit = form ? form.querySelectorAll('[type=submit]') : [];
+            submit.forEach(button => button.disabled = true);
+            try {
+                let upload = await this.create(file);
+                this.progress(upload);
+                upload = await this.send(file, upload);
+                localStorage.removeItem(this.storageKey(file));
+                this.hidden.value = upload.id;
+                this.input.value = '';
+                this.input.required = false;
+                this.status.textContent = `${file.name} enviado.`;
+            } catch (error) {
+                this.status.textContent = error.message;
+            } finally {
+                submit.forEach(button => button.disabled = false);
+            }
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('input[type=file][data-resumable-url]').forEach(
+            input => new ResumableUpload(input)
+        );
+    });
+})();
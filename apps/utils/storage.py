@@ -0,0 +1,264 @@
+"""
+Armazenamento endereçado por conteúdo (SHA-256) com deduplicação.
+
+Arquivos iguais enviados várias vezes (ex.: o mesmo BOL PM anexado ao
+histórico de cada policial designado) ocupam um único arquivo em disco,
+em blobs/<h[0:2]>/<h[2:4]>/<sha256>.<ext>. O nome gerado por upload_to é
+ignorado: o campo guarda o nome do blob.
+
+O hash é calculado enquanto o upload é recebido (ver
+apps.utils.uploads) ou, para arquivos salvos pelo código, durante a única
+cópia para o disco. Cada blob tem um contador de referências
+(StoredBlob): save() incrementa e delete() decrementa.
+
+Nenhum arquivo é apagado durante as requisições: o comando reconcile_blobs
+(ver reconcile) recalcula as referências a partir dos campos que usam este
+armazenamento e apaga os blobs sem uso, inclusive os arquivos que ficaram
+em blobs/ sem StoredBlob porque a transação do save() foi desfeita. save() e a coleta travam a linha do
+StoredBlob, de modo que um blob nunca é apagado entre a verificação de que
+o arquivo existe e o incremento do contador.
+
+Nomes antigos (fora de blobs/) continuam acessíveis normalmente.
+"""
+import datetime
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+BLOB_DIR = 'blobs'
+TEMP_DIR = 'tmp'
+
+
+def hash_chunks(chunks, output=None):
+    """
+    Calcula o SHA-256 percorrendo os blocos, gravando-os em output se informado.
+
+    Returns:
+        tuple: (hash hexadecimal, tamanho)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        digest.update(chunk)
+        size += len(chunk)
+        if output is not None:
+            output.write(chunk)
+    return digest.hexdigest(), size
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage que grava cada conteúdo uma única vez"""
+
+    def get_blob_name(self, digest, name):
+        ext = posixpath.splitext(name)[1].lower()
+        return posixpath.join(BLOB_DIR, digest[:2], digest[2:4], digest + ext)
+
+    def is_blob(self, name):
+        return name.startswith(BLOB_DIR + '/')
+
+    def _save(self, name, content):
+        digest = getattr(content, 'sha256', None)
+        if digest is not None and hasattr(content, 'temporary_file_path'):
+            # Upload grande, já em disco e com hash calculado: só move
+            blob_name = self.get_blob_name(digest, name)
+            self._store(content.temporary_file_path(), blob_name, content.size)
+            return blob_name
+
+        temp_dir = self.path(posixpath.join(BLOB_DIR, TEMP_DIR))
+        os.makedirs(temp_dir, exist_ok=True)
+        temp = tempfile.NamedTemporaryFile(dir=temp_dir, delete=False)
+        try:
+            with temp:
+                digest, size = hash_chunks(content.chunks(), temp)
+            blob_name = self.get_blob_name(digest, name)
+            self._store(temp.name, blob_name, size)
+        finally:
+            if os.path.exists(temp.name):
+                os.remove(temp.name)
+        return blob_name
+
+    def _store(self, source, blob_name, size):
+        """
+        Com a linha do blob travada, move source para o blob (se ainda não
+        existir no disco) e incrementa as referências.
+        """
+        from apps.utils.models import StoredBlob
+
+        with transaction.atomic():
+            blob, _ = StoredBlob.objects.select_for_update().get_or_create(
+                name=blob_name, defaults={'size': size}
+            )
+            if not self.exists(blob_name):
+                self._move_into_place(source, blob_name)
+            blob.references = models.F('references') + 1
+            blob.save(update_fields=['references', 'updated_at'])
+
+    def _move_into_place(self, source, blob_name):
+        """Move o arquivo para o blob (conteúdo igual: sobrescrever é seguro)"""
+        full_path = self.path(blob_name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        file_move_safe(source, full_path, allow_overwrite=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+
+    def delete(self, name):
+        """Remove uma referência; o arquivo fica para a coleta (reconcile)"""
+        from apps.utils.models import StoredBlob
+
+        if not name or not self.is_blob(name):
+            return super().delete(name)
+        StoredBlob.remove_reference(name)
+
+
+def get_content_storage():
+    """Armazenamento dos documentos (usado como callable em storage=)"""
+    return content_storage
+
+
+content_storage = ContentAddressedStorage()
+
+
+def get_storage_fields():
+    """Campos de arquivo de todos os modelos que usam o armazenamento"""
+    from django.apps import apps
+
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def count_references(name=None):
+    """
+    Referências aos blobs em todos os campos, por nome.
+
+    Args:
+        name: Conta apenas este blob
+    """
+    counts = {}
+    for model, field in get_storage_fields():
+        rows = model._base_manager.filter(**(
+            {field.name: name} if name else {f'{field.name}__startswith': BLOB_DIR + '/'}
+        ))
+        rows = rows.values(field.name).annotate(total=models.Count('pk')).values_list(field.name, 'total')
+        for blob_name, total in rows:
+            counts[blob_name] = counts.get(blob_name, 0) + total
+    return counts
+
+
+def reconcile(grace_hours=24):
+    """
+    Recalcula as referências a partir dos registros e apaga os blobs sem
+    referência e sem uso há mais de grace_hours (um upload recente pode
+    ainda não ter sido gravado no registro).
+
+    A contagem geral só aponta os candidatos: cada blob a corrigir ou apagar
+    é recontado com a linha travada, e o arquivo é apagado antes de liberá-la.
+    Os arquivos de blobs/ sem linha nem referência (save() desfeito com a
+    transação) são apagados se modificados há mais de grace_hours.
+
+    Returns:
+        tuple: (contadores corrigidos, blobs apagados)
+    """
+    from apps.utils.models import StoredBlob
+
+    counts = count_references()
+    cutoff = timezone.now() - datetime.timedelta(hours=grace_hours)
+    known = set(counts)
+    fixed = 0
+    deleted = 0
+    for blob in StoredBlob.objects.iterator():
+        known.add(blob.name)
+        references = counts.pop(blob.name, 0)
+        if blob.references == references and (references or blob.updated_at >= cutoff):
+            continue
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=blob.name).first()
+            if blob is None:
+                continue
+            references = count_references(blob.name).get(blob.name, 0)
+            if not references and blob.updated_at < cutoff:
+                StoredBlob.objects.filter(name=blob.name).delete()
+                FileSystemStorage.delete(content_storage, blob.name)
+                deleted += 1
+            elif blob.references != references:
+                StoredBlob.objects.filter(name=blob.name).update(references=references)
+                fixed += 1
+
+    # Blobs referenciados sem contador
+    for name, references in counts.items():
+        size = content_storage.size(name) if content_storage.exists(name) else 0
+        StoredBlob.objects.get_or_create(name=name, defaults={'size': size, 'references': references})
+        fixed += 1
+
+    # Arquivos sem linha: criar a linha trava o nome contra um save() concorrente
+    for name in iter_blob_files():
+        if name in known or os.path.getmtime(content_storage.path(name)) >= cutoff.timestamp():
+            continue
+        with transaction.atomic():
+            blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={'size': content_storage.size(name)}
+            )
+            if not created:
+                continue
+            references = count_references(name).get(name, 0)
+            if references:
+                StoredBlob.objects.filter(name=name).update(references=references)
+                fixed += 1
+            else:
+                StoredBlob.objects.filter(name=name).delete()
+                FileSystemStorage.delete(content_storage, name)
+                deleted += 1
+    return fixed, deleted
+
+
+def iter_blob_files():
+    """Nomes dos arquivos em blobs/ no disco, exceto os temporários"""
+    root = content_storage.path(BLOB_DIR)
+    for dirpath, dirnames, filenames in os.walk(root):
+        if dirpath == root and TEMP_DIR in dirnames:
+            dirnames.remove(TEMP_DIR)
+        relative = os.path.relpath(dirpath, content_storage.location)
+        for filename in filenames:
+            yield posixpath.join(*relative.split(os.sep), filename)
+
+
+def adopt_legacy_files():
+    """
+    Converte os arquivos gravados antes do armazenamento deduplicado
+    (fora de blobs/) e apaga os originais.
+
+    Returns:
+        tuple: (arquivos convertidos, bytes liberados)
+    """
+    legacy = set()
+    adopted = 0
+    for model, field in get_storage_fields():
+        storage = field.storage
+        rows = model._base_manager.exclude(
+            **{f'{field.name}__startswith': BLOB_DIR + '/'}
+        ).exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+        for pk, name in rows.values_list('pk', field.name).iterator():
+            if not storage.exists(name):
+                continue
+            with storage.open(name, 'rb') as file:
+                blob_name = storage.save(name, file)
+            model._base_manager.filter(pk=pk, **{field.name: name}).update(**{field.name: blob_name})
+            legacy.add(name)
+            adopted += 1
+
+    freed = 0
+    for name in legacy:
+        freed += content_storage.size(name)
+        FileSystemStorage.delete(content_storage, name)
+    return adopted, freed
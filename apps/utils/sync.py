@@ -0,0 +1,248 @@
+"""
+Feed de alterações para sincronização incremental (delta sync).
+
+Cada app declara suas fontes (subclasses de ChangeFeed) e as registra em
+AppConfig.ready(). A view ChangeFeedView atende todas as fontes em
+/api/changes/?since=<marca>&resources=<nomes>&limit=<n>.
+
+Uma fonte retorna as linhas alteradas depois da posição (updated_at, id)
+guardada na marca, em ordem de (updated_at, id) e usando o índice composto
+desses campos; o cliente guarda a nova marca e repete enquanto has_more.
+Exclusões lógicas aparecem como linhas com active=False. Exclusões físicas
+(inclusive em cascata) são registradas em SyncTombstone pelo post_delete do
+modelo e retornadas em deleted, com as chaves excluídas por fonte.
+
+updated_at é preenchido pelo Python durante a transação, não no commit:
+uma transação ainda aberta pode gravar updated_at anterior ao da última
+linha lida. Por isso cada chamada só lê linhas anteriores ao início da
+transação aberta mais antiga do banco (pg_stat_activity, no PostgreSQL) e
+a SYNC_SAFETY_MARGIN segundos atrás, margem que cobre a diferença entre os
+relógios da aplicação e do banco e, nos outros bancos, a transação mais
+longa (p. ex. um lote da importação de policiais).
+"""
+import base64
+import datetime
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.utils.models import SyncTombstone
+
+SYNC_PAGE_SIZE = getattr(settings, 'SYNC_PAGE_SIZE', 500)
+SYNC_MAX_PAGE_SIZE = getattr(settings, 'SYNC_MAX_PAGE_SIZE', 2000)
+SYNC_SAFETY_MARGIN = getattr(settings, 'SYNC_SAFETY_MARGIN', 60)
+
+# Sufixo da posição das exclusões de cada fonte na marca
+DELETED_SUFFIX = ':deleted'
+
+_registry = {}
+
+
+class InvalidWatermark(Exception):
+    """Exceção para marcas de sincronização malformadas."""
+    def __init__(self, message=None):
+        self.message = message or "Marca de sincronização inválida."
+        super().__init__(self.message)
+
+
+class ChangeFeed:
+    """
+    Fonte do feed de alterações.
+
+    Atributos:
+        model: Modelo consultado (com updated_at e índice em (updated_at, id))
+        fields: Campos retornados por values(); vazio para todos os campos
+            concretos exceto exclude
+        exclude: Campos omitidos quando fields está vazio
+    """
+    model = None
+    fields = ()
+    exclude = ()
+
+    def has_permission(self, request):
+        """Define quem pode consultar a fonte (padrão: usuários autenticados)"""
+        return True
+
+    def get_queryset(self, request):
+        return self.model._default_manager.all()
+
+    def get_fields(self):
+        if self.fields:
+            return list(self.fields)
+        return [
+            field.attname for field in self.model._meta.concrete_fields
+            if field.name not in self.exclude and field.attname not in self.exclude
+        ]
+
+    def get_changes(self, request, position, limit, until):
+        """
+        Linhas alteradas depois de position e antes de until.
+
+        Args:
+            position: (updated_at, id) da última linha lida ou None
+
+        Returns:
+            tuple: (linhas, nova posição, existem_mais)
+        """
+        queryset = self.get_queryset(request).filter(updated_at__lt=until)
+        if position is not None:
+            updated_at, pk = position
+            queryset = queryset.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk)
+            )
+        fields = self.get_fields()
+        rows = list(queryset.order_by('updated_at', 'id').values(
+            *fields, *{'id', 'updated_at'} - set(fields)
+        )[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            position = (rows[-1]['updated_at'], rows[-1]['id'])
+        return rows, position, has_more
+
+
+class TombstoneFeed(ChangeFeed):
+    """Exclusões físicas de uma fonte (ver register)"""
+    model = SyncTombstone
+    fields = ('object_id',)
+
+    def __init__(self, resource):
+        self.resource = resource
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(resource=self.resource)
+
+
+def register(name, source):
+    """
+    Registra uma fonte do feed de alterações e passa a registrar as
+    exclusões físicas do seu modelo.
+
+    Args:
+        name: Nome usado no parâmetro resources e na resposta
+        source: Classe (subclasse de ChangeFeed)
+    """
+    _registry[name] = source()
+
+    def record_deletion(sender, instance, **kwargs):
+        SyncTombstone.objects.create(resource=name, object_id=str(instance.pk))
+
+    post_delete.connect(
+        record_deletion, sender=source.model, weak=False, dispatch_uid=f'sync_tombstone_{name}'
+    )
+
+
+def get_feeds(request):
+    """Fontes que o usuário pode consultar, por nome"""
+    return {
+        name: source for name, source in _registry.items()
+        if source.has_permission(request)
+    }
+
+
+def encode_watermark(positions):
+    """Codifica as posições por fonte em um token opaco"""
+    # isoformat() mantém os microssegundos, que o DjangoJSONEncoder descarta
+    payload = json.dumps(
+        {name: [updated_at.isoformat(), pk] for name, (updated_at, pk) in positions.items()},
+        cls=DjangoJSONEncoder, separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_watermark(token):
+    """
+    Decodifica um token gerado por encode_watermark.
+
+    Returns:
+        dict: Posições (updated_at, id) por fonte
+    """
+    if not token:
+        return {}
+    try:
+        padding = '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(token + padding))
+        positions = {
+            name: (parse_datetime(updated_at), pk)
+            for name, (updated_at, pk) in payload.items()
+        }
+    except (TypeError, ValueError, AttributeError):
+        raise InvalidWatermark()
+    if any(updated_at is None for updated_at, pk in positions.values()):
+        raise InvalidWatermark()
+    return positions
+
+
+def oldest_transaction_start():
+    """
+    Início da transação aberta mais antiga das outras conexões ao banco, ou
+    None se não houver (ou fora do PostgreSQL).
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND pid <> pg_backend_pid() "
+            "AND backend_type = 'client backend' AND xact_start IS NOT NULL"
+        )
+        return cursor.fetchone()[0]
+
+
+def get_changes(request, feeds, token=None, limit=None):
+    """
+    Consulta as fontes informadas a partir da marca.
+
+    Posições de fontes não consultadas são mantidas na nova marca.
+
+    Args:
+        request: Requisição (as fontes podem filtrar por usuário)
+        feeds: Fontes por nome (ver get_feeds)
+        token: Marca da chamada anterior (None: desde o início)
+        limit: Linhas por fonte
+
+    Raises:
+        InvalidWatermark: Se a marca for inválida
+
+    Returns:
+        dict: changes (linhas por fonte), deleted (chaves excluídas por
+        fonte), watermark e has_more
+    """
+    positions = decode_watermark(token)
+    limit = max(1, min(limit or SYNC_PAGE_SIZE, SYNC_MAX_PAGE_SIZE))
+    until = timezone.now()
+    oldest = oldest_transaction_start()
+    if oldest is not None:
+        until = min(until, oldest)
+    until -= datetime.timedelta(seconds=SYNC_SAFETY_MARGIN)
+
+    changes = {}
+    deleted = {}
+    has_more = False
+    for name, source in feeds.items():
+        rows, position, more = source.get_changes(request, positions.get(name), limit, until)
+        changes[name] = rows
+        if position is not None:
+            positions[name] = position
+
+        key = name + DELETED_SUFFIX
+        tombstones, position, more_deleted = TombstoneFeed(name).get_changes(
+            request, positions.get(key), limit, until
+        )
+        deleted[name] = [row['object_id'] for row in tombstones]
+        if position is not None:
+            positions[key] = position
+        has_more = has_more or more or more_deleted
+
+    return {
+        'changes': changes,
+        'deleted': deleted,
+        'watermark': encode_watermark(positions),
+        'has_more': has_more,
+    }
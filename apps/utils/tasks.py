@@ -0,0 +1,12 @@
+"""
+Tarefas assíncronas do app utils.
+"""
+from celery import shared_task
+
+from apps.utils import renditions
+
+
+@shared_task(ignore_result=True)
+def generate_renditions(key, pk):
+    """Gera as versões redimensionadas de uma imagem"""
+    renditions.generate(key, pk)
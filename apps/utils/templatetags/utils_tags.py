@@ -1,5 +1,7 @@
 from django import template
 
+from apps.utils import downloads, renditions
+
 register = template.Library()
 
 @register.filter
@@ -16,4 +18,14 @@ def mul(value, arg):
     try:
         return float(value) * float(arg)
     except ValueError:
-        return 0
\ No newline at end of file
+        return 0
+
+@register.simple_tag
+def rendition_url(instance, field, name):
+    """URL de uma versão redimensionada da imagem (ver apps.utils.renditions)"""
+    return renditions.get_url(instance, field, name)
+
+@register.simple_tag
+def download_url(name, obj):
+    """URL de download autorizado de um arquivo (ver apps.utils.downloads)"""
+    return downloads.get_download_url(name, obj)
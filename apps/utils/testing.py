@@ -0,0 +1,57 @@
+"""
+Utilitários para testes.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class ListQueryCountMixin:
+    """
+    Mixin para TestCase que verifica se uma listagem executa um número fixo
+    de consultas, independente da quantidade de linhas exibidas.
+
+    Exemplo:
+        class FuncaoListViewTest(ListQueryCountMixin, TestCase):
+            def test_query_count(self):
+                self.client.force_login(self.user)
+                self.assertListQueryCount(
+                    reverse('police:funcao-list'),
+                    create_rows=self.create_funcoes,
+                )
+
+    (ver apps.police.tests.FuncaoListViewTest)
+    """
+
+    def assertListQueryCount(self, url, create_rows, sizes=(1, 10), num=None):
+        """
+        Requisita a listagem após criar cada quantidade de linhas em sizes e
+        falha se o número de consultas variar (ou diferir de num, se informado).
+
+        Args:
+            url: URL da listagem
+            create_rows: Função que recebe a quantidade de linhas a criar
+            sizes: Quantidades de linhas criadas antes de cada requisição
+                (o total acumulado deve caber em uma página)
+            num: Número exato de consultas esperado (opcional)
+        """
+        # Requisição inicial para aquecer caches (menu, sessão, permissões)
+        self.client.get(url)
+
+        counts = {}
+        for size in sizes:
+            create_rows(size)
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            counts[size] = len(context.captured_queries)
+
+        if num is not None:
+            for size, count in counts.items():
+                self.assertEqual(
+                    count, num,
+                    f'{count} consultas com {size} linhas; esperado {num}.'
+                )
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'O número de consultas varia com a quantidade de linhas: {counts}'
+        )
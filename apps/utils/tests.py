@@ -1,3 +1,40 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+
+from apps.utils.models import StoredBlob
+from apps.utils.storage import content_storage, reconcile
+
+
+class ReconcileTest(TransactionTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def age(self, name, hours=48):
+        past = time.time() - hours * 60 * 60
+        os.utime(content_storage.path(name), (past, past))
+
+    def test_collects_file_left_by_rolled_back_save(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            name = content_storage.save('bol.pdf', ContentFile(b'conteudo'))
+            raise RuntimeError()
+        self.assertTrue(content_storage.exists(name))
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
+
+        # Dentro do prazo de carência o arquivo fica
+        reconcile()
+        self.assertTrue(content_storage.exists(name))
+
+        self.age(name)
+        self.assertEqual(reconcile(), (0, 1))
+        self.assertFalse(content_storage.exists(name))
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
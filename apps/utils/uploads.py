@@ -0,0 +1,42 @@
+"""
+Upload handlers que calculam o SHA-256 do arquivo enquanto ele é recebido.
+
+O hash fica em UploadedFile.sha256 e é usado pelo armazenamento endereçado
+por conteúdo (apps.utils.storage), que assim não precisa ler o arquivo de
+novo. Substituem os handlers padrão em FILE_UPLOAD_HANDLERS.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import (MemoryFileUploadHandler,
+                                             TemporaryFileUploadHandler)
+
+
+class HashingUploadMixin:
+
+    def new_file(self, *args, **kwargs):
+        # Antes do super(): o handler em memória interrompe os seguintes com exceção
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    """Uploads pequenos (até FILE_UPLOAD_MAX_MEMORY_SIZE), mantidos em memória"""
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.activated:
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    """Uploads grandes, gravados em arquivo temporário"""
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
@@ -9,4 +9,8 @@ app_name = 'utils'
 urlpatterns = [
     # Adicionar URLs do aplicativo utils aqui
     # path('health/', views.health_check, name='health_check'),
+    path('autocomplete/<slug:name>/', views.AutocompleteView.as_view(), name='autocomplete'),
+    path('arquivos/<slug:name>/<int:pk>/', views.ProtectedDownloadView.as_view(), name='download'),
+    path('uploads/', views.ResumableUploadCreateView.as_view(), name='upload-create'),
+    path('uploads/<uuid:pk>/', views.ResumableUploadView.as_view(), name='upload'),
 ]
@@ -3,14 +3,20 @@ import os
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.core.files.storage import FileSystemStorage
-from django.http import HttpResponseRedirect, JsonResponse
-from django.shortcuts import redirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.views import generic
 from formtools.wizard.views import SessionWizardView
 
+from apps.utils import autocomplete, downloads, resumable
+from apps.utils.forms import ResumableUploadFormMixin
+from apps.utils.models import ResumableUpload
+from apps.utils.pagination import (EstimatedCountPaginator, InvalidCursor,
+                                   KeysetPaginator)
+
 
 def is_ajax(request):
     """Verifica se a requisição é AJAX"""
@@ -93,9 +99,71 @@ class BaseViewMixin(LoginRequiredMixin):
 
 
 class BaseListView(BaseViewMixin, generic.ListView):
-    """View base para listagens"""
+    """
+    View base para listagens.
+
+    Com keyset_pagination = True, a paginação usa cursores baseados na
+    ordering (sem OFFSET) e o parâmetro cursor_kwarg substitui ?page=.
+    A contagem total só é feita se keyset_count = True.
+
+    Com estimate_count = True, o total vem das estatísticas do PostgreSQL
+    em tabelas grandes em vez de COUNT(*) (ver EstimatedCountPaginator).
+
+    list_select_related segue a mesma semântica do ModelAdmin: uma tupla de
+    relacionamentos ou True para seguir automaticamente todas as chaves
+    estrangeiras não nulas (inclusive as usadas em __str__ dos relacionados).
+    list_prefetch_related aceita nomes ou objetos Prefetch.
+    """
     paginate_by = 10
     ordering = ['id']
+    keyset_pagination = False
+    keyset_count = False
+    estimate_count = False
+    cursor_kwarg = 'cursor'
+    list_select_related = False
+    list_prefetch_related = ()
+
+    def get_queryset(self):
+        """Aplica os relacionamentos declarados para evitar consultas N+1"""
+        queryset = super().get_queryset()
+        if self.list_select_related is True:
+            queryset = queryset.select_related()
+        elif self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        if self.list_prefetch_related:
+            queryset = queryset.prefetch_related(*self.list_prefetch_related)
+        return queryset
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        """Usa o paginador com contagem estimada quando habilitado"""
+        if self.estimate_count:
+            return EstimatedCountPaginator(
+                queryset, per_page, orphans=orphans,
+                allow_empty_first_page=allow_empty_first_page, **kwargs
+            )
+        return super().get_paginator(
+            queryset, per_page, orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page, **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Pagina por cursor quando keyset_pagination está habilitado"""
+        if not self.keyset_pagination:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_ordering(),
+            with_count=self.keyset_count,
+            estimate_count=self.estimate_count
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as e:
+            raise Http404(e.message)
+        return (paginator, page, page.object_list, page.has_other_pages())
 
 
 class BaseCreateView(BaseViewMixin, generic.CreateView):
@@ -193,6 +261,13 @@ class BaseWizardView(LoginRequiredMixin, SessionWizardView):
         })
         return context
 
+    def get_form_kwargs(self, step=None):
+        """Repassa o usuário aos formulários com upload em partes"""
+        kwargs = super().get_form_kwargs(step)
+        if issubclass(self.get_form_list()[step], ResumableUploadFormMixin):
+            kwargs['user'] = self.request.user
+        return kwargs
+
     def get_step_title(self):
         """Retorna o título da etapa atual"""
         if hasattr(self, 'step_titles'):
@@ -234,7 +309,25 @@ class BaseWizardView(LoginRequiredMixin, SessionWizardView):
 
 
 class BaseDetailView(BaseViewMixin, generic.DetailView):
-    """View base para detalhes"""
+    """
+    View base para detalhes.
+
+    detail_select_related e detail_prefetch_related declaram o plano de
+    carregamento do objeto, para que o template seja renderizado com um
+    número fixo de consultas. detail_prefetch_related aceita objetos
+    Prefetch, permitindo select_related nos relacionamentos reversos.
+    """
+    detail_select_related = ()
+    detail_prefetch_related = ()
+
+    def get_queryset(self):
+        """Aplica o plano de carregamento declarado"""
+        queryset = super().get_queryset()
+        if self.detail_select_related:
+            queryset = queryset.select_related(*self.detail_select_related)
+        if self.detail_prefetch_related:
+            queryset = queryset.prefetch_related(*self.detail_prefetch_related)
+        return queryset
 
     def get(self, request, *args, **kwargs):
         """Sobrescrevendo get para tratar AJAX"""
@@ -243,7 +336,7 @@ class BaseDetailView(BaseViewMixin, generic.DetailView):
 
         if self.is_ajax():
             return self.render_template_to_json(self.template_name, context)
-        return super().get(request, *args, **kwargs)
+        return self.render_to_response(context)
 
     def get_context_data(self, **kwargs):
         """Adiciona contexto padrão"""
@@ -264,3 +357,110 @@ class BaseDetailView(BaseViewMixin, generic.DetailView):
     def get_subtitle(self):
         """Retorna o subtítulo da página"""
         return getattr(self, 'subtitle', '')
+
+
+class AutocompleteView(BaseViewMixin, generic.View):
+    """
+    Endpoint JSON das fontes registradas em apps.utils.autocomplete,
+    no formato esperado pelo select2 (ajax).
+    """
+
+    def get(self, request, name, *args, **kwargs):
+        source = autocomplete.get_autocomplete(name)
+        if source is None:
+            raise Http404
+        if not source.has_permission(request):
+            return self.json_error_response('Acesso negado', status=403)
+
+        try:
+            limit = int(request.GET.get('limit', 0))
+        except ValueError:
+            limit = 0
+
+        # O resultado é limitado e não paginado: 'truncated' indica que há
+        # mais correspondências e o usuário deve refinar a busca
+        results, truncated = autocomplete.search(name, request.GET.get('q', ''), limit)
+        return self.render_to_json_response({
+            'results': results,
+            'truncated': truncated,
+        })
+
+
+class ProtectedDownloadView(BaseViewMixin, generic.View):
+    """
+    Download dos arquivos registrados em apps.utils.downloads: verifica a
+    permissão e delega o envio ao nginx (X-Accel-Redirect).
+    """
+
+    def get(self, request, name, pk, *args, **kwargs):
+        source = downloads.get_protected_file(name)
+        if source is None:
+            raise Http404
+        obj = get_object_or_404(source.get_queryset(), pk=pk)
+        file = getattr(obj, source.field)
+        if not file:
+            raise Http404
+        if not source.has_permission(request, obj):
+            raise PermissionDenied
+        return downloads.serve_file(file, source.get_filename(obj, file), source.as_attachment)
+
+
+class ResumableUploadCreateView(BaseViewMixin, generic.View):
+    """Cria um upload em partes (ver apps.utils.resumable)"""
+
+    def post(self, request, *args, **kwargs):
+        try:
+            size = int(request.POST.get('size', ''))
+        except ValueError:
+            return self.json_error_response('Tamanho inválido.')
+        try:
+            upload = resumable.create_upload(
+                request.user,
+                request.POST.get('filename', ''),
+                size,
+                request.POST.get('sha256', ''),
+            )
+        except resumable.UploadError as e:
+            return self.json_error_response(str(e), status=e.status)
+
+        data = resumable.get_status(upload)
+        response = self.render_to_json_response(data, status=201)
+        response['Location'] = data['url']
+        return response
+
+
+class ResumableUploadView(BaseViewMixin, generic.View):
+    """
+    Offset atual (GET/HEAD), envio de uma parte (PATCH) e cancelamento
+    (DELETE) de um upload do usuário.
+    """
+
+    def get_object(self):
+        return get_object_or_404(ResumableUpload, pk=self.kwargs['pk'], user=self.request.user)
+
+    def upload_response(self, upload):
+        response = self.render_to_json_response(resumable.get_status(upload))
+        response['Upload-Offset'] = upload.offset
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self.upload_response(self.get_object())
+
+    def patch(self, request, *args, **kwargs):
+        upload = self.get_object()
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+        except ValueError:
+            return self.json_error_response('Cabeçalhos Upload-Offset e Content-Length obrigatórios.')
+        try:
+            checksum = resumable.parse_checksum(request.headers.get('Upload-Checksum'))
+            resumable.write_chunk(upload, offset, request, length, checksum)
+        except resumable.UploadError as e:
+            return self.json_error_response(str(e), status=e.status)
+        return self.upload_response(upload)
+
+    def delete(self, request, *args, **kwargs):
+        resumable.discard(self.get_object())
+        return HttpResponse(status=204)
@@ -6,6 +6,6 @@ Configuração do Celery para o projeto.
 from __future__ import absolute_import, unicode_literals
 
 # Esta linha irá fazer com que o celery sempre encontre e carregue o app
-# from .celery import app as celery_app
+from .celery import app as celery_app
 
-# __all__ = ('celery_app',)
\ No newline at end of file
+__all__ = ('celery_app',)
@@ -20,10 +20,12 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
     'crispy_forms',
     'crispy_bootstrap5',
@@ -138,10 +140,44 @@ PASSWORD_EXPIRY_DAYS = 90
 MAX_LOGIN_ATTEMPTS = 5
 LOGIN_LOCKOUT_MINUTES = 30
 
+# Tentativas de login contadas no Redis em janelas deslizantes, por conta
+# (MAX_LOGIN_ATTEMPTS) e por IP. O IP bloqueado recusa qualquer tentativa,
+# exceto de logins que já entraram a partir dele nos últimos
+# LOGIN_KNOWN_IP_DAYS dias (unidades atrás do mesmo NAT). Com
+# LOGIN_THROTTLE_ENABLED = False, as tentativas voltam a ser contadas
+# diretamente na tabela de usuários.
+LOGIN_THROTTLE_ENABLED = os.environ.get('LOGIN_THROTTLE_ENABLED', 'True').lower() == 'true'
+LOGIN_WINDOW_MINUTES = 15
+LOGIN_IP_MAX_ATTEMPTS = 50
+LOGIN_IP_WINDOW_MINUTES = 15
+LOGIN_IP_LOCKOUT_MINUTES = 15
+LOGIN_KNOWN_IP_DAYS = 30
+
+# Log de acessos enfileirado no Redis e gravado em lote pela tarefa
+# apps.users.tasks.flush_access_log (Celery beat, a cada 10s) ou pelo
+# comando flush_access_log. Requer o worker/beat em execução.
+ACCESS_LOG_BUFFER_ENABLED = os.environ.get('ACCESS_LOG_BUFFER_ENABLED', 'False').lower() == 'true'
+ACCESS_LOG_BATCH_SIZE = 500
+
+# Partições mensais do log de acessos (PostgreSQL): meses criados à frente e
+# retenção em meses (partições mais antigas são desanexadas; 0 desativa).
+# Mantidas pela tarefa maintain_access_log_partitions ou pelo comando
+# access_log_partitions. Não há partição padrão: o banco rejeita acessos de
+# um mês sem partição, por isso a folga de meses à frente.
+ACCESS_LOG_PARTITION_MONTHS_AHEAD = 6
+ACCESS_LOG_RETENTION_MONTHS = 24
+
+# Resumos diários do log de acessos: cada execução também recalcula os dias
+# com acessos a partir de N segundos antes da execução anterior, para pegar
+# linhas de transações que terminaram depois de ids maiores (e eventos do
+# buffer gravados com atraso).
+ACCESS_ROLLUP_LAG_SECONDS = 60 * 10
+
 # Backend de autenticação personalizado
+# CustomAuthBackend herda do ModelBackend (permissões) e cobre todo o login;
+# manter o ModelBackend na lista repetiria a consulta e ignoraria o bloqueio.
 AUTHENTICATION_BACKENDS = [
     'apps.users.backends.CustomAuthBackend',  # Mantemos o caminho completo para o import
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
 # Internationalization
@@ -159,6 +195,13 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads com SHA-256 calculado durante o recebimento, usado pelo
+# armazenamento deduplicado dos documentos (apps.utils.storage)
+FILE_UPLOAD_HANDLERS = [
+    'apps.utils.uploads.HashingMemoryFileUploadHandler',
+    'apps.utils.uploads.HashingTemporaryFileUploadHandler',
+]
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -172,7 +215,7 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.users.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -189,11 +232,104 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'flush-access-log': {
+        'task': 'apps.users.tasks.flush_access_log',
+        'schedule': 10.0,
+    },
+    'maintain-access-log-partitions': {
+        'task': 'apps.users.tasks.maintain_access_log_partitions',
+        'schedule': 60 * 60 * 24,
+    },
+    'update-access-rollups': {
+        'task': 'apps.users.tasks.update_access_rollups',
+        'schedule': 60 * 15,
+    },
+    'flush-sessions': {
+        'task': 'apps.users.tasks.flush_sessions',
+        'schedule': 30,
+    },
+}
 
 # Cache
+# Redis usado pelo cache e, diretamente (apps.utils.cache.get_redis_client),
+# pelas filas do log de acessos e das sessões.
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/1')
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),
+        'LOCATION': REDIS_URL,
     }
-}
\ No newline at end of file
+}
+# Tempo (em segundos) que o HTML do menu de navegação fica em cache por usuário.
+# O cache é invalidado automaticamente quando módulos ou permissões mudam.
+NAV_MENU_CACHE_TIMEOUT = 60 * 60
+
+# Cache compartilhado das permissões por usuário (entre workers).
+# PERMISSION_CACHE_ENABLED funciona como chave geral; TIMEOUT em segundos.
+PERMISSION_CACHE_ENABLED = os.environ.get('PERMISSION_CACHE_ENABLED', 'False').lower() == 'true'
+PERMISSION_CACHE_TIMEOUT = 300
+
+# Cache da autenticação por token da API (segundos; 0 consulta o banco a cada
+# requisição). Tokens de usuários alterados ou bloqueados são invalidados.
+TOKEN_CACHE_TIMEOUT = 60
+
+# Sessões no Redis (cache 'default'), fora do banco nas requisições.
+# SESSION_TOUCH_INTERVAL limita as regravações que só renovam a expiração;
+# com SESSION_WRITE_BEHIND_ENABLED, as sessões também são copiadas em lote
+# para django_session (tarefa flush_sessions). Uma sessão que não está no
+# Redis é sempre lida de django_session, inclusive as criadas antes desta
+# engine (com django.contrib.sessions.backends.db), então a troca não
+# desconecta ninguém.
+SESSION_ENGINE = 'apps.users.session_engine'
+SESSION_TOUCH_INTERVAL = 300
+SESSION_WRITE_BEHIND_ENABLED = os.environ.get('SESSION_WRITE_BEHIND_ENABLED', 'False').lower() == 'true'
+SESSION_FLUSH_BATCH_SIZE = 500
+
+# Listagens com contagem estimada: abaixo deste número de linhas estimadas
+# pelo PostgreSQL, a contagem exata (COUNT(*)) é usada.
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Autocomplete (apps.utils.autocomplete): máximo de linhas por resposta e
+# cache dos prefixos curtos (até PREFIX_LENGTH caracteres), em segundos.
+AUTOCOMPLETE_MAX_RESULTS = 20
+AUTOCOMPLETE_CACHE_PREFIX_LENGTH = 3
+AUTOCOMPLETE_CACHE_TIMEOUT = 60 * 10
+
+# Feed de alterações (apps.utils.sync): linhas por fonte em cada chamada e
+# margem, em segundos, para transações em andamento. No PostgreSQL o feed já
+# para no início da transação aberta mais antiga e a margem só cobre a
+# diferença de relógio entre aplicação e banco; nos outros bancos ela deve
+# superar a transação mais longa, como um lote de POLICIAL_IMPORT_CHUNK_SIZE
+# linhas da importação de policiais (alguns segundos por lote).
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 2000
+SYNC_SAFETY_MARGIN = 60
+
+# Importação de policiais em lote (apps.police.importacao): linhas validadas
+# e gravadas (bulk_create) por lote.
+POLICIAL_IMPORT_CHUNK_SIZE = 500
+
+# Exportação do efetivo (apps.police.exportacao): linhas lidas por lote do
+# cursor no servidor. Arquivos gerados em segundo plano ficam em MEDIA_ROOT.
+POLICIAL_EXPORT_CHUNK_SIZE = 2000
+
+# Versões redimensionadas de imagens (apps.utils.renditions): tempo, em
+# segundos, em que uma geração pendente não é reagendada.
+RENDITION_LOCK_TIMEOUT = 60 * 5
+
+# Downloads autorizados (apps.utils.downloads): o Django verifica a permissão
+# e o nginx envia o arquivo pela location interna PROTECTED_MEDIA_PREFIX.
+# Sem nginx, desative para o Django enviar o arquivo.
+PROTECTED_MEDIA_X_ACCEL = os.environ.get('PROTECTED_MEDIA_X_ACCEL', 'True').lower() == 'true'
+PROTECTED_MEDIA_PREFIX = '/protected/'
+
+# Uploads em partes, retomáveis (apps.utils.resumable): diretório em
+# MEDIA_ROOT, tamanho máximo do arquivo e de cada parte (abaixo do
+# client_max_body_size do nginx) e horas até um upload abandonado ser
+# removido pelo comando cleanup_uploads.
+RESUMABLE_UPLOAD_DIR = 'resumable'
+RESUMABLE_UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+RESUMABLE_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+RESUMABLE_UPLOAD_EXPIRATION_HOURS = 24
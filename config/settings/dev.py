@@ -24,6 +24,9 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # Configuração simplificada para arquivos estáticos em desenvolvimento
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
+# Sem nginx em desenvolvimento: o Django envia os arquivos protegidos
+PROTECTED_MEDIA_X_ACCEL = False
+
 # Configuração para migrations
 MIGRATION_MODULES = {
     'sites': 'django.contrib.sites.migrations',
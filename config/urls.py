@@ -19,6 +19,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from apps.police import api as police_api
+from apps.utils.api import ChangeFeedView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     
@@ -28,6 +31,10 @@ urlpatterns = [
     path('notes/', include('apps.notes.urls')),
     path('police/', include('apps.police.urls')),
     path('utils/', include('apps.utils.urls')),
+
+    # API somente leitura
+    path('api/', include(police_api.router.urls)),
+    path('api/changes/', ChangeFeedView.as_view(), name='api-changes'),
 ]
 
 # Adiciona o Debug Toolbar em ambiente de desenvolvimento